@@ -0,0 +1,123 @@
+"""
+Runs the same workloads on every registered backbone: parse, traverse, search, map_values and serialization
+
+    python -m benchmarks.bench_backbones
+    python -m benchmarks.bench_backbones --save baseline.json
+    python -m benchmarks.bench_backbones --compare baseline.json --tolerance 0.2
+
+With '--compare' the timings are checked against a previous run and the process exits with status 1
+if any of them got slower by more than the tolerance (a fraction)
+"""
+import argparse
+import json
+import logging
+import pickle
+import sys
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.backbone.initialization import BACKBONES
+from graphify.models.document import Document
+from graphify.ops.document import map_values
+from graphify.ops.search import filter_dfs
+from graphify.parsing import parse_iterable, parse_plan
+
+logging.disable(logging.INFO)
+
+
+def workloads(lines, backbone):
+    """
+    Returns the workloads as (name, function) pairs, run on a document built on 'backbone'
+    """
+    plan = parse_plan(DESCRIPTOR)
+    document = parse_iterable(lines, plan, backbone=backbone)
+    serialized = document.to_dict()
+    # mapping shares the nodes of the source (see `snapshot`): kept apart from the other workloads
+    source = parse_iterable(lines, plan, backbone=backbone)
+
+    def upper(data):
+        data['meta'] = data['meta'].upper()
+
+    return [
+        ('parse', lambda: parse_iterable(lines, plan, backbone=backbone)),
+        ('traverse', lambda: sum(1 for _ in document.traverse())),
+        ('dfs', lambda: sum(1 for _ in document.graph.dfs())),
+        ('search', lambda: document.search_by_pattern('Article')),
+        ('filter_dfs', lambda: sum(1 for _ in filter_dfs(document.graph, lambda data: data['level'] == 3))),
+        ('map_values', lambda: map_values(source, upper)),
+        ('to_dict', lambda: json.dumps(document.to_dict())),
+        ('from_dict', lambda: Document.from_dict(serialized, backbone)),
+        ('pickle', lambda: pickle.loads(pickle.dumps(document))),
+    ]
+
+
+def best(f, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(n_headings, repeat):
+    """
+    Returns {backbone: {workload: seconds}}
+    """
+    lines = synthetic_document(n_headings)
+    return {
+        backbone: {name: best(f, repeat) for name, f in workloads(lines, backbone)}
+        for backbone in BACKBONES
+    }
+
+
+def report(results):
+    backbones = list(results)
+    print(f"{'workload':>12} " + ' '.join(f"{b + ' ms':>14}" for b in backbones) + f" {'fastest':>10}")
+    for workload in next(iter(results.values())):
+        times = {b: results[b][workload] for b in backbones}
+        print(f"{workload:>12} " + ' '.join(f"{1e3 * times[b]:14.1f}" for b in backbones)
+              + f" {min(times, key=times.get):>10}")
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Returns the (backbone, workload, before, after) slower than in 'baseline' by more than 'tolerance'
+    """
+    slower = []
+    for backbone, times in results.items():
+        for workload, after in times.items():
+            before = baseline.get(backbone, {}).get(workload)
+            if before is not None and after > before * (1 + tolerance):
+                slower.append((backbone, workload, before, after))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--headings', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help="json file to write the timings to")
+    parser.add_argument('--compare', help="json file of a previous run to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.headings, args.repeat)
+    print(f"{args.headings} headings, best of {args.repeat}")
+    report(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+        for backbone, workload, before, after in slower:
+            print(f"regression: {backbone} {workload} {1e3 * before:.1f} ms -> {1e3 * after:.1f} ms")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Scaling benchmark for the graph construction process
+
+Parses synthetic documents with an increasing number of headings and reports
+the time spent per heading; with constant parent resolution this figure should stay flat
+
+    python -m benchmarks.bench_build_scaling
+"""
+import logging
+import time
+
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+DESCRIPTOR = {
+    'components': ['Part', 'Chapter', 'Article', 'Paragraph'],
+    'patterns': ['Part', 'Chapter', 'Article', 'Paragraph']
+}
+
+
+def synthetic_document(n_headings):
+    """
+    Generates a document with 'n_headings' headings cycling through every level,
+    so that every insertion case (deeper, same level and climbing back up) is exercised
+    """
+    levels = ['Part', 'Chapter', 'Article', 'Paragraph', 'Paragraph', 'Article', 'Paragraph', 'Chapter']
+    lines = []
+    for i in range(n_headings):
+        component = levels[i % len(levels)]
+        lines.append(f"[[{component}]] {component} {i}")
+        lines.append(f"Body text of {component.lower()} {i}")
+    return lines
+
+
+def timeit(lines, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_iterable(lines, DESCRIPTOR)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=(1000, 2000, 4000, 8000, 16000, 32000)):
+    print(f"{'headings':>10} {'seconds':>10} {'us/heading':>12}")
+    for n in sizes:
+        elapsed = timeit(synthetic_document(n))
+        print(f"{n:>10} {elapsed:>10.3f} {1e6 * elapsed / n:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Memory per node and traversal speed of the networkx and compact backbones, on the same document
+
+    python -m benchmarks.bench_compact_backbone
+"""
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.backbone.compact import CompactImplementation
+from graphify.backbone.networkx import NetworkxImplementation
+from graphify.build.initialization import initialize_backbone
+from graphify.build.state import BuildState
+from graphify.build.traverse import resume_build
+
+logging.disable(logging.INFO)
+
+
+def build(backbone, lines):
+    return resume_build(lines, BuildState(DESCRIPTOR), initialize_backbone(backbone()))
+
+
+def held_memory(backbone, lines):
+    """
+    Bytes held by the graph, not counting the text lines (which are shared with the source)
+    """
+    gc.collect()
+    tracemalloc.start()
+    graph = build(backbone, lines)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, graph
+
+
+def payload(graph, lines):
+    """
+    Bytes of what any backbone has to hold: keys, ids, text lists and the lines not shared with the source
+    """
+    source = {id(line) for line in lines}
+    size = 0
+    for key, data in graph.nodes_iter(data=True):
+        size += sys.getsizeof(key) + sys.getsizeof(data['id']) + sys.getsizeof(data['text'])
+        size += sum(sys.getsizeof(line) for line in data['text'] if id(line) not in source)
+    return size
+
+
+def best(f, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(n_headings=100000):
+    lines = synthetic_document(n_headings)
+    print(f"{n_headings} headings")
+    print(f"{'backbone':>12} {'bytes/node':>11} {'overhead':>9} {'build s':>8} {'dfs ms':>8} {'bfs ms':>8}")
+
+    for backbone in (NetworkxImplementation, CompactImplementation):
+        held, graph = held_memory(backbone, lines)
+        n = graph.number_of_nodes()
+        per_node, overhead = held / n, (held - payload(graph, lines)) / n
+
+        build_time = best(lambda: build(backbone, lines), repeat=3)
+        dfs = best(lambda: sum(1 for _ in graph.dfs()))
+        bfs = best(lambda: sum(1 for _ in graph.bfs()))
+
+        print(f"{backbone.__name__[:-len('Implementation')]:>12} {per_node:11.0f} {overhead:9.0f} {build_time:8.2f} "
+              f"{1e3 * dfs:8.1f} {1e3 * bfs:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Parsing of headings carrying custom data objects, e.g. `[[Article]]{'id': ...}`
+
+    python -m benchmarks.bench_custom_data
+"""
+import logging
+import re
+import time
+
+from graphify.descriptor.constants.patterns import DATA_NAMED_GROUP
+from graphify.descriptor.utils import parse_custom_data_object
+
+logging.disable(logging.INFO)
+
+
+def main(n=100000, distinct=100):
+    pattern = re.compile(rf'(?P<component>\[\[Article\]\]){DATA_NAMED_GROUP}')
+    matches = [
+        pattern.search(f"[[Article]]{{'kind': 'amendment', 'source': 'gazette-{i % distinct}', 'p_number': {i % distinct}}} Article {i}")
+        for i in range(n)
+    ]
+
+    start = time.perf_counter()
+    for match in matches:
+        eval(match.group('data'))
+    reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for match in matches:
+        parse_custom_data_object(match)
+    literal = time.perf_counter() - start
+
+    print(f"{n} headings, {distinct} distinct payloads")
+    print(f"eval:                     {reference:.3f}s")
+    print(f"parse_custom_data_object: {literal:.3f}s ({reference / literal:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Event driven parsing against the graph building path
+
+    python -m benchmarks.bench_events
+"""
+import logging
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_iterable, parse_events, ParseEventHandler
+
+logging.disable(logging.INFO)
+
+
+class Counter(ParseEventHandler):
+    """
+    Minimal consumer: counts nodes and text lines
+    """
+    def __init__(self):
+        self.nodes = 0
+        self.lines = 0
+
+    def enter_node(self, key, data):
+        self.nodes += 1
+
+    def text(self, key, line):
+        self.lines += 1
+
+
+def timeit(f, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=(1000, 10000, 50000)):
+    print(f"{'headings':>10} {'graph (s)':>10} {'events (s)':>11} {'speedup':>8}")
+    for n in sizes:
+        lines = synthetic_document(n)
+        graph = timeit(lambda: parse_iterable(lines, DESCRIPTOR))
+        events = timeit(lambda: parse_events(lines, DESCRIPTOR, Counter()))
+        print(f"{n:>10} {graph:>10.3f} {events:>11.3f} {graph / events:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Incremental re-parsing of a single edited line against a full parse of the edited document
+
+    python -m benchmarks.bench_incremental
+"""
+import logging
+import random
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_iterable, reparse
+
+logging.disable(logging.INFO)
+
+
+def main(sizes=(1000, 10000, 50000), edits=20):
+    print(f"{'headings':>10} {'full (ms)':>10} {'reparse (ms)':>13} {'speedup':>8}")
+    random.seed(0)
+    for n in sizes:
+        source = synthetic_document(n)
+        document = parse_iterable(source, DESCRIPTOR)
+        reparse(document, source, 1, 2, [source[1]], DESCRIPTOR)
+
+        lines = [2 * random.randrange(n) + 1 for _ in range(edits)]
+
+        start = time.perf_counter()
+        for line in lines:
+            reparse(document, source, line, line + 1, ["Edited body text"], DESCRIPTOR)
+        incremental = (time.perf_counter() - start) / edits
+
+        start = time.perf_counter()
+        parse_iterable(source, DESCRIPTOR)
+        full = time.perf_counter() - start
+
+        print(f"{n:>10} {1e3 * full:>10.1f} {1e3 * incremental:>13.2f} {full / incremental:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
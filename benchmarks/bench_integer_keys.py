@@ -0,0 +1,56 @@
+"""
+String keys ('Chapter [1]') against integer keys: memory held by the document, parse and traversal times
+
+    python -m benchmarks.bench_integer_keys
+"""
+import gc
+import logging
+import time
+import tracemalloc
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.backbone.initialization import BACKBONES
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def best(f, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def held_memory(lines, descriptor, backbone):
+    gc.collect()
+    tracemalloc.start()
+    document = parse_iterable(lines, descriptor, backbone=backbone)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, document
+
+
+def main(n_headings=50000):
+    lines = synthetic_document(n_headings)
+    print(f"{n_headings} headings")
+    print(f"{'backbone':>10} {'keys':>8} {'bytes/node':>11} {'parse s':>8} {'traverse ms':>12} {'lookup ms':>10}")
+
+    for backbone in BACKBONES:
+        for keys, descriptor in [('string', DESCRIPTOR), ('integer', dict(DESCRIPTOR, integerKeys=True))]:
+            held, document = held_memory(lines, descriptor, backbone)
+            nodes = list(document.graph.nodes())
+
+            parse = best(lambda: parse_iterable(lines, descriptor, backbone=backbone))
+            traverse = best(lambda: sum(1 for _ in document.traverse()))
+            lookup = best(lambda: [document.graph[node] for node in nodes])
+
+            print(f"{backbone:>10} {keys:>8} {held / len(nodes):11.0f} {parse:8.2f} "
+                  f"{1e3 * traverse:12.1f} {1e3 * lookup:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Enrichers applied node by node with `map_values` against a single call over a column with `map_column`
+(as a list, and as a numpy array when numpy is installed)
+
+    python -m benchmarks.bench_map_column
+"""
+import logging
+import re
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.ops.document import map_column, map_values
+from graphify.parsing import parse_iterable
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+logging.disable(logging.INFO)
+
+_NUMBER = re.compile(r'\d+')
+
+
+def best(f, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def line_count(data):
+    data['lines'] = len(data['text'])
+
+
+def lowercase(data):
+    data['meta'] = data['meta'].lower()
+
+
+def numbered(data):
+    data['numbered'] = bool(_NUMBER.search(' '.join(data['text'])))
+
+
+def main(n_headings=20000):
+    document = parse_iterable(synthetic_document(n_headings), DESCRIPTOR)
+    print(f"{n_headings} headings, {document.graph.number_of_nodes()} nodes")
+
+    enrichers = [
+        ('line count', lambda: map_values(document, line_count),
+         lambda: map_column(document, 'text', lambda column: [len(t) for t in column], target='lines'),
+         lambda: map_column(document, 'level', lambda column: column * 0 + 1, target='lines', as_array=True)),
+        ('lowercase', lambda: map_values(document, lowercase),
+         lambda: map_column(document, 'meta', lambda column: [m.lower() for m in column]),
+         lambda: map_column(document, 'meta', lambda column: numpy.char.lower(column), as_array=True)),
+        ('regex tag', lambda: map_values(document, numbered),
+         lambda: map_column(document, 'text', lambda column: [bool(_NUMBER.search(' '.join(t))) for t in column],
+                            target='numbered'),
+         None),
+    ]
+
+    print(f"{'enricher':>12} {'per node ms':>12} {'list ms':>10} {'array ms':>10}")
+    for name, per_node, as_list, as_array in enrichers:
+        array = f"{1e3 * best(as_array):10.1f}" if numpy is not None and as_array else f"{'-':>10}"
+        print(f"{name:>12} {1e3 * best(per_node):12.1f} {1e3 * best(as_list):10.1f} {array}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Chains of `map_values` stages, as in enrichment pipelines: a full copy of the document per stage
+against copy-on-write documents, which only copy the nodes a stage writes to
+
+    python -m benchmarks.bench_map_values
+"""
+import logging
+import time
+import tracemalloc
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.ops.document import copy, map_values
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def copied_map_values(document, f):
+    """
+    `map_values` as it was: the whole document is copied first
+    """
+    document = copy(document)
+    for node, data in document.traverse():
+        f(data)
+    return document
+
+
+def stages(n):
+    """
+    'n' enrichment stages, each writing to a few nodes only (the Chapters) but reading all of them
+    """
+    def stage(i):
+        def f(data):
+            if data['meta'] == 'Chapter':
+                data[f'feature_{i}'] = len(data['text'])
+        return f
+    return [stage(i) for i in range(n)]
+
+
+def run(document, mapper, fs):
+    for f in fs:
+        document = mapper(document, f)
+    return document
+
+
+def main(n_headings=20000, n_stages=8):
+    lines = synthetic_document(n_headings)
+    fs = stages(n_stages)
+    print(f"{n_headings} headings, {n_stages} stages")
+
+    print(f"{'map_values':>12} {'ms':>10} {'peak KiB':>10}")
+    for name, mapper in [('copy', copied_map_values), ('on write', map_values)]:
+        document = parse_iterable(lines, DESCRIPTOR)
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = run(document, mapper, fs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert sum(1 for _, data in result.traverse() if 'feature_0' in data)
+        print(f"{name:>12} {1e3 * elapsed:10.1f} {peak / 1024:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
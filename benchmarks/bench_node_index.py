@@ -0,0 +1,71 @@
+"""
+Repeated lookups on the same document: full scans of the graph against its indexes by level, meta, leaves and ids
+
+    python -m benchmarks.bench_node_index
+"""
+import logging
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def best(f, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def scans(document, node_id):
+    """
+    The lookups as they were done before the indexes: a scan of every node
+    """
+    graph = document.graph
+    suffix = node_id.rsplit('/', 1)[-1]
+    return {
+        'paragraphs': lambda: [k for k, data in graph.nodes_iter(data=True) if data['level'] == document.max_depth],
+        'articles': lambda: [k for k, data in document.traverse() if data['meta'] == 'Article'],
+        'leaf_nodes': lambda: [k for k in graph.nodes() if list(graph.parents(k)) and not list(graph.successors(k))],
+        'search': lambda: next((k for k, data in document.traverse() if 'Missing' in data['meta']), None),
+        'by_id': lambda: next((k for k, data in document.traverse() if data['id'] == node_id), None),
+        'under': lambda: [k for k, data in document.traverse()
+                          if data['id'] == node_id or data['id'].startswith(node_id + '/')],
+        'ending_with': lambda: next((k for k, data in document.traverse() if data['id'].endswith(suffix)), None),
+    }
+
+
+def main(n_headings=50000):
+    document = parse_iterable(synthetic_document(n_headings), DESCRIPTOR)
+    print(f"{n_headings} headings, {document.graph.number_of_nodes()} nodes")
+
+    build = best(lambda: (document.reindex(), document.index()))
+    paths = best(lambda: (document.reindex(), document.paths()))
+    print(f"index built in {1e3 * build:.1f} ms, path index in {1e3 * paths:.1f} ms")
+
+    # a top level section, halfway through the document
+    node_id = document.nodes(1)
+    node_id = [data['id'] for _, data in node_id][n_headings // 200]
+    suffix = node_id.rsplit('/', 1)[-1]
+
+    indexed = {
+        'paragraphs': lambda: list(document.paragraphs(False)),
+        'articles': lambda: list(document.components('Article', False)),
+        'leaf_nodes': lambda: list(document.leaf_nodes(False)),
+        'search': lambda: document.search('Missing'),
+        'by_id': lambda: document.node_by_id(node_id),
+        'under': lambda: list(document.nodes_under(node_id, False)),
+        'ending_with': lambda: document.id_ending_with(suffix),
+    }
+
+    print(f"{'lookup':>12} {'scan ms':>10} {'indexed ms':>11}")
+    for name, scan in scans(document, node_id).items():
+        print(f"{name:>12} {1e3 * best(scan):10.2f} {1e3 * best(indexed[name]):11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Batch parsing of a corpus over a process pool against a `parse_filepath` loop
+
+    python -m benchmarks.bench_parse_many
+"""
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_filepath
+from graphify.parsing.batch import parse_many, BatchStats
+
+logging.disable(logging.INFO)
+
+
+def main(n_files=200, n_headings=500, chunksize=4):
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = []
+        for i in range(n_files):
+            filepath = os.path.join(directory, f"document-{i}.txt")
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write("\n".join(synthetic_document(n_headings)))
+            filepaths.append(filepath)
+
+        start = time.perf_counter()
+        for filepath in filepaths:
+            parse_filepath(filepath, DESCRIPTOR)
+        sequential = time.perf_counter() - start
+
+        stats = BatchStats()
+        for _ in parse_many(filepaths, DESCRIPTOR, chunksize=chunksize, stats=stats):
+            pass
+        report = stats.report()
+
+    print(f"{n_files} files x {n_headings} headings, {multiprocessing.cpu_count()} cores")
+    print(f"loop:       {sequential:.2f}s")
+    print(f"parse_many: {report['elapsed']:.2f}s ({sequential / report['elapsed']:.1f}x), "
+          f"{report['files_per_second']:.0f} files/s, utilization {report['utilization']:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Parallel parsing of a single large document against `parse_iterable`
+
+    python -m benchmarks.bench_parse_parallel
+"""
+import logging
+import multiprocessing
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_iterable
+from graphify.parsing.batch import parse_parallel
+
+logging.disable(logging.INFO)
+
+
+def main(n_headings=100000, chunk_lines=20000):
+    lines = synthetic_document(n_headings)
+
+    start = time.perf_counter()
+    parse_iterable(lines, DESCRIPTOR)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parse_parallel(lines, DESCRIPTOR, chunk_lines=chunk_lines)
+    parallel = time.perf_counter() - start
+
+    print(f"{n_headings} headings, {multiprocessing.cpu_count()} cores")
+    print(f"parse_iterable: {sequential:.2f}s")
+    print(f"parse_parallel: {parallel:.2f}s ({sequential / parallel:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
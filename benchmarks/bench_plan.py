@@ -0,0 +1,38 @@
+"""
+Per call setup cost when parsing lots of short documents with the same descriptor
+
+    python -m benchmarks.bench_plan
+"""
+import logging
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.descriptor.plan import ParsePlan, parse_plan
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def timeit(f, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        f()
+    return (time.perf_counter() - start) / n
+
+
+def main(n=2000, n_headings=4):
+    lines = synthetic_document(n_headings)
+    plan = parse_plan(DESCRIPTOR)
+
+    compiled = timeit(lambda: parse_iterable(lines, ParsePlan(DESCRIPTOR)), n)
+    cached = timeit(lambda: parse_iterable(lines, DESCRIPTOR), n)
+    shared = timeit(lambda: parse_iterable(lines, plan), n)
+
+    print(f"{n} documents of {len(lines)} lines")
+    print(f"compiled every call: {1e6 * compiled:8.1f} us/document")
+    print(f"cached descriptor:   {1e6 * cached:8.1f} us/document ({compiled / cached:.1f}x)")
+    print(f"shared ParsePlan:    {1e6 * shared:8.1f} us/document ({compiled / shared:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Structural queries over many node pairs, e.g. to resolve cross references: walking the parents of the nodes
+against the interval labels of the structural index
+
+    python -m benchmarks.bench_structure
+"""
+import logging
+import random
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def best(f, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def ancestors(graph, key):
+    chain = [key]
+    while True:
+        parents = list(graph.parents(chain[-1]))
+        if not parents:
+            return chain
+        chain.append(parents[0])
+
+
+def walked_lca(graph, a, b):
+    above = set(ancestors(graph, b))
+    return next(key for key in ancestors(graph, a) if key in above)
+
+
+def main(n_headings=50000, n_pairs=200000):
+    document = parse_iterable(synthetic_document(n_headings), DESCRIPTOR)
+    graph = document.graph
+    keys = document.order()
+
+    random.seed(0)
+    pairs = [(random.choice(keys), random.choice(keys)) for _ in range(n_pairs)]
+    print(f"{n_headings} headings, {len(keys)} nodes, {n_pairs} pairs")
+
+    build = best(lambda: (document.reindex(), document.structure()))
+    print(f"structural index built in {1e3 * build:.1f} ms")
+    structure = document.structure()
+
+    print(f"{'query':>12} {'walk ms':>10} {'indexed ms':>11}")
+    for name, walk, indexed in [
+        ('ancestor', lambda: [graph.exists_path(a, b) for a, b in pairs],
+         lambda: [structure.is_ancestor(a, b) for a, b in pairs]),
+        ('lca', lambda: [walked_lca(graph, a, b) for a, b in pairs],
+         lambda: [structure.lowest_common_ancestor(a, b) for a, b in pairs]),
+        ('2nd ancestor', lambda: [(ancestors(graph, a)[2:3] or [None])[0] for a, _ in pairs],
+         lambda: [structure.ancestor(a, 2) for a, _ in pairs]),
+    ]:
+        print(f"{name:>12} {1e3 * best(walk):10.1f} {1e3 * best(indexed):11.1f}")
+
+
+if __name__ == '__main__':
+    main()
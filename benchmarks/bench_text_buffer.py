@@ -0,0 +1,59 @@
+"""
+Memory held by a parsed document, with the text of the nodes stored as lists of lines or in a shared `TextBuffer`
+
+    python -m benchmarks.bench_text_buffer
+"""
+import gc
+import logging
+import time
+import tracemalloc
+
+from benchmarks.bench_build_scaling import DESCRIPTOR
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def document_with_text(n_headings, lines_per_heading):
+    """
+    Generates the lines of a document, as read from a file: each of them is a new string object
+    """
+    levels = ['Part', 'Chapter', 'Article', 'Paragraph', 'Paragraph', 'Article', 'Paragraph', 'Chapter']
+    for i in range(n_headings):
+        component = levels[i % len(levels)]
+        yield f"[[{component}]] {component} {i}"
+        for j in range(lines_per_heading):
+            yield f"Body text line {j} of {component.lower()} {i}"
+
+
+def measure(n_headings, lines_per_heading, descriptor):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    document = parse_iterable(document_with_text(n_headings, lines_per_heading), descriptor)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    text = sum(len(''.join(data['text'])) for _, data in document.traverse())
+    return held, peak, elapsed, text
+
+
+def main(n_headings=5000, lines_per_heading=20):
+    print(f"{n_headings} headings, {n_headings * (lines_per_heading + 1)} lines")
+
+    results = {}
+    for name, descriptor in [('lists', DESCRIPTOR), ('textBuffer', dict(DESCRIPTOR, textBuffer=True))]:
+        held, peak, elapsed, text = measure(n_headings, lines_per_heading, descriptor)
+        results[name] = held
+        print(f"{name:>10}: held {held / 2 ** 20:7.1f} MiB, peak {peak / 2 ** 20:7.1f} MiB, "
+              f"{elapsed:.2f} s ({text / 2 ** 20:.1f} MiB of text)")
+
+    print(f"held memory reduction: {results['lists'] / results['textBuffer']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Traversal in insertion order: sorting the keys on every call against the cached order of the document,
+for the operations built on top of `traverse`
+
+    python -m benchmarks.bench_traverse
+"""
+import logging
+import time
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.models.document import key_to_numeric
+from graphify.ops.document import map_values
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def best(f, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def sorted_traverse(document):
+    for node in sorted(document.graph.nodes(), key=key_to_numeric):
+        yield node, document.graph.node[node]
+
+
+def main(n_headings=50000):
+    document = parse_iterable(synthetic_document(n_headings), DESCRIPTOR)
+    print(f"{n_headings} headings, {document.graph.number_of_nodes()} nodes")
+
+    workloads = [
+        ('traverse', lambda: sum(1 for _ in document.traverse())),
+        ('search', lambda: document.search('missing')),
+        ('text', lambda: sum(1 for _ in document.text(just_text=True))),
+        ('flat_report', lambda: document.flat_report()),
+        ('to_dict', lambda: document.to_dict()),
+        ('map_values', lambda: map_values(document, lambda data: data)),
+    ]
+
+    print(f"{'workload':>12} {'sorted ms':>10} {'cached ms':>10}")
+    for name, f in workloads:
+        cached = best(f)
+        # the previous behaviour: every traversal sorts the keys again
+        traverse, document.traverse = document.traverse, lambda data=True: sorted_traverse(document)
+        try:
+            uncached = best(f)
+        finally:
+            document.traverse = traverse
+        print(f"{name:>12} {1e3 * uncached:10.1f} {1e3 * cached:10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Serving every top level section of a cached document: a copy of the document per section against views
+
+    python -m benchmarks.bench_view
+"""
+import json
+import logging
+import time
+import tracemalloc
+
+from benchmarks.bench_build_scaling import DESCRIPTOR, synthetic_document
+from graphify.build.graph import detach_subtree
+from graphify.models.document import Document
+from graphify.ops.document import copy
+from graphify.parsing import parse_iterable
+
+logging.disable(logging.INFO)
+
+
+def copied(document, key):
+    """
+    The section as a standalone document, as it had to be extracted before views
+    """
+    graph = copy(document).graph
+    section = detach_subtree(graph, key)
+    return Document(section, section.root_key)
+
+
+def measure(f):
+    tracemalloc.start()
+    start = time.perf_counter()
+    f()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(n_headings=20000, n_sections=20):
+    document = parse_iterable(synthetic_document(n_headings), DESCRIPTOR)
+    sections = list(document.nodes(1, False))[:n_sections]
+    print(f"{n_headings} headings, {n_sections} sections served")
+
+    print(f"{'extraction':>10} {'ms':>10} {'peak KiB':>10}")
+    for name, extract in [('copy', copied), ('view', lambda d, key: d.view(key))]:
+        elapsed, peak = measure(lambda: [json.dumps(extract(document, key).to_dict()) for key in sections])
+        print(f"{name:>10} {1e3 * elapsed:10.1f} {peak / 1024:10.0f}")
+
+
+if __name__ == '__main__':
+    main()
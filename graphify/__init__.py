@@ -1,10 +1,6 @@
 import logging
-import sys
 import os
 
-
-sys.setrecursionlimit(100000)
-
 logger = logging.getLogger(__name__)
 
 logging.basicConfig(
@@ -8,14 +8,21 @@ class GraphBackboneAbstraction(ABC):
 
     Ultimately we might want to reuse the library with different backbones for the underlying graph framework
     The goal of this contract is to abstract the graph framework being used
+
+    Node keys are strings like 'Chapter [1]' or, with 'integer_keys', the bare node identifiers (see `node_key`)
     """
 
-    def __init__(self, root="ROOT"):
+    def __init__(self, root="ROOT", integer_keys=False):
         self._id = -1
         self.root = root
-        self.root_key = "{} [{}]".format(self.root, self.next_id())
+        self.integer_keys = integer_keys
+        self.root_key = self.node_key(self.root, self.next_id())
         self.last_inserted = None
+        self.open_ancestors = []
+        self.text_buffer = None
         self.graph = None
+        # bumped whenever nodes are added or removed, telling the caches of a document they are stale
+        self.version = 0
 
     @abstractmethod
     def initialize(self):
@@ -32,6 +39,11 @@ class GraphBackboneAbstraction(ABC):
     def add_edge(self, a, b):
         pass
 
+    @abstractmethod
+    def remove_nodes_from(self, nodes):
+        """Removes every node in 'nodes' along with their edges"""
+        pass
+
     @abstractmethod
     def number_of_nodes(self):
         pass
@@ -80,6 +92,15 @@ class GraphBackboneAbstraction(ABC):
         """
         pass
 
+    @property
+    def writes(self):
+        """
+        The count of the writes to the indexed fields of the nodes of this graph, changed in place
+        (see `graphify.backbone.data.WriteCount`), telling the indexes of a document they are stale
+        A backbone not counting them has its documents indexed again through `Document.reindex` only
+        """
+        return 0
+
     def cursor(self):
         """
         Returns the last inserted node of the graph
@@ -101,10 +122,52 @@ class GraphBackboneAbstraction(ABC):
         else:
             return self.__getitem__(self.cursor())[selector]
 
+    def open_ancestor(self, level):
+        """
+        Returns the deepest node of the open-ancestor chain able to parent a node at 'level'
+        Nodes of the chain at the same level or deeper are closed (popped) on the way
+
+        The chain goes from the root to the cursor and is kept up to date by the build process,
+        so this is constant time with respect to the number of nodes in the graph
+        """
+        chain = self.open_ancestors
+        while len(chain) > 1 and self.__getitem__(chain[-1])['level'] >= level:
+            chain.pop()
+        return chain[-1]
+
+    def push_ancestor(self, parent, node):
+        """
+        Register 'node', just inserted under 'parent', as the new tip of the open-ancestor chain
+        """
+        chain = self.open_ancestors
+        if parent in chain:
+            del chain[chain.index(parent) + 1:]
+        else:
+            chain[:] = [parent]
+        chain.append(node)
+
     def next_id(self):
         self._id += 1
         return self._id
 
+    def node_key(self, base, id):
+        """
+        Returns the key of the node with identifier 'id' created for the component 'base', e.g. 'Chapter [1]'
+        With 'integer_keys' the key is the identifier itself: an int,
+        or a tuple of ints for the composite identifiers of spliced nodes, e.g. '5_1' -> (5, 1)
+        """
+        if not self.integer_keys:
+            return '{} [{}]'.format(base, id)
+        elif isinstance(id, int):
+            return id
+        return tuple(int(i) for i in id.split('_'))
+
+    def new_text(self):
+        """
+        Returns the (empty) text of a new node: a list, or a span of 'text_buffer' when the graph has one
+        """
+        return [] if self.text_buffer is None else self.text_buffer.span()
+
     @abstractmethod
     def __getitem__(self, key):
         """Access the data contained in a node"""
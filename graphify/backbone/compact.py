@@ -0,0 +1,407 @@
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
+from sys import intern
+
+from graphify.backbone import GraphBackboneAbstraction
+from graphify.backbone.data import WriteCount
+
+# placeholder of the fields a node does not have (in the object columns)
+_MISSING = object()
+
+# removed nodes left in the columns before they get compacted
+_COMPACT_THRESHOLD = 1024
+
+
+class CompactImplementation(GraphBackboneAbstraction):
+    """
+    Concrete implementation of a backbone made for trees, with far less memory per node than networkx
+
+    Every node gets an integer position and the structure is kept in arrays: the parent of each node
+    and its first child, last child, next and previous siblings (-1 for none)
+    The data is stored by columns: 'level' and 'pad' in byte arrays, 'meta' (interned), 'id' and 'text' in lists,
+    any other field in a per node dictionary, only created when needed
+
+    `graph[key]` returns a `NodeData`, a mutable mapping over the columns of the node
+    A node can only have one parent: adding a second one raises a ValueError
+    """
+
+    def initialize(self):
+        self._index = {}
+        self._keys = []
+
+        self._parent = array('i')
+        self._first = array('i')
+        self._last = array('i')
+        self._next = array('i')
+        self._prev = array('i')
+
+        self._level = array('b')
+        self._pad = array('b')
+        self._meta = []
+        self._ids = []
+        self._text = []
+        self._extra = []
+
+        self._removed = 0
+        self._generation = 0
+        self._writes = WriteCount()
+        return self
+
+    @property
+    def node(self):
+        return self
+
+    @property
+    def writes(self):
+        return self._writes.value
+
+    def add_node(self, node, **data):
+        i = self._index.get(node)
+        if i is None:
+            i = self._new(node)
+
+        for name, value in data.items():
+            self._set(i, name, value)
+
+        self.last_inserted = node
+
+    def add_edge(self, a, b):
+        index = self._index
+        ia = index[a] if a in index else self._new(a)
+        ib = index[b] if b in index else self._new(b)
+
+        parent = self._parent[ib]
+        if parent == ia:
+            return
+        elif parent >= 0 or self._is_ancestor(ib, ia):
+            raise ValueError(f"Cannot add the edge ('{a}', '{b}'): the backbone only holds trees")
+
+        self._parent[ib] = ia
+        last = self._last[ia]
+        if last < 0:
+            self._first[ia] = ib
+        else:
+            self._next[last] = ib
+            self._prev[ib] = last
+        self._last[ia] = ib
+
+    def add_edges_from(self, it):
+        for a, b in it:
+            self.add_edge(a, b)
+
+    def remove_nodes_from(self, nodes):
+        index = self._index
+        removed = [index.pop(node) for node in nodes if node in index]
+        if not removed:
+            return
+        self.version += 1
+
+        positions = set(removed)
+        parent, first, nxt = self._parent, self._first, self._next
+
+        for i in removed:
+            if parent[i] >= 0 and parent[i] not in positions:
+                self._unlink(i)
+
+            child = first[i]
+            while child >= 0:
+                following = nxt[child]
+                if child not in positions:
+                    parent[child] = self._prev[child] = nxt[child] = -1
+                child = following
+
+        for i in removed:
+            self._keys[i] = None
+            self._parent[i] = self._first[i] = self._last[i] = self._next[i] = self._prev[i] = -1
+            self._meta[i] = self._ids[i] = self._text[i] = _MISSING
+            self._extra[i] = None
+
+        self._removed += len(removed)
+        if self._removed > _COMPACT_THRESHOLD and 2 * self._removed > len(self._keys):
+            self._compact()
+
+    def number_of_nodes(self):
+        return len(self._index)
+
+    def nodes(self, data=False):
+        return list(self.nodes_iter(data))
+
+    def nodes_iter(self, data=False):
+        if not data:
+            return iter(self._index)
+        return ((key, NodeData(self, key, i)) for key, i in self._index.items())
+
+    def edges(self, key=None):
+        if key is None:
+            return [edge for node in self._index for edge in self.edges(node)]
+        return [(key, child) for child in self.successors(key)]
+
+    def parents(self, source):
+        parent = self._parent[self._index[source]]
+        return iter([self._keys[parent]] if parent >= 0 else [])
+
+    def predecessors(self, source):
+        return self.parents(source)
+
+    def successors(self, source):
+        keys, nxt = self._keys, self._next
+        child = self._first[self._index[source]]
+        while child >= 0:
+            yield keys[child]
+            child = nxt[child]
+
+    def exists_path(self, node_a, node_b):
+        return self._is_ancestor(self._index[node_a], self._index[node_b])
+
+    def dfs(self, source=None):
+        keys, parent, first, nxt = self._keys, self._parent, self._first, self._next
+        source = self._index[source or self.root_key]
+
+        node = first[source]
+        while node >= 0:
+            yield keys[parent[node]], keys[node]
+
+            if first[node] >= 0:
+                node = first[node]
+                continue
+
+            while node != source and nxt[node] < 0:
+                node = parent[node]
+            if node == source:
+                return
+            node = nxt[node]
+
+    def bfs(self, source=None):
+        keys, first, nxt = self._keys, self._first, self._next
+
+        queue = deque([self._index[source or self.root_key]])
+        while queue:
+            node = queue.popleft()
+            child = first[node]
+            while child >= 0:
+                yield keys[node], keys[child]
+                queue.append(child)
+                child = nxt[child]
+
+    def copy(self):
+        g = CompactImplementation(self.root, self.integer_keys)
+        g._index = dict(self._index)
+        g._keys = list(self._keys)
+        for column in ('_parent', '_first', '_last', '_next', '_prev', '_level', '_pad'):
+            values = getattr(self, column)
+            setattr(g, column, array(values.typecode, values))
+        g._meta = list(self._meta)
+        g._ids = list(self._ids)
+        g._text = list(self._text)
+        g._extra = [dict(extra) if extra else None for extra in self._extra]
+        g._removed = self._removed
+        g._generation = 0
+        g._writes = WriteCount()
+
+        g.last_inserted = self.last_inserted
+        g.open_ancestors = list(self.open_ancestors)
+        g._id = self._id
+        g.version = self.version
+        g.text_buffer = self.text_buffer
+        return g
+
+    def _new(self, key):
+        i = len(self._keys)
+        self.version += 1
+        self._index[key] = i
+        self._keys.append(key)
+
+        for column in (self._parent, self._first, self._last, self._next, self._prev, self._level, self._pad):
+            column.append(-1)
+        self._meta.append(_MISSING)
+        self._ids.append(_MISSING)
+        self._text.append(_MISSING)
+        self._extra.append(None)
+        return i
+
+    def _is_ancestor(self, a, node):
+        """
+        Tells if there is a path from 'a' down to 'node' (or both are the same)
+        """
+        parent = self._parent
+        while node >= 0:
+            if node == a:
+                return True
+            node = parent[node]
+        return False
+
+    def _unlink(self, i):
+        """
+        Detaches node 'i' from the children of its parent
+        """
+        parent, prev, nxt = self._parent[i], self._prev[i], self._next[i]
+
+        if prev >= 0:
+            self._next[prev] = nxt
+        else:
+            self._first[parent] = nxt
+
+        if nxt >= 0:
+            self._prev[nxt] = prev
+        else:
+            self._last[parent] = prev
+
+        self._parent[i] = self._prev[i] = self._next[i] = -1
+
+    def _compact(self):
+        """
+        Drops the positions of the removed nodes from every column
+        The positions of the remaining ones change, hence the new generation (see `NodeData`)
+        """
+        live = list(self._index.values())
+        position = {old: new for new, old in enumerate(live)}
+        remap = lambda i: position[i] if i >= 0 else -1
+
+        for column in ('_parent', '_first', '_last', '_next', '_prev'):
+            values = getattr(self, column)
+            setattr(self, column, array('i', (remap(values[i]) for i in live)))
+
+        for column in ('_level', '_pad'):
+            values = getattr(self, column)
+            setattr(self, column, array('b', (values[i] for i in live)))
+
+        for column in ('_keys', '_meta', '_ids', '_text', '_extra'):
+            values = getattr(self, column)
+            setattr(self, column, [values[i] for i in live])
+
+        self._index = {key: i for i, key in enumerate(self._keys)}
+        self._removed = 0
+        self._generation += 1
+
+    def _get(self, i, name):
+        if name == 'text':
+            value = self._text[i]
+        elif name == 'id':
+            value = self._ids[i]
+        elif name == 'meta':
+            value = self._meta[i]
+        elif name == 'level' and self._level[i] >= 0:
+            return self._level[i]
+        elif name == 'pad' and self._pad[i] >= 0:
+            return bool(self._pad[i])
+        else:
+            extra = self._extra[i]
+            if extra is None:
+                raise KeyError(name)
+            return extra[name]
+
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def _set(self, i, name, value):
+        if name == 'text':
+            self._text[i] = value
+        elif name == 'id':
+            self._ids[i] = value
+        elif name == 'meta':
+            self._meta[i] = intern(value) if type(value) is str else value
+        elif name == 'level' and type(value) is int and 0 <= value < 128:
+            self._level[i] = value
+            self._discard_extra(i, name)
+        elif name == 'pad' and type(value) is bool:
+            self._pad[i] = value
+            self._discard_extra(i, name)
+        else:
+            if name == 'level':
+                self._level[i] = -1
+            elif name == 'pad':
+                self._pad[i] = -1
+
+            if self._extra[i] is None:
+                self._extra[i] = {}
+            self._extra[i][name] = value
+
+    def _delete(self, i, name):
+        self._get(i, name)
+
+        if name in ('text', 'id', 'meta'):
+            self._set(i, name, _MISSING)
+        elif name == 'level' and self._level[i] >= 0:
+            self._level[i] = -1
+        elif name == 'pad' and self._pad[i] >= 0:
+            self._pad[i] = -1
+        else:
+            self._discard_extra(i, name)
+
+    def _discard_extra(self, i, name):
+        extra = self._extra[i]
+        if extra is not None:
+            extra.pop(name, None)
+            if not extra:
+                self._extra[i] = None
+
+    def _fields(self, i):
+        if self._meta[i] is not _MISSING:
+            yield 'meta'
+        if self._level[i] >= 0:
+            yield 'level'
+        if self._pad[i] >= 0:
+            yield 'pad'
+        if self._text[i] is not _MISSING:
+            yield 'text'
+        if self._ids[i] is not _MISSING:
+            yield 'id'
+        if self._extra[i]:
+            yield from list(self._extra[i])
+
+    def __getitem__(self, key):
+        return NodeData(self, key, self._index[key])
+
+    def __setitem__(self, key, value):
+        i = self._index[key]
+        for name in list(self._fields(i)):
+            self._delete(i, name)
+        for name, value in dict(value).items():
+            self._set(i, name, value)
+
+    def __contains__(self, key):
+        return key in self._index
+
+
+class NodeData(MutableMapping):
+    """
+    The data of a node of a `CompactImplementation`, read from and written to its columns
+    Behaves as the dictionary networkx would hand out; `dict(data)` takes a copy
+    """
+
+    __slots__ = ('_graph', '_key', '_i', '_generation')
+
+    def __init__(self, graph, key, i):
+        self._graph = graph
+        self._key = key
+        self._i = i
+        self._generation = graph._generation
+
+    def _position(self):
+        graph = self._graph
+        if self._generation != graph._generation:
+            self._i = graph._index[self._key]
+            self._generation = graph._generation
+        return self._i
+
+    def __getitem__(self, name):
+        return self._graph._get(self._position(), name)
+
+    def __setitem__(self, name, value):
+        self._graph._set(self._position(), name, value)
+        self._graph._writes.record(name)
+
+    def __delitem__(self, name):
+        self._graph._delete(self._position(), name)
+        self._graph._writes.record(name)
+
+    def __iter__(self):
+        return self._graph._fields(self._position())
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
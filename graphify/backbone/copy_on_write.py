@@ -0,0 +1,283 @@
+from collections.abc import MutableMapping
+from itertools import chain
+
+from graphify.backbone import GraphBackboneAbstraction
+from graphify.backbone.data import NodeDict
+from graphify.backbone.data import WriteCount
+from graphify.models.text import TextSpan
+
+_MISSING = object()
+
+# the values of the data of a node changed in place, rather than replaced
+_NESTED = (TextSpan, list, dict, set)
+# the values most nodes hold, left as they are without going through the (abstract) checks of `_NESTED`
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+_READ_ONLY = "The graph is shared with other documents and cannot be changed, see `Document.unshare`"
+
+
+class CopyOnWriteImplementation(GraphBackboneAbstraction):
+    """
+    Read only graph sharing the structure and the node data of a 'base' graph with other graphs,
+    e.g. between a document and the documents derived from it by `map_values`
+
+    The data of a node is only copied when written to, into 'own'; until then it is read from 'shared',
+    the data of the nodes copied by the graphs derived from, or else from 'base'
+    Neither 'base' nor 'shared' are ever changed: the graphs sharing them (see `derive`) are isolated from each other
+    Values nested in the data (e.g. the list of lines of 'text') are copied along with it, and before being handed out,
+    so that changing them in place does not reach the other graphs either
+
+    The structure cannot be changed: `materialize` turns the graph into a regular one first
+    """
+
+    def __init__(self, base, shared=None):
+        self.base = base
+        self.shared = {} if shared is None else shared
+        self.own = {}
+        # the writes to the nodes in 'own': those of 'base', never changed while shared, are counted by 'base'
+        self._writes = WriteCount()
+
+    @property
+    def root(self):
+        return self.base.root
+
+    @property
+    def root_key(self):
+        return self.base.root_key
+
+    @property
+    def integer_keys(self):
+        return self.base.integer_keys
+
+    @property
+    def version(self):
+        return self.base.version
+
+    @property
+    def text_buffer(self):
+        return self.base.text_buffer
+
+    @property
+    def graph(self):
+        return self.base.graph
+
+    @property
+    def last_inserted(self):
+        return self.base.last_inserted
+
+    @property
+    def open_ancestors(self):
+        return self.base.open_ancestors
+
+    @property
+    def _id(self):
+        return self.base._id
+
+    @property
+    def node(self):
+        return self
+
+    @property
+    def writes(self):
+        return self.base.writes + self._writes.value
+
+    def initialize(self):
+        return self.graph
+
+    def add_node(self, node, **data):
+        raise TypeError(_READ_ONLY)
+
+    def add_edge(self, a, b):
+        raise TypeError(_READ_ONLY)
+
+    def remove_nodes_from(self, nodes):
+        raise TypeError(_READ_ONLY)
+
+    def number_of_nodes(self):
+        return self.base.number_of_nodes()
+
+    def nodes(self, data=False):
+        if not data:
+            return self.base.nodes()
+        return [(key, self[key]) for key in self.base.nodes()]
+
+    def nodes_iter(self, data=False):
+        return self.nodes(data)
+
+    def edges(self, key=None):
+        return self.base.edges(key)
+
+    def parents(self, source):
+        return self.base.parents(source)
+
+    def predecessors(self, source):
+        return self.base.predecessors(source)
+
+    def successors(self, source):
+        return self.base.successors(source)
+
+    def exists_path(self, a, b):
+        return self.base.exists_path(a, b)
+
+    def dfs(self, source=None):
+        return self.base.dfs(source)
+
+    def bfs(self, source=None):
+        return self.base.bfs(source)
+
+    def derive(self):
+        """
+        Returns a new graph sharing the structure and the data of this one
+        The nodes this graph copied so far become shared as well: it copies them again before any further write
+        """
+        if self.own:
+            self.shared = {**self.shared, **self.own}
+            self.own = {}
+        # the writes to the nodes in 'own': those of 'base', never changed while shared, are counted by 'base'
+        self._writes = WriteCount()
+        return CopyOnWriteImplementation(self.base, self.shared)
+
+    def materialize(self):
+        """
+        Returns a regular graph (of the kind of 'base') with the data of this one, sharing nothing with it
+        but the text buffer (see `TextBuffer`), which only grows
+        """
+        graph = self.base.copy()
+        for key, data in chain(self.shared.items(), self.own.items()):
+            graph[key] = data
+        return detach(graph)
+
+    def copy(self):
+        return self.materialize()
+
+    def _data(self, key):
+        data = self.shared.get(key, _MISSING)
+        return self.base[key] if data is _MISSING else data
+
+    def owned(self, key):
+        """
+        Returns the data of node 'key' owned by this graph, a dict copied first if need be, nested values included
+        """
+        data = self.own.get(key)
+        if data is None:
+            data = self.own[key] = self._detached(self._data(key))
+        return data
+
+    def column(self, keys, name):
+        """
+        Returns the values of field 'name' of the nodes 'keys', read without copying anything:
+        nested values are those of the nodes, possibly shared with other graphs, and must not be changed in place
+        """
+        own, shared, base = self.own, self.shared, self.base
+        values = []
+        for key in keys:
+            data = own.get(key)
+            if data is None:
+                data = shared.get(key, _MISSING)
+                if data is _MISSING:
+                    data = base[key]
+            values.append(data[name])
+        return values
+
+    def set_column(self, keys, name, values):
+        """
+        Sets field 'name' of the nodes 'keys' to 'values', copying the nodes whose value changes only
+        """
+        own, data_of = self.own, self._data
+        for key, value in zip(keys, values):
+            data = own.get(key)
+            if data is None:
+                data = data_of(key)
+                if name in data and data[name] is value:
+                    continue
+                data = own[key] = self._detached(data)
+            data[name] = value
+
+    def __getitem__(self, key):
+        data = self.own.get(key)
+        if data is not None:
+            return data
+        if key not in self.shared:
+            # raises a KeyError for unknown nodes
+            self.base[key]
+        return SharedData(self, key)
+
+    def __setitem__(self, key, value):
+        self.own[key] = NodeDict(self._writes, value)
+
+    def _detached(self, data):
+        return NodeDict(self._writes, ((name, _detach(value)) for name, value in data.items()))
+
+
+def detach(graph):
+    """
+    Gives every node of 'graph' (e.g. a copy) its own nested values, so that changing them in place,
+    e.g. appending lines to 'text', does not reach the graph it was copied from
+    """
+    for _, data in graph.nodes(data=True):
+        nested = [name for name, value in data.items() if type(value) not in _SCALARS and isinstance(value, _NESTED)]
+        for name in nested:
+            data[name] = _detach(data[name])
+    return graph
+
+
+def _detach(value):
+    if type(value) in _SCALARS:
+        return value
+    elif isinstance(value, TextSpan):
+        return TextSpan(value.buffer, value.start, value.end)
+    elif isinstance(value, list):
+        # e.g. the lines of 'text', holding nothing nested, are copied as a whole
+        if _SCALARS.issuperset(map(type, value)):
+            return value.copy()
+        return [_detach(v) for v in value]
+    elif isinstance(value, dict):
+        if _SCALARS.issuperset(map(type, value.values())):
+            return value.copy()
+        return {k: _detach(v) for k, v in value.items()}
+    elif isinstance(value, set):
+        return set(value)
+    return value
+
+
+class SharedData(MutableMapping):
+    """
+    The data of a node of a `CopyOnWriteImplementation`, copied into the graph on first write
+    """
+
+    __slots__ = ('_graph', '_key')
+
+    def __init__(self, graph, key):
+        self._graph = graph
+        self._key = key
+
+    def _current(self):
+        graph = self._graph
+        data = graph.own.get(self._key)
+        return graph._data(self._key) if data is None else data
+
+    def __getitem__(self, name):
+        graph = self._graph
+        data = graph.own.get(self._key)
+        if data is None:
+            value = graph._data(self._key)[name]
+            if type(value) in _SCALARS or not isinstance(value, _NESTED):
+                return value
+            # a nested value could be changed in place: the node is copied first
+            data = graph.owned(self._key)
+        return data[name]
+
+    def __setitem__(self, name, value):
+        self._graph.owned(self._key)[name] = value
+
+    def __delitem__(self, name):
+        del self._graph.owned(self._key)[name]
+
+    def __iter__(self):
+        return iter(self._current())
+
+    def __len__(self):
+        return len(self._current())
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,76 @@
+# the fields of the nodes the indexes of a document are built on (see `graphify.models.index`)
+INDEXED_FIELDS = frozenset(('level', 'meta', 'id'))
+
+
+class WriteCount:
+    """
+    The count of the writes to the indexed fields (see `INDEXED_FIELDS`) of the nodes of a graph, kept by the graph
+    so that the documents built on it can tell their indexes are stale, e.g. after `data['level'] = 0`
+    (see `GraphBackboneAbstraction.writes` and `Document.index`)
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def record(self, name):
+        """
+        Counts a write to field 'name' of a node
+        """
+        if name in INDEXED_FIELDS:
+            self.value += 1
+
+
+class NodeDict(dict):
+    """
+    The data of a node: a plain dict counting the writes to its indexed fields into 'count', the `WriteCount`
+    of its graph, so that only the documents built on that graph index it again
+    Filling a new (empty) node is not a write
+    """
+
+    __slots__ = ('count',)
+
+    def __init__(self, count, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self.count = count
+
+    def __reduce__(self):
+        return NodeDict, (self.count, dict(self))
+
+    def __setitem__(self, name, value):
+        dict.__setitem__(self, name, value)
+        self.count.record(name)
+
+    def __delitem__(self, name):
+        dict.__delitem__(self, name)
+        self.count.record(name)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        filled = bool(self)
+        dict.update(self, *args, **kwargs)
+        if filled:
+            self.count.value += 1
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return dict.__getitem__(self, name)
+
+    def pop(self, name, *default):
+        if name in self:
+            self.count.record(name)
+        return dict.pop(self, name, *default)
+
+    def popitem(self):
+        self.count.value += 1
+        return dict.popitem(self)
+
+    def clear(self):
+        if self:
+            self.count.value += 1
+        dict.clear(self)
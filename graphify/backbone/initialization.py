@@ -1,10 +1,56 @@
+import os
+
+from typing import Optional
+from typing import Type
+
+from graphify.backbone import GraphBackboneAbstraction
+from graphify.backbone.compact import CompactImplementation
 from graphify.backbone.networkx import NetworkxImplementation
 from graphify.build.initialization import initialize_backbone
 
+# environment variable holding the name of the backbone used when none is chosen
+BACKBONE_ENV = 'GRAPHIFY_BACKBONE'
+
+DEFAULT_BACKBONE = 'networkx'
+
+BACKBONES = {
+    'networkx': NetworkxImplementation,
+    'compact': CompactImplementation
+}
+
+
+def register_backbone(name: str, backbone: Type[GraphBackboneAbstraction]):
+    """
+    Makes 'backbone' (an implementation of `GraphBackboneAbstraction`) selectable by 'name'
+    """
+    if not issubclass(backbone, GraphBackboneAbstraction):
+        raise ValueError(f"Invalid backbone '{backbone}': expected a GraphBackboneAbstraction implementation")
+    BACKBONES[name] = backbone
+
+
+def get_backbone(name: Optional[str] = None) -> Type[GraphBackboneAbstraction]:
+    """
+    Returns the backbone registered as 'name'
+    If None, the one named by the environment variable `GRAPHIFY_BACKBONE`, networkx by default
+    """
+    name = name or os.environ.get(BACKBONE_ENV) or DEFAULT_BACKBONE
+    try:
+        return BACKBONES[name]
+    except KeyError:
+        raise ValueError(f"Unknown backbone '{name}', available: {sorted(BACKBONES)}")
+
+
+def backbone_name(graph: GraphBackboneAbstraction) -> Optional[str]:
+    """
+    Returns the name 'graph' is registered with (None if its kind is not registered)
+    """
+    return next((name for name, backbone in BACKBONES.items() if type(graph) is backbone), None)
+
 
-def initialize_graph(name='ROOT'):
+def initialize_graph(name='ROOT', backbone: Optional[str] = None, integer_keys: bool = False):
     """
     Initializes a raw graph, subject to the chosen underlying graph library
-    # TODO: check some global flag indicating which backbone to use
+    'backbone' is the name of a registered backbone (see `get_backbone`)
+    With 'integer_keys' the nodes are keyed by their integer identifiers (see `GraphBackboneAbstraction.node_key`)
     """
-    return initialize_backbone(NetworkxImplementation(root=name))
+    return initialize_backbone(get_backbone(backbone)(root=name, integer_keys=integer_keys))
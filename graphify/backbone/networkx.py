@@ -1,30 +1,56 @@
 from graphify.backbone import GraphBackboneAbstraction
+from graphify.backbone.data import NodeDict
+from graphify.backbone.data import WriteCount
 
 import networkx as nx
 
 
+class _DiGraph(nx.DiGraph):
+    """
+    networkx graph holding the data of its nodes in `NodeDict`s counting into 'writes', copies included
+    """
+
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.writes = WriteCount()
+        super().__init__(incoming_graph_data, **attr)
+
+    def node_attr_dict_factory(self):
+        return NodeDict(self.writes)
+
+
 class NetworkxImplementation(GraphBackboneAbstraction):
     """
     Concrete implementation to serve a networkx backbone
     """
 
     def initialize(self):
-        self.graph = nx.DiGraph()
+        self.graph = _DiGraph()
         return self.graph
 
     @property
     def node(self):
         return self.graph.nodes
 
+    @property
+    def writes(self):
+        return self.graph.writes.value
+
     def add_node(self, node, **data):
         self.graph.add_node(node, **data)
         self.last_inserted = node
+        self.version += 1
 
     def add_edge(self, a, b):
         self.graph.add_edge(a, b)
+        self.version += 1
 
     def add_edges_from(self, it):
         self.graph.add_edges_from(it)
+        self.version += 1
+
+    def remove_nodes_from(self, nodes):
+        self.graph.remove_nodes_from(nodes)
+        self.version += 1
 
     def number_of_nodes(self):
         return nx.number_of_nodes(self.graph)
@@ -36,7 +62,7 @@ class NetworkxImplementation(GraphBackboneAbstraction):
         return self.graph.nodes(data=data)
 
     def edges(self, key=None):
-        if not key:
+        if key is None:
             return list(self.graph.edges())
         else:
             return list(self.graph.edges(key))
@@ -51,7 +77,15 @@ class NetworkxImplementation(GraphBackboneAbstraction):
         return self.graph.successors(source)
 
     def exists_path(self, node_a, node_b):
-        return nx.has_path(self.graph, node_a, node_b)
+        # the graph is a tree: climb the parents of 'node_b' looking for 'node_a'
+        pred = self.graph.pred
+        node = node_b
+        while node != node_a:
+            parents = pred[node]
+            if not parents:
+                return False
+            node = next(iter(parents))
+        return True
 
     def dfs(self, source=None):
         return nx.dfs_edges(self.graph, source=source or self.root_key)
@@ -60,14 +94,24 @@ class NetworkxImplementation(GraphBackboneAbstraction):
         return nx.bfs_edges(self.graph, source=source or self.root_key)
 
     def copy(self):
-        g = NetworkxImplementation(self.root)
+        g = NetworkxImplementation(self.root, self.integer_keys)
         g.graph = self.graph.copy()
-        g.last_inserted = str(self.last_inserted)
+        g.last_inserted = self.last_inserted
+        g.open_ancestors = list(self.open_ancestors)
+        g._id = self._id
+        g.version = self.version
+        g.text_buffer = self.text_buffer
         return g
 
     def __getitem__(self, key):
         return self.graph.nodes[key]
 
+    def __setitem__(self, key, value):
+        data = self.graph.nodes[key]
+        if data is not value:
+            data.clear()
+            data.update(value)
+
 
 if __name__ == '__main__':
     NetworkxImplementation()
@@ -0,0 +1,142 @@
+import logging
+
+from itertools import dropwhile
+
+from graphify.build.graph import handle_match
+from graphify.build.initialization import root_data
+from graphify.descriptor.search import search_descriptor_patterns
+from graphify.descriptor.utils import normalize_descriptor
+from graphify.ops.match import remove_descriptor_indicators
+
+logger = logging.getLogger(__name__)
+
+
+class ParseEventHandler(object):
+    """
+    Receiver of the events generated by `emit_events`; every method is a no-op by default
+    Subclasses override the ones they are interested in
+
+    The events follow the reading order of the document:
+        start_document, (enter_node, text*, ..., exit_node)*, end_document
+    Nodes are entered and exited in a properly nested way, like the tags of an xml document
+    """
+
+    def start_document(self, key, data):
+        pass
+
+    def enter_node(self, key, data):
+        pass
+
+    def text(self, key, line):
+        pass
+
+    def exit_node(self, key, data):
+        pass
+
+    def end_document(self, key, data):
+        pass
+
+
+class EventEmitter(object):
+    """
+    Stand-in for a graph backbone that turns the build operations into events
+    It exposes just what `handle_match` needs and keeps in memory only the chain of open nodes
+
+    Node data is handed over on `enter_node` with an empty 'text': the lines arrive through `text` events
+    """
+
+    def __init__(self, handler, root="ROOT"):
+        self.handler = handler
+        self._id = -1
+        self.root = root
+        self.root_key = "{} [{}]".format(self.root, self.next_id())
+        self.open = {self.root_key: root_data(root)}
+        self.open_ancestors = [self.root_key]
+
+        self.handler.start_document(self.root_key, self.open[self.root_key])
+
+    def cursor(self):
+        return self.open_ancestors[-1]
+
+    def next_id(self):
+        self._id += 1
+        return self._id
+
+    def node_key(self, base, id):
+        return '{} [{}]'.format(base, id)
+
+    def new_text(self):
+        return []
+
+    def add_node(self, node, **data):
+        self.open[node] = data
+
+    def add_edge(self, a, b):
+        pass
+
+    def open_ancestor(self, level):
+        chain = self.open_ancestors
+        while len(chain) > 1 and self.open[chain[-1]]['level'] >= level:
+            self._exit(chain.pop())
+        return chain[-1]
+
+    def push_ancestor(self, parent, node):
+        chain = self.open_ancestors
+        while chain[-1] != parent:
+            self._exit(chain.pop())
+        chain.append(node)
+        self.handler.enter_node(node, self.open[node])
+
+    def text(self, line):
+        self.handler.text(self.cursor(), line)
+
+    def close(self):
+        """
+        Exits every open node and signals the end of the document
+        """
+        chain = self.open_ancestors
+        while len(chain) > 1:
+            self._exit(chain.pop())
+        self.handler.end_document(self.root_key, self.open.pop(self.root_key))
+
+    def _exit(self, node):
+        self.handler.exit_node(node, self.open.pop(node))
+
+    def __getitem__(self, key):
+        return self.open[key]
+
+
+def emit_events(it, descriptor, handler, name='ROOT'):
+    """
+    Event driven counterpart of `build`: parses the iterable structure 'it'
+    without building a graph, reporting the structure found to 'handler' (see `ParseEventHandler`)
+
+    The text lines reported are already stripped of any of the descriptor 'exclude' patterns
+    """
+    descriptor = normalize_descriptor(descriptor)
+    emitter = EventEmitter(handler, name)
+    clean = descriptor['cleaner']
+
+    it = dropwhile(descriptor['startParsing'], it)
+
+    for line in it:
+
+        if descriptor['stopParsing'](line):
+            break
+
+        match, level = search_descriptor_patterns(line, descriptor)
+
+        if match:
+            try:
+                _ = handle_match(emitter, match, level, descriptor)
+                line = remove_descriptor_indicators(line, match)
+
+            except Exception as e:
+                logger.error(f"match {match}, level {level}, descriptor {descriptor}")
+                raise e
+
+        emitter.text(clean(line))
+
+    emitter.close()
+
+    return handler
@@ -2,7 +2,8 @@ import os
 from typing import Dict
 
 from graphify.descriptor.utils import parse_custom_data_object
-from graphify.ops.search import filter_bfs
+from graphify.models.document import key_to_numeric
+from graphify.models.text import TextBuffer
 
 
 def handle_match(graph, match, insert_level, descriptor):
@@ -14,7 +15,7 @@ def handle_match(graph, match, insert_level, descriptor):
     There are three cases that need to be considered:
     - a node with a higher level was detected and padding is required
     - a node with a higher level was detected and padding is not required
-    - every other case (same level or less)
+    - every other case (same level or less): the parent is the deepest open ancestor with a lower level
 
     The math can also contain custom user data via a named capture group `data`
     e.g. [[component]]{data}
@@ -32,20 +33,15 @@ def handle_match(graph, match, insert_level, descriptor):
     elif insert_level > current_level:
         parent_node = last_node
 
-    elif insert_level < current_level:
-        # parent_node = next(filter_bfs(graph, lambda x: x['level'] <= insert_level - 1))
-        nodes = reversed([a for a, _ in graph.dfs()])
-        parent_node = next(n for n in nodes if graph[n]['level'] <= insert_level - 1)
-
     else:
-        parent_node = next(iter(list(graph.predecessors(last_node)) or []), None)
+        parent_node = graph.open_ancestor(insert_level)
 
     data = {
         **{
             'meta': meta,
             'level': insert_level,
             'pad': False,
-            'text': []
+            'text': graph.new_text()
         },
         **data
     }
@@ -78,12 +74,13 @@ def _add_node(graph, key, parent, **data):
     """
     #  TODO: 'parent' is assuming a direct graph and a single connection. This assumption is too much restrictive
     id = graph.next_id()
-    new_node = _build_node_key(key, id)
+    new_node = graph.node_key(key, id)
 
     data['id'] = data.get('id', _unique_path_identifier(graph, key, parent, id))
 
     graph.add_node(new_node, **data)
     graph.add_edge(parent, new_node)
+    graph.push_ancestor(parent, new_node)
     return new_node
 
 
@@ -110,12 +107,71 @@ def _pad(graph, last_node, level, concrete_level, descriptor):
         return last_node
     else:
         meta = descriptor['components'][level - 1]
-        node = _add_node(graph, meta, last_node, meta=meta, level=level, pad=True, content=[])
+        node = _add_node(graph, meta, last_node, meta=meta, level=level, pad=True, text=graph.new_text())
         return _pad(graph, node, level + 1, concrete_level, descriptor)
 
 
-def _build_node_key(base, id):
-    return '{} [{}]'.format(base, id)
+def detach_subtree(graph, node):
+    """
+    Removes the subtree rooted at 'node' from 'graph' and returns it as a new graph of the same kind
+    The new graph keeps a copy of the root (without its text) so that it can stand as a document on its own
+    """
+    edges = list(graph.dfs(node))
+    nodes = [node] + [b for _, b in edges]
+
+    subgraph = type(graph)(graph.root, graph.integer_keys)
+    subgraph.initialize()
+    subgraph.add_node(graph.root_key, **{**graph[graph.root_key], 'text': []})
+
+    for n in nodes:
+        subgraph.add_node(n, **graph[n])
+
+    subgraph.add_edge(graph.root_key, node)
+    for a, b in edges:
+        subgraph.add_edge(a, b)
+
+    graph.remove_nodes_from(nodes)
+    return subgraph
+
+
+def use_text_buffer(graph):
+    """
+    Moves the text of the nodes of 'graph' into a shared `TextBuffer`, in insertion order,
+    leaving each node with a span of its lines; the nodes created from then on get a span too
+    Does nothing if the graph already has a buffer
+    """
+    if graph.text_buffer is not None:
+        return graph
+
+    buffer = TextBuffer()
+    for node in sorted(graph.nodes(), key=key_to_numeric):
+        data = graph[node]
+        span = buffer.span()
+        span.extend(data['text'])
+        data['text'] = span
+
+    graph.text_buffer = buffer
+    return graph
+
+
+def compact_text_buffer(graph):
+    """
+    Copies the text of the nodes of 'graph' into a new `TextBuffer`, in insertion order,
+    leaving out the lines none of them holds any more (see `TextBuffer.dead`)
+    The old buffer is left as it is, for the graphs that still share it
+    """
+    if graph.text_buffer is None:
+        return graph
+
+    buffer = TextBuffer(block=graph.text_buffer.block)
+    for node in sorted(graph.nodes(), key=key_to_numeric):
+        data = graph[node]
+        span = buffer.span()
+        span.extend(data['text'])
+        data['text'] = span
+
+    graph.text_buffer = buffer
+    return graph
 
 
 def append_content(graph, line):
@@ -0,0 +1,285 @@
+import logging
+
+from bisect import bisect_left, bisect_right
+from itertools import takewhile
+
+from graphify.build.traverse import _iterative_traverse
+from graphify.models.document import key_to_numeric
+
+logger = logging.getLogger(__name__)
+
+
+class LineIndex(object):
+    """
+    Maps the lines of the source of a document onto the nodes holding them
+
+    'keys' are the nodes in insertion order, 'numerics' their sorting representation (see `key_to_numeric`)
+    and 'offsets' the line of the source where the text of each of them starts
+    'start' is the first line that was parsed and 'stop' the line where the parsing stopped
+    (the number of lines of the source if it never did)
+    'fixed_start' tells if 'start' is determined by a `startParsing` marker, which an edit could move
+
+    Every line in [start, stop) belongs to exactly one node: the one that was under the cursor when it was read
+    """
+
+    def __init__(self, keys, offsets, start, stop, fixed_start=False):
+        self.keys = keys
+        self.numerics = [key_to_numeric(k) for k in keys]
+        self.offsets = offsets
+        self.start = start
+        self.stop = stop
+        self.fixed_start = fixed_start
+
+    @classmethod
+    def from_document(cls, document, source, descriptor, fixed_start=False):
+        """
+        Builds the index of 'document', parsed from the lines in 'source' with the (normalized) 'descriptor'
+        """
+        start = sum(1 for _ in takewhile(descriptor['startParsing'], source))
+
+        keys, offsets = [], []
+        line = start
+        for key, data in document.traverse():
+            keys.append(key)
+            offsets.append(line)
+            line += len(data.get('text', []))
+
+        if line > len(source) or (line < len(source) and not descriptor['stopParsing'](source[line])):
+            raise ValueError("The document was not parsed from the given source lines")
+
+        return cls(keys, offsets, start, line, fixed_start)
+
+    def owner(self, line):
+        """
+        Position of the node holding 'line'
+        """
+        return bisect_right(self.offsets, line) - 1
+
+    def position(self, key):
+        """
+        Position of the node 'key' in insertion order
+        """
+        return bisect_left(self.numerics, key_to_numeric(key))
+
+    def end(self, position):
+        """
+        Line where the node in 'position' (and everything that comes before it) ends
+        """
+        return self.offsets[position] if position < len(self.offsets) else self.stop
+
+    def splice(self, i, j, keys, offsets, delta):
+        """
+        Replaces the nodes in positions [i, j) by 'keys', starting at 'offsets'
+        Every node after them is shifted by 'delta' lines
+        """
+        self.keys[i:j] = keys
+        self.numerics[i:j] = [key_to_numeric(k) for k in keys]
+        self.offsets[i:j] = offsets
+        if delta:
+            after = i + len(keys)
+            self.offsets[after:] = [o + delta for o in self.offsets[after:]]
+        self.stop += delta
+
+
+class _SplicingGraph(object):
+    """
+    View over a scratch graph handing out node identifiers that sort in between two existing nodes
+    Records the nodes created through it, in insertion order
+    """
+
+    def __init__(self, graph, low, high):
+        self._graph = graph
+        self._base = _interval_base(low, high)
+        self._counter = 0
+        self.created = []
+
+    def next_id(self):
+        self._counter += 1
+        return '_'.join(str(i) for i in self._base + (self._counter,))
+
+    def add_node(self, node, **data):
+        self._graph.add_node(node, **data)
+        self.created.append(node)
+
+    def __getitem__(self, key):
+        return self._graph[key]
+
+    def __getattr__(self, name):
+        return getattr(self._graph, name)
+
+
+def splice_edit(graph, index, source, start, end, lines, descriptor):
+    """
+    Re-parses only the part of the graph affected by replacing the lines source[start:end] by 'lines'
+
+    Starting from the node holding the edit, we look for the smallest enclosing subtree whose lines,
+    once re-parsed, leave the rest of the document untouched: the first node after it must keep its parent
+    The subtree is then replaced by the re-parsed nodes, which get identifiers sorting in between its neighbours,
+    so that every node outside of the edited region keeps its key and data
+
+    'index' is updated accordingly. Returns a pair (removed, created): the levels of the nodes replaced by key,
+    and the keys of the nodes created, or None if the edit cannot be handled locally and the whole document needs to be parsed again
+    """
+    delta = len(lines) - (end - start)
+
+    if start > index.stop:
+        return {}, []
+
+    if end > index.stop and index.stop < len(source):
+        return None
+
+    if start < index.start or (index.fixed_start and start <= index.start):
+        return None
+
+    if index.stop == index.start or len(index.keys) < 2 or any(descriptor['stopParsing'](line) for line in lines):
+        return None
+
+    node = index.keys[index.owner(min(start, index.stop - 1))]
+
+    while node != graph.root_key:
+        i = index.position(node)
+        j = i + 1 + sum(1 for _ in graph.dfs(node))
+        r0, r1 = index.end(i), index.end(j)
+
+        # padding nodes are created along with the node that follows them, which has to be parsed again too
+        if r0 <= start and end <= r1 and not graph[index.keys[i - 1]].get('pad'):
+            region = source[r0:start] + list(lines) + source[end:r1]
+            spliced = _reparse_region(graph, index, i, j, region, descriptor)
+
+            if spliced is not None:
+                removed, created, offsets = spliced
+                index.splice(i, j, created, offsets, delta)
+                logger.info(f"Spliced {len(created)} nodes in place of {len(removed)} (lines {r0} to {r1})")
+                return removed, created
+
+        node = next(iter(graph.parents(node)))
+
+    return None
+
+
+def _reparse_region(graph, index, i, j, region, descriptor):
+    """
+    Parses the lines of 'region' in place of the nodes in positions [i, j) of the index
+    The region is parsed on a scratch graph holding just the chain of open ancestors at the time it started
+
+    Returns a triple (removed, created, offsets), see `splice_edit`,
+    or None if the result would change the structure of what follows the region
+    """
+    prev = index.keys[i - 1]
+    following = index.keys[j] if j < len(index.keys) else None
+
+    chain = _path(graph, prev)
+    scratch = type(graph)(graph.root, graph.integer_keys)
+    scratch.initialize()
+
+    for a, b in zip([None] + chain, chain):
+        data = dict(graph[b])
+        if b == prev:
+            data['text'] = list(data.get('text', []))
+        scratch.add_node(b, **data)
+        if a is not None:
+            scratch.add_edge(a, b)
+
+    scratch.open_ancestors = list(chain)
+    scratch.last_inserted = prev
+    scratch._id = graph._id
+
+    low = _token(prev)
+    high = _token(following) if following is not None else None
+    view = _SplicingGraph(scratch, low, high)
+
+    _iterative_traverse(iter(region), view, prev, descriptor)
+
+    if following is not None and not _keeps_parent(graph, scratch, following):
+        return None
+
+    removed = {key: graph[key]['level'] for key in index.keys[i:j]}
+    cursor, open_ancestors = graph.cursor(), graph.open_ancestors
+
+    if graph.text_buffer is not None:
+        graph.text_buffer.dead += sum(len(graph[key]['text']) for key in removed)
+    graph.remove_nodes_from(removed)
+
+    text = _as_text(graph, scratch[prev]['text'], graph[prev]['text'])
+    graph[prev]['text'] = text
+
+    offsets = []
+    line = index.offsets[i - 1] + len(text)
+    for key in view.created:
+        data = dict(scratch[key])
+        data['text'] = _as_text(graph, data['text'])
+        graph.add_node(key, **data)
+        graph.add_edge(next(iter(scratch.parents(key))), key)
+        offsets.append(line)
+        line += len(data['text'])
+
+    if following is not None:
+        graph.last_inserted, graph.open_ancestors = cursor, open_ancestors
+    else:
+        graph.last_inserted, graph.open_ancestors = scratch.cursor(), list(scratch.open_ancestors)
+
+    return removed, view.created, offsets
+
+
+def _as_text(graph, lines, replaced=()):
+    """
+    The text of a node spliced into 'graph': a span of its text buffer if it has one, in place of 'replaced'
+    """
+    buffer = graph.text_buffer
+    if buffer is None:
+        return lines
+
+    buffer.dead += len(replaced)
+    span = buffer.span()
+    span.extend(lines)
+    return span
+
+
+def _keeps_parent(graph, scratch, node):
+    """
+    Checks if 'node' would still be attached to the same parent
+    when read right after the region parsed into 'scratch'
+    """
+    level = graph[node]['level']
+    if level > scratch[scratch.cursor()]['level']:
+        return False
+
+    chain = list(scratch.open_ancestors)
+    while len(chain) > 1 and scratch[chain[-1]]['level'] >= level:
+        chain.pop()
+
+    return chain[-1] == next(iter(graph.parents(node)))
+
+
+def _path(graph, node):
+    """
+    Returns the list of nodes from the root down to 'node'
+    """
+    path = [node]
+    while path[-1] != graph.root_key:
+        path.append(next(iter(graph.parents(path[-1]))))
+    return path[::-1]
+
+
+def _token(key):
+    """
+    The identifier of a node key as a tuple, e.g. 'Article [5_1]' (or (5, 1) with integer keys) -> (5, 1)
+    """
+    numeric = key_to_numeric(key)
+    return numeric[:1] if numeric[1:] == (0,) else numeric
+
+
+def _interval_base(low, high):
+    """
+    Returns a tuple 'base' such that every 'base + (k,)', for k >= 1, sorts strictly between 'low' and 'high'
+    'high' is None when there is no upper bound
+    """
+    if high is None or len(high) <= len(low) or high[:len(low)] != low:
+        return low
+
+    following = high[len(low)]
+    if following >= 1:
+        return low + (following - 1,)
+
+    return _interval_base(low + (0,), high)
+
@@ -7,11 +7,18 @@ def initialize_backbone(fw):
 
     'fw' is the underlying graph framework used
     """
-    base = fw.root
     key = fw.root_key
-    meta = base.lower().replace(' ', '-')
 
     fw.initialize()
-    fw.add_node(key, meta=meta, level=0, text=[], pad=False, id=('/' + meta))
+    fw.add_node(key, **root_data(fw.root))
+    fw.open_ancestors = [key]
 
     return fw
+
+
+def root_data(base):
+    """
+    Data held by the root node of a document named 'base'
+    """
+    meta = base.lower().replace(' ', '-')
+    return {'meta': meta, 'level': 0, 'text': [], 'pad': False, 'id': ('/' + meta)}
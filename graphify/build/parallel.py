@@ -0,0 +1,150 @@
+import logging
+import multiprocessing
+import re
+
+from itertools import dropwhile
+
+from graphify.backbone.initialization import initialize_graph
+from graphify.backbone.networkx import NetworkxImplementation
+from graphify.build.graph import use_text_buffer
+from graphify.build.initialization import initialize_backbone
+from graphify.build.traverse import _iterative_traverse, _never
+from graphify.descriptor.matcher import DescriptorMatcher
+from graphify.descriptor.prefilter import Prefilter
+
+logger = logging.getLogger(__name__)
+
+# placeholder for the node identifiers handed out by the workers, resolved when the chunks are stitched
+_TOKEN = re.compile('\x00(\\d+)\x00')
+
+# compiled descriptor of each worker process, set once by `_initialize_worker`
+_worker = {}
+
+
+class _ChunkGraph(NetworkxImplementation):
+    """
+    Graph a chunk is built on: the node identifiers are placeholders, relative to the start of the chunk,
+    since the number of nodes created by the preceding chunks is not known yet
+    """
+
+    def __init__(self, root="ROOT"):
+        super().__init__(root)
+        self.root_key = "{} [0]".format(root)
+        self._id = 0
+
+    def next_id(self):
+        self._id += 1
+        return '\x00{}\x00'.format(self._id)
+
+
+def build_parallel(it, state, processes=None, chunk_lines=10000):
+    """
+    Parallel version of `resume_build` for a fresh 'state': the lines of 'it' are split at the level 1 components,
+    found by a pre-scan with the level 1 patterns only, into chunks of about 'chunk_lines' lines
+    Every chunk is built by a pool of 'processes' and the resulting subtrees are stitched, in order, under the root
+
+    The splitting is sound because a level 1 component always hangs from the root, whatever came before it.
+    Node keys and ids are resolved when stitching, so the graph is exactly the one built sequentially
+    The chunks are built on networkx, the stitched graph on the backbone of 'state'
+    """
+    descriptor = state.compiled
+    graph = initialize_graph(state.name, state.backbone, descriptor['integerKeys'])
+    if descriptor['textBuffer']:
+        use_text_buffer(graph)
+
+    processes = processes or multiprocessing.cpu_count()
+    chunks = _split(it, descriptor, state, chunk_lines)
+
+    with multiprocessing.Pool(processes, initializer=_initialize_worker, initargs=(state.plan, state.name)) as pool:
+        for chunk in pool.imap(_build_chunk, chunks):
+            _stitch(graph, chunk)
+
+    state.capture(graph)
+
+    logger.info("Raw graph constructed in parallel with '{0}' nodes".format(graph.number_of_nodes()))
+
+    return graph
+
+
+def _split(it, descriptor, state, chunk_lines):
+    """
+    Yields the lines to parse in chunks starting at a level 1 component (but the first one)
+    The start and stop markers are handled here, recording on 'state' whether they were found
+    """
+    level_1 = descriptor['patterns'][:1]
+    prefilter, matcher = Prefilter(level_1), DescriptorMatcher(level_1)
+    stop = descriptor['stopParsing']
+
+    chunk = []
+    for line in dropwhile(descriptor['startParsing'], it):
+        state.started = True
+
+        if stop(line):
+            state.stopped = True
+            break
+
+        if len(chunk) >= chunk_lines and prefilter(line) and matcher(line)[0]:
+            yield chunk
+            chunk = []
+
+        chunk.append(line)
+
+    if chunk:
+        yield chunk
+
+
+def _initialize_worker(plan, name):
+    _worker['descriptor'] = dict(plan.descriptor(), startParsing=_never, stopParsing=_never)
+    _worker['name'] = name
+
+
+def _build_chunk(lines):
+    """
+    Builds a chunk on its own graph and returns what `_stitch` needs:
+    the root text, the nodes in insertion order as (key, parent, data) and the chain of open nodes
+    """
+    descriptor = _worker['descriptor']
+
+    graph = initialize_backbone(_ChunkGraph(_worker['name']))
+    if descriptor['textBuffer']:
+        use_text_buffer(graph)
+    graph = _iterative_traverse(lines, graph, graph.root_key, descriptor)
+
+    nodes = []
+    for key, data in graph.nodes(data=True):
+        if key != graph.root_key:
+            nodes.append((key, next(iter(graph.parents(key))), data))
+
+    return graph[graph.root_key]['text'], nodes, graph.open_ancestors
+
+
+def _stitch(graph, chunk):
+    """
+    Adds the nodes of a chunk to 'graph', resolving their identifiers
+    """
+    text, nodes, open_ancestors = chunk
+    offset = graph._id
+    root = "{} [0]".format(graph.root)
+
+    resolve = lambda s: _TOKEN.sub(lambda m: str(offset + int(m.group(1))), s)
+
+    def resolve_key(key):
+        if key == root:
+            return graph.root_key
+        elif graph.integer_keys:
+            return offset + int(_TOKEN.search(key).group(1))
+        return resolve(key)
+
+    graph[graph.root_key]['text'].extend(text)
+
+    for key, parent, data in nodes:
+        key = resolve_key(key)
+        # resolved before the node is added, rather than written to it (see `GraphBackboneAbstraction.writes`)
+        if isinstance(data['id'], str):
+            data = {**data, 'id': resolve(data['id'])}
+        graph.add_node(key, **data)
+        graph.add_edge(resolve_key(parent), key)
+
+    graph._id += len(nodes)
+    if nodes:
+        graph.open_ancestors = [resolve_key(node) for node in open_ancestors]
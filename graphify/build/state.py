@@ -0,0 +1,80 @@
+from graphify.descriptor.plan import parse_plan
+
+
+class BuildState(object):
+    """
+    Everything the build process needs to carry on parsing lines into an existing graph,
+    with the very same result as if they had been part of the source from the start
+
+    'descriptor' is the descriptor given by the user, or its `ParsePlan`
+    'cursor' is the last inserted node, 'open_ancestors' the chain of nodes that can still receive children
+    and 'last_id' the last node identifier handed out
+    'started' tells if the `startParsing` marker was already found and 'stopped' if the `stopParsing` one was
+    'backbone' is the name of the backbone the graph is built on (see `get_backbone`), None for the default one
+
+    While a document is in memory its graph holds the live cursor, chain and identifier:
+    `capture` takes a snapshot of them and `restore` puts them back into a graph
+    """
+
+    def __init__(self, descriptor, name='ROOT', cursor=None, open_ancestors=None, last_id=0,
+                 started=False, stopped=False, backbone=None):
+        self.plan = parse_plan(descriptor)
+        self.name = name
+        self.cursor = cursor or "{} [0]".format(name)
+        self.open_ancestors = list(open_ancestors or [self.cursor])
+        self.last_id = last_id
+        self.started = started
+        self.stopped = stopped
+        self.backbone = backbone
+        self._compiled = None
+
+    @property
+    def descriptor(self):
+        return self.plan.source
+
+    @property
+    def compiled(self):
+        """
+        The descriptor in the form expected by the build process (a working copy of the plan)
+        """
+        if self._compiled is None:
+            self._compiled = self.plan.descriptor()
+        return self._compiled
+
+    def capture(self, graph):
+        self.cursor = graph.cursor()
+        self.open_ancestors = list(graph.open_ancestors)
+        self.last_id = graph._id
+        return self
+
+    def restore(self, graph):
+        # composite integer keys come back from json as lists
+        key = lambda k: tuple(k) if isinstance(k, list) else k
+        graph.last_inserted = key(self.cursor)
+        graph.open_ancestors = [key(k) for k in self.open_ancestors]
+        graph._id = self.last_id
+        return graph
+
+    def __getstate__(self):
+        # the working copy holds functions: it is taken again from the plan after unpickling
+        return dict(self.__dict__, _compiled=None)
+
+    def to_dict(self):
+        """
+        Plain representation of the state, json serializable as long as the descriptor is
+        (i.e. it is made of strings and not of compiled patterns or functions)
+        """
+        return {
+            'descriptor': dict(self.descriptor),
+            'name': self.name,
+            'cursor': self.cursor,
+            'open_ancestors': list(self.open_ancestors),
+            'last_id': self.last_id,
+            'started': self.started,
+            'stopped': self.stopped,
+            'backbone': self.backbone
+        }
+
+    @staticmethod
+    def from_dict(d):
+        return BuildState(**d)
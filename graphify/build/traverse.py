@@ -4,7 +4,7 @@ import networkx as nx
 from itertools import dropwhile
 
 from graphify.backbone.initialization import initialize_graph
-from graphify.build.graph import handle_match, append_content
+from graphify.build.graph import handle_match, append_content, detach_subtree, use_text_buffer
 from graphify.descriptor.search import search_descriptor_patterns
 from graphify.descriptor.utils import normalize_descriptor
 from graphify.ops.match import remove_descriptor_indicators
@@ -12,30 +12,124 @@ from graphify.ops.match import remove_descriptor_indicators
 logger = logging.getLogger(__name__)
 
 
-def build(it, descriptor, name='ROOT'):
+def build(it, descriptor, name='ROOT', backbone=None):
     """
     Initialize the empty raw graph and parse the iterable structure 'it'
+    'backbone' is the name of the graph backbone to use (see `get_backbone`)
     """
-    graph = initialize_graph(name)
-
     descriptor = normalize_descriptor(descriptor)
 
+    graph = initialize_graph(name, backbone, descriptor['integerKeys'])
+    if descriptor['textBuffer']:
+        use_text_buffer(graph)
+
     it = dropwhile(descriptor['startParsing'], it)
 
-    graph = _iterative_traverse(it, graph, "{} [0]".format(name), descriptor)
+    graph = _iterative_traverse(it, graph, graph.root_key, descriptor)
 
     logger.info("Raw graph constructed with '{0}' nodes".format(nx.number_of_nodes(graph)))
+    logger.info("Prefilter report: {0}".format(descriptor['prefilter'].report()))
+
+    return graph
+
+
+def build_stream(it, descriptor, sink, name='ROOT', backbone=None):
+    """
+    Streaming version of `build`
+
+    As soon as a top level component (a direct child of the root) is closed, i.e. the next one starts,
+    its finished subtree is detached from the graph and handed to 'sink' as a standalone graph
+    The peak memory is then bounded by the largest top level section and not by the whole document
+
+    Returns what is left of the graph: the root node along with any text preceding the first component
+    The `textBuffer` option is ignored, since a buffer shared by the sections would keep all of them in memory
+    """
+    descriptor = normalize_descriptor(descriptor)
+
+    graph = initialize_graph(name, backbone, descriptor['integerKeys'])
+
+    it = dropwhile(descriptor['startParsing'], it)
+
+    open_section = None
+
+    def flush_closed_section(graph, node):
+        nonlocal open_section
+        top_level = graph.open_ancestors[1]
+        if open_section is not None and open_section != top_level:
+            sink(detach_subtree(graph, open_section))
+        open_section = top_level
+
+    graph = _iterative_traverse(it, graph, graph.root_key, descriptor, on_insert=flush_closed_section)
+
+    if open_section is not None:
+        sink(detach_subtree(graph, open_section))
+
+    logger.info("Raw graph streamed, '{0}' nodes generated".format(graph._id + 1))
+    logger.info("Prefilter report: {0}".format(descriptor['prefilter'].report()))
+
+    return graph
+
+
+def resume_build(it, state, graph=None, on_insert=None):
+    """
+    Resumable version of `build`: carries on building 'graph' with the lines of 'it' from where 'state' left it
+    (see `BuildState`) and keeps 'state' up to date, so that the lines of a source can be fed in several chunks
+
+    A new graph is initialized, on the backbone of 'state', if none is given
+    """
+    descriptor = state.compiled
+
+    if graph is None:
+        graph = initialize_graph(state.name, state.backbone, descriptor['integerKeys'])
+
+    if state.stopped:
+        return graph
+
+    if descriptor['textBuffer']:
+        use_text_buffer(graph)
+
+    it = iter(it)
+    if not state.started:
+        it = dropwhile(descriptor['startParsing'], it)
+
+    it = _until_stop(it, descriptor, state)
+    graph = _iterative_traverse(it, graph, graph.cursor(), dict(descriptor, stopParsing=_never), on_insert)
+
+    state.capture(graph)
+
+    logger.info("Raw graph resumed, '{0}' nodes generated so far".format(graph._id + 1))
 
     return graph
 
 
-def _iterative_traverse(iterator, graph, last_node, descriptor):
+def _until_stop(it, descriptor, state):
+    """
+    Yields the lines of 'it' up to the `stopParsing` marker, recording on 'state' whether it was reached
+    """
+    for line in it:
+        state.started = True
+        if descriptor['stopParsing'](line):
+            state.stopped = True
+            return
+        yield line
+
+
+def _never(line):
+    return False
+
+
+def _iterative_traverse(iterator, graph, last_node, descriptor, on_insert=None):
     """
     Loop through the lines in an iterative way
     This is necessary due to the lack of support of python to handle massive recursion
 
     At each iteration check to see if the current line triggers a signal to top the parsing process
+    'on_insert', if given, is called with the graph and the new node after every match is accommodated
+
+    Lines are stripped of the descriptor 'exclude' patterns (e.g. internal tags) before being stored
     """
+    clean = descriptor['cleaner']
+
     for line in iterator:
 
         if descriptor['stopParsing'](line):
@@ -45,15 +139,17 @@ def _iterative_traverse(iterator, graph, last_node, descriptor):
 
         if match:
             try:
-                _ = handle_match(graph, match, level, descriptor)
+                node = handle_match(graph, match, level, descriptor)
                 line = remove_descriptor_indicators(line, match)
 
             except Exception as e:
                 logger.error(f"match {match}, level {level}, descriptor {descriptor}")
                 raise e
 
-        graph = append_content(graph, line)
+            if on_insert:
+                on_insert(graph, node)
 
-    return graph
+        graph = append_content(graph, clean(line))
 
+    return graph
 
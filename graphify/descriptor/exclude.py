@@ -0,0 +1,81 @@
+import os
+import re
+
+from typing import List
+
+from graphify.descriptor.prefilter import _minimal_literals
+from graphify.descriptor.prefilter import _pattern_heads
+
+
+class ExcludeCleaner(object):
+    """
+    Strips the descriptor 'exclude' patterns (e.g. internal tags like `[[Chapter]]`) from the lines of text
+
+    The patterns are applied one after the other, in order, as removing a match can make or break the match
+    of another pattern (e.g. nested tags or overlapping user patterns)
+    Lines none of the patterns match are returned right away, without going through every pattern:
+        - when every pattern starts with a literal, e.g. `[[`, lines not containing it are not even scanned
+        - otherwise the patterns are merged into a single alternation, to look for any match in one scan
+
+    Patterns with groups (which could hold backreferences) or with different flags cannot be merged,
+    every pattern is then applied to the lines passing the literal check
+    """
+
+    def __init__(self, patterns: List):
+        patterns = [p if isinstance(p, re.Pattern) else re.compile(p) for p in _flatten(patterns)]
+        self.patterns = tuple(patterns)
+        self.literals = _gate(patterns)
+
+        self.subs = tuple(p.sub for p in patterns)
+        self.search = None
+
+        if len({p.flags for p in patterns}) == 1 and not any(p.groups for p in patterns):
+            try:
+                merged = re.compile('|'.join(f'(?:{p.pattern})' for p in patterns), patterns[0].flags)
+                self.search = merged.search
+            except re.error:
+                # e.g. inline global flags, only allowed at the start of a pattern
+                pass
+
+    def clean(self, line: str) -> str:
+        """
+        Returns 'line' without any occurrence of the patterns
+        """
+        literals = self.literals
+        if literals is not None and not any(literal in line for literal in literals):
+            return line
+
+        search = self.search
+        if search is not None and search(line) is None:
+            return line
+
+        for sub in self.subs:
+            line = sub('', line)
+        return line
+
+    __call__ = clean
+
+
+def _flatten(patterns):
+    for p in patterns:
+        if isinstance(p, (list, tuple)):
+            yield from _flatten(p)
+        else:
+            yield p
+
+
+def _gate(patterns):
+    """
+    Returns the literals one of which must be present in a line for any of the patterns to match
+    or None if there is no such set
+    """
+    heads = [_pattern_heads(p) for p in patterns]
+    if any(h is None for h in heads):
+        return None
+
+    prefixes = [h.prefix for hs in heads for h in hs]
+    if not all(prefixes):
+        return None
+
+    common = os.path.commonprefix(prefixes)
+    return (common,) if common else _minimal_literals(prefixes)
@@ -0,0 +1,32 @@
+import re
+
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+class DescriptorMatcher(object):
+    """
+    Single pass classification of a line against every pattern of a (normalized) descriptor
+
+    The patterns of all levels are flattened, in priority order, into one sequence of bound `search` methods
+    Each pattern is evaluated at most once per line and the first hit wins,
+    which yields the very same `(match, level)` as checking every level in the order of the hierarchy
+    """
+
+    def __init__(self, patterns: List[List]):
+        self.searches = tuple((p.search, i + 1) for i, level in enumerate(patterns) for p in level)
+
+    def search(self, line: str) -> Tuple[Optional[re.Match], Optional[int]]:
+        """
+        Returns the pair `(match, level)` of the highest level in the hierarchy with a pattern present in 'line'
+        Otherwise returns `(None, None)`
+        """
+        for search, level in self.searches:
+            match = search(line)
+            if match:
+                return match, level
+
+        return None, None
+
+    __call__ = search
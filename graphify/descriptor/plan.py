@@ -0,0 +1,109 @@
+import copy
+import re
+
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict
+from typing import Union
+
+from graphify.descriptor.utils import normalize_descriptor
+from graphify.descriptor.utils import prepare_descriptor
+
+
+class ParsePlan(object):
+    """
+    A descriptor compiled, once and for all, into the form expected by the build process
+    (see `prepare_descriptor` and `normalize_descriptor`)
+
+    A plan is immutable, so it can be shared between threads and reused by any number of parses:
+    every parse gets its own working copy through `descriptor`, with fresh prefilter counters
+    Plans are hashable (two plans are equal if they come from equal descriptors) and picklable:
+    only the source descriptor is sent over, and compiled again on the other side
+
+    'source' is a read only copy of the descriptor given, whose nested values are not to be changed either
+
+    Use `parse_plan` to get the plan of a descriptor, which are cached
+    """
+
+    __slots__ = ('source', 'key', '_compiled')
+
+    def __init__(self, descriptor: Dict):
+        descriptor = copy.deepcopy(dict(descriptor))
+        compiled = normalize_descriptor(prepare_descriptor(descriptor))
+
+        object.__setattr__(self, 'source', MappingProxyType(descriptor))
+        object.__setattr__(self, 'key', _freeze(descriptor))
+        object.__setattr__(self, '_compiled', compiled)
+
+    def descriptor(self) -> Dict:
+        """
+        Working copy of the compiled descriptor for a single parse
+        """
+        compiled = self._compiled
+        return dict(compiled, prefilter=compiled['prefilter'].fresh())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("A ParsePlan is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, ParsePlan) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __reduce__(self):
+        return parse_plan, (dict(self.source),)
+
+    def __repr__(self):
+        return f"ParsePlan({dict(self.source)!r})"
+
+
+def parse_plan(descriptor: Union[Dict, ParsePlan]) -> ParsePlan:
+    """
+    Returns the plan of 'descriptor', compiled only the first time that descriptor (or an equal one) is seen
+    A plan is returned as is
+    """
+    if isinstance(descriptor, ParsePlan):
+        return descriptor
+    return _cached_plan(_Frozen(descriptor))
+
+
+class _Frozen(object):
+    """
+    Hashable wrapper of a descriptor, to be used as a cache key
+    """
+
+    __slots__ = ('descriptor', 'key')
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.key = _freeze(descriptor)
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+@lru_cache(maxsize=128)
+def _cached_plan(frozen):
+    return ParsePlan(frozen.descriptor)
+
+
+def _freeze(x):
+    """
+    Hashable representation of a descriptor: containers become tuples (frozensets for sets)
+    and patterns their source and flags
+    Anything else (e.g. functions) stands for itself
+    """
+    if isinstance(x, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in x.items()))
+    elif isinstance(x, (list, tuple)):
+        return tuple(_freeze(i) for i in x)
+    elif isinstance(x, (set, frozenset)):
+        return frozenset(_freeze(i) for i in x)
+    elif isinstance(x, re.Pattern):
+        return 're', x.pattern, x.flags
+    return x
@@ -0,0 +1,291 @@
+import copy
+import re
+
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import FrozenSet
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+_BEGINNING = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+_REPEATS = tuple(
+    op for op in (
+        sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, getattr(sre_constants, 'POSSESSIVE_REPEAT', None)
+    ) if op is not None
+)
+_GROUPS = tuple(
+    op for op in (sre_constants.SUBPATTERN, getattr(sre_constants, 'ATOMIC_GROUP', None)) if op is not None
+)
+
+# character classes larger than this are not worth expanding into a set
+_MAX_CHARSET = 256
+
+
+class Head(NamedTuple):
+    """
+    What the beginning of a match looks like for one alternative of a pattern
+
+    'anchored' means the match can only start at the beginning of the line
+    'prefix' is a literal the match must start with (possibly empty)
+    'chars' and 'decimal' describe the first character when there is no literal prefix
+    """
+    anchored: bool
+    prefix: str
+    chars: FrozenSet[str]
+    decimal: bool
+
+
+class Prefilter(object):
+    """
+    Cheap rejection of lines that cannot be matched by any descriptor pattern
+
+    Every pattern is inspected once (through the regex parse tree) to extract its required literals,
+    start of line anchors and first character sets, e.g. `[[Chapter]]`, `^PART` or `^\\d`
+    A line only makes it to the regex engine if one of these plain string checks succeeds
+
+    If any of the patterns cannot be characterized (e.g. custom matchers or case insensitive patterns)
+    the prefilter lets every line through
+
+    The number of lines passed and skipped is kept so that the efficacy can be reported
+    """
+
+    def __init__(self, patterns: List[List]):
+        heads = [_pattern_heads(p) for level in patterns for p in level]
+
+        self.enabled = bool(heads) and all(h is not None for h in heads)
+        heads = [h for hs in heads if hs for h in hs] if self.enabled else []
+
+        self.starts = tuple(sorted({h.prefix for h in heads if h.anchored and h.prefix}))
+        self.first = frozenset().union(*[h.chars for h in heads if h.anchored and not h.prefix])
+        self.decimal = any(h.decimal for h in heads if h.anchored and not h.prefix)
+        self.literals = _minimal_literals(
+            [h.prefix for h in heads if not h.anchored and h.prefix] +
+            [c for h in heads if not h.anchored and not h.prefix for c in h.chars]
+        )
+
+        self.passed = 0
+        self.skipped = 0
+
+    def candidate(self, line: str) -> bool:
+        """
+        Returns False only if none of the patterns can possibly match 'line'
+        """
+        if not self.enabled or self._candidate(line):
+            self.passed += 1
+            return True
+
+        self.skipped += 1
+        return False
+
+    __call__ = candidate
+
+    def _candidate(self, line):
+        head = line[:1]
+
+        if line.startswith(self.starts) or head in self.first or (self.decimal and head.isdecimal()):
+            return True
+
+        for literal in self.literals:
+            if literal in line:
+                return True
+
+        return False
+
+    def fresh(self):
+        """
+        Returns a prefilter sharing this one's analysis, with its own counters
+        """
+        prefilter = copy.copy(self)
+        prefilter.passed = 0
+        prefilter.skipped = 0
+        return prefilter
+
+    def report(self):
+        """
+        Returns a summary with the number of lines passed through and skipped
+        'ratio' is the fraction of lines that were skipped without running any regex
+        """
+        total = self.passed + self.skipped
+        return {
+            'passed': self.passed,
+            'skipped': self.skipped,
+            'ratio': self.skipped / total if total else 0.0
+        }
+
+
+def _minimal_literals(literals):
+    """
+    A line containing a literal contains all of its superstrings' requirements,
+    so only the literals not containing any other one need to be checked
+    """
+    literals = sorted(set(literals), key=lambda x: (len(x), x))
+    minimal = []
+    for literal in literals:
+        if not any(m in literal for m in minimal):
+            minimal.append(literal)
+    return tuple(minimal)
+
+
+def _pattern_heads(pattern) -> Optional[List[Head]]:
+    """
+    Returns the possible heads of the matches of 'pattern' (an empty list if it can never match)
+    or None if nothing can be said about them
+    """
+    if not isinstance(pattern, re.Pattern) or not isinstance(pattern.pattern, str):
+        return None
+
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except Exception:
+        return None
+
+    flags = parsed.state.flags
+    if flags & re.IGNORECASE:
+        return None
+
+    try:
+        result = _walk(list(parsed), False, flags)
+    except (TypeError, ValueError, IndexError):
+        # a parse tree shaped in a way this module does not know about (e.g. from a newer python)
+        return None
+    if result is None or result[0] == 'zero':
+        return None
+
+    # a digit anywhere in the line is not selective enough to be worth the check
+    if any(h.decimal and not h.anchored and not h.prefix for h in result[1]):
+        return None
+
+    return result[1]
+
+
+def _walk(items, anchored, flags):
+    """
+    Walks a sequence of parsed regex items until the first one consuming a character
+
+    Returns ('heads', [Head, ...]) when such an item is found,
+    ('zero', anchored) if the sequence only contains zero width assertions
+    or None when the sequence cannot be characterized
+    """
+    for i, (op, av) in enumerate(items):
+        rest = list(items[i + 1:])
+
+        if op is sre_constants.AT:
+            if av in _BEGINNING:
+                if av is sre_constants.AT_BEGINNING and flags & re.MULTILINE:
+                    return None
+                anchored = True
+            continue
+
+        elif op is sre_constants.LITERAL:
+            run, _ = _literal_run(rest)
+            heads = [Head(anchored, chr(av) + run, frozenset(), False)]
+
+        elif op is sre_constants.IN:
+            charset = _charset(av)
+            if charset is None:
+                return None
+            heads = [Head(anchored, '', charset[0], charset[1])]
+
+        elif op in _GROUPS:
+            if op is sre_constants.SUBPATTERN and av[1] & re.IGNORECASE:
+                return None
+            result = _walk(list(_group_items(op, av)), anchored, flags)
+            if result is None:
+                return None
+            elif result[0] == 'zero':
+                anchored = result[1]
+                continue
+            heads = result[1]
+
+        elif op is sre_constants.BRANCH:
+            results = [_walk(list(alternative), anchored, flags) for alternative in av[1]]
+            if any(r is None or r[0] == 'zero' for r in results):
+                return None
+            heads = [h for r in results for h in r[1]]
+
+        elif op in _REPEATS and av[0] >= 1:
+            result = _walk(list(av[2]), anchored, flags)
+            if result is None or result[0] == 'zero':
+                return None
+            heads = result[1]
+
+        else:
+            return None
+
+        # a start of line anchor after a consumed character can never match
+        if not flags & re.MULTILINE and _requires_beginning(rest):
+            return 'heads', []
+
+        return 'heads', heads
+
+    return 'zero', anchored
+
+
+def _group_items(op, av):
+    """
+    The parsed items of a group: the last field of a SUBPATTERN, the argument itself for an ATOMIC_GROUP
+    """
+    return av[-1] if op is sre_constants.SUBPATTERN else av
+
+
+def _literal_run(items):
+    """
+    Returns the literal string a sequence of parsed items starts with
+    along with a flag indicating if the whole sequence is literal
+    """
+    run = ''
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            run += chr(av)
+        elif op is sre_constants.SUBPATTERN and not av[1] & re.IGNORECASE:
+            sub, complete = _literal_run(list(av[-1]))
+            run += sub
+            if not complete:
+                return run, False
+        else:
+            return run, False
+    return run, True
+
+
+def _charset(items):
+    """
+    Returns a pair (chars, decimal) with the characters matched by a character class
+    or None if the class is too broad to be useful
+    """
+    chars = set()
+    decimal = False
+
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_constants.RANGE and av[1] - av[0] < _MAX_CHARSET:
+            chars.update(chr(c) for c in range(av[0], av[1] + 1))
+        elif op is sre_constants.CATEGORY and av is sre_constants.CATEGORY_DIGIT:
+            decimal = True
+        else:
+            return None
+
+    return frozenset(chars), decimal
+
+
+def _requires_beginning(items):
+    """
+    Checks if a sequence of parsed items necessarily goes through a start of line anchor
+    """
+    for op, av in items:
+        if op is sre_constants.AT and av in _BEGINNING:
+            return True
+        elif op in _GROUPS and _requires_beginning(list(_group_items(op, av))):
+            return True
+        elif op is sre_constants.BRANCH and all(_requires_beginning(list(a)) for a in av[1]):
+            return True
+        elif op in _REPEATS and av[0] >= 1 and _requires_beginning(list(av[2])):
+            return True
+    return False
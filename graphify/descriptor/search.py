@@ -1,3 +1,4 @@
+from graphify.descriptor.matcher import DescriptorMatcher
 
 
 def search_descriptor_patterns(x, descriptor):
@@ -7,19 +8,13 @@ def search_descriptor_patterns(x, descriptor):
 
     Assumes the list of patterns comes in ordered by the taxonomy hierarchy
     The level is returned with 1-based index since the level 0 is reserved for the root node
-    """
-
-    def is_hit(x, y):
-        return any((bool(i.search(y)) for i in x))
 
-    def search(x, y):
-        it = (i.search(y) for i in x)
-        return next(i for i in it if bool(i))
-
-    it = (
-        (search(pattern, x), i + 1)
-        for i, pattern in enumerate(descriptor['patterns']) if is_hit(pattern, x)
-    )
+    The patterns are evaluated by the descriptor 'matcher' (see `normalize_descriptor`) in a single pass
+    Lines rejected by the descriptor 'prefilter' never reach the regex engine
+    """
+    prefilter = descriptor.get('prefilter')
+    if prefilter is not None and not prefilter(x):
+        return None, None
 
-    hit, level = next(it, (None, None))
-    return hit, level
+    matcher = descriptor.get('matcher') or DescriptorMatcher(descriptor['patterns'])
+    return matcher.search(x)
@@ -1,7 +1,15 @@
+import ast
+import copy
+import json
 import re
 
+from functools import lru_cache
 from typing import Dict
+from typing import Tuple
 from graphify.descriptor.constants.patterns import DATA_NAMED_GROUP
+from graphify.descriptor.exclude import ExcludeCleaner
+from graphify.descriptor.matcher import DescriptorMatcher
+from graphify.descriptor.prefilter import Prefilter
 
 
 def compile_patterns(descriptor):
@@ -39,13 +47,27 @@ def _compile(pattern):
     return result
 
 
+def prepare_descriptor(descriptor: Dict) -> Dict:
+    """
+    Extends and compiles a user descriptor into the form expected by the build process
+    """
+    descriptor = extend_internal_patterns(descriptor)
+    descriptor = extend_descriptor_with_data_capture_group(descriptor)
+    descriptor = compile_patterns(descriptor)
+    return descriptor
+
+
 def normalize_descriptor(descriptor):
     """
     The parsing logic might assume the user describes specific behaviour on the descriptor
     If not, some defaults can be used to facilitate the use of the parsing
 
     Returns a new descriptor with default behaviours
+    A descriptor that was already normalized (e.g. handed out by a `ParsePlan`) is returned as is
     """
+    if isinstance(descriptor.get('matcher'), DescriptorMatcher) and isinstance(descriptor.get('prefilter'), Prefilter):
+        return descriptor
+
     descriptor = descriptor.copy()
 
     stopParsing = descriptor.get('stopParsing', None)
@@ -68,8 +90,17 @@ def normalize_descriptor(descriptor):
     if 'exclude' not in descriptor:
         descriptor['exclude'] = []
 
+    if 'textBuffer' not in descriptor:
+        descriptor['textBuffer'] = False
+
+    if 'integerKeys' not in descriptor:
+        descriptor['integerKeys'] = False
+
     # standard model to process patterns:
     descriptor['patterns'] = [[p] if not isinstance(p, (list, tuple)) else p for p in descriptor['patterns']]
+    descriptor['matcher'] = DescriptorMatcher(descriptor['patterns'])
+    descriptor['prefilter'] = Prefilter(descriptor['patterns'])
+    descriptor['cleaner'] = ExcludeCleaner(descriptor['exclude'])
 
     return descriptor
 
@@ -108,7 +139,7 @@ def extend_descriptor_with_data_capture_group(descriptor: Dict) -> Dict:
 
     e.g. a pattern like `[[Chapter]]` would result in `[[Chapter]]{...}`
     The `{...}` is a named capture group and should be a valid
-    python dictionary (to be materialized via `eval`)
+    python dictionary of literals (see `parse_custom_data_object`)
     """
     descriptor = descriptor.copy()
     make_pattern = lambda pattern: f'(?P<component>{pattern}){DATA_NAMED_GROUP}'
@@ -126,13 +157,46 @@ def parse_custom_data_object(match: re.Match) -> Dict:
     Given a `match` parse its `data` named capture group
     and return a materialized dictionary
     Otherwise return an empty dict
+
+    The data object is read as a literal (json or a python dict made of literals, see `ast.literal_eval`)
+    and never evaluated as code. Identical payloads are parsed once (see `_literal_data`)
+    """
+    data_str = match.groupdict().get('data')
+    if not data_str:
+        return {}
+
+    try:
+        data, nested = _literal_data(data_str)
+    except (ValueError, SyntaxError, MemoryError, RecursionError) as e:
+        line = match.string.rstrip('\n')
+        raise ValueError(
+            f"Invalid custom data object '{data_str}' at column {match.start('data')} of line '{line}': {e}"
+        ) from None
+
+    # the cached object is shared: every node gets its own copy
+    return copy.deepcopy(data) if nested else dict(data)
+
+
+@lru_cache(maxsize=4096)
+def _literal_data(data_str: str) -> Tuple[Dict, bool]:
+    """
+    Parses a data object, returning it along with a flag telling if it holds any container
+
+    json is tried first as it is by far the fastest to parse. Python dicts quoting their strings with `'`
+    are turned into json when there is no other quote nor escape sequence to get in the way
+    Anything json does not accept is left to `ast.literal_eval`
     """
-    data_str = match.groupdict().get('data') or '{}'
+    json_str = data_str
+    if "'" in data_str and '"' not in data_str and '\\' not in data_str:
+        json_str = data_str.replace("'", '"')
 
     try:
-        data = eval(data_str)
-        return data
-    except Exception as e:
-        raise ValueError(f"Invalid custom data object in '{data_str}'")
+        data = json.loads(json_str)
+    except ValueError:
+        data = ast.literal_eval(data_str)
 
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a dictionary, got {type(data).__name__}")
 
+    nested = any(isinstance(v, (dict, list, set, tuple)) for v in data.values())
+    return data, nested
@@ -1,14 +1,20 @@
 import re
 import logging
+from itertools import islice
 import networkx as nx
 
 from nxpd import draw
 
-from graphify.backbone.networkx import NetworkxImplementation
+from graphify.backbone.copy_on_write import CopyOnWriteImplementation
+from graphify.backbone.copy_on_write import detach
+from graphify.backbone.initialization import get_backbone
+from graphify.models.index import NodeIndex, PathIndex, StructuralIndex
 from graphify.utils.recipes import flatten
 
 logger = logging.getLogger(__name__)
 
+_KEY_IDENTIFIER = re.compile(r'\[(\d+(?:_\d+)*)[a-z]?\]')
+
 
 class Document(object):
     """
@@ -16,12 +22,31 @@ class Document(object):
     conversion to json representation is also available
     """
 
-    def __init__(self, graph, root):
+    def __init__(self, graph, root, order=None, depths=None):
+        """
+        'order', when known (e.g. the nodes of a fresh build), lists the node keys in insertion order
+        and spares `traverse` from sorting them
+        'depths', when known, is the pair (active_depth, max_depth) and spares traversing the nodes
+        """
         self.graph = graph
         self.root = root
+        self._order = None
+        self._order_graph = None
+        self._order_version = None
+        self._index = None
+        self._paths = None
+        self._structure = None
+        # the count of writes to indexed fields the indexes were built at (see `GraphBackboneAbstraction.writes`)
+        self._index_writes = None
+        self._paths_writes = None
+        if order is not None:
+            self.set_order(order)
         self.active_depth = None
         self.max_depth = None
-        self.set_depths()
+        if depths is None:
+            self.set_depths()
+        else:
+            self.active_depth, self.max_depth = depths
 
     def id(self):
         return self.graph.node[self.root]["id"]
@@ -30,10 +55,35 @@ class Document(object):
         """
         Returns a tuple (key, data) for a the whose ID ends with the token 'suffix'
         eg. id_ends_with('chapter-xii') -> 'document-a/title-vii/chapter-xii' (first match) (and should be only)
+
+        Whole segments are looked up in the path index (see `paths`); a partial one, e.g. 'ter-xii', scans the ids
+        """
+        keys = self.paths().ending_with(suffix)
+        if keys:
+            positions = self.index().positions
+            node = min(keys, key=positions.__getitem__)
+            if not suffix.startswith('/'):
+                # an earlier id may end with the suffix within its last segment, e.g. '/root/chapter-xii' for 'xii'
+                data = self.graph.node
+                node = next((key for key in islice(self.order(), positions[node]) if data[key]['id'].endswith(suffix)),
+                            node)
+            return node, self.graph.node[node]
+        return next(((key, data) for key, data in self.traverse() if data['id'].endswith(suffix)), None)
+
+    def node_by_id(self, node_id):
         """
-        node = [(key, data) for key, data in self.traverse() if data['id'].endswith(suffix)]
-        if node:
-            return node[0]
+        Returns a tuple (key, data) for the (first) node with id 'node_id', None if there is none
+        """
+        keys = self.paths().exact(node_id)
+        if keys:
+            return keys[0], self.graph.node[keys[0]]
+
+    def nodes_under(self, prefix, data=True):
+        """
+        returns a generator with the nodes whose ids start with 'prefix', in insertion order
+        i.e. the subtree named by a path such as '/root/schedule-1/part-2' (whole segments only)
+        """
+        return self._lookup(sorted(self.paths().under(prefix), key=self.index().positions.__getitem__), data)
 
     def draw(self):
         """plot the graph to help visualisation"""
@@ -42,58 +92,102 @@ class Document(object):
     def to_dict(self):
         """
         parsing from nx graph representation to dict/json
+        Nodes are always listed by their string keys (see `label`), whatever the keys of the graph
         """
+        label = self.label if self.graph.integer_keys else lambda key: key
+
         result = {"document_name": self.root_node()["meta"], "nodes": []}
         for node, data in self.traverse():
-            successors = list(self.successors(node))
-            predecessors = list(self.predecessors(node))
+            successors = [label(s) for s in self.successors(node)]
+            predecessors = [label(p) for p in self.predecessors(node)]
+            # plain dictionaries and lists, whatever the backbone and text storage
+            if not isinstance(data, dict) or not isinstance(data['text'], list):
+                data = dict(data, text=list(data['text']))
             result["nodes"].append(
-                {"key": node, "content": data, "successors": successors, "predecessors": predecessors})
+                {"key": label(node), "content": data, "successors": successors, "predecessors": predecessors})
         return result
 
     @staticmethod
-    def from_dict(d):
+    def from_dict(d, backbone=None, integer_keys=False):
+        """
+        Inverse of `to_dict`, building the graph on 'backbone' (see `get_backbone`)
+        With 'integer_keys' the string keys are translated into integer ones
+        """
         root_node = d["nodes"][0]
 
-        graph = NetworkxImplementation(root_node['key'][:-4])
+        graph = get_backbone(backbone)(root_node['key'][:-4], integer_keys)
         graph.initialize()
 
+        key = label_to_key if integer_keys else lambda label: label
+
         # add nodes first
         for node_all_data in d["nodes"]:
-            node_key = node_all_data["key"]
-            graph.add_node(node_key, attr_dict=node_all_data["content"])
+            node_key = key(node_all_data["key"])
+            graph.add_node(node_key, **node_all_data["content"])
 
         # add edges
         for node_all_data in d["nodes"]:
-            key = node_all_data["key"]
-            graph.add_edges_from(map(lambda p: (p, key), node_all_data["predecessors"]))
-            graph.add_edges_from(map(lambda s: (key, s), node_all_data["successors"]))
+            node_key = key(node_all_data["key"])
+            graph.add_edges_from((key(p), node_key) for p in node_all_data["predecessors"])
+            graph.add_edges_from((node_key, key(s)) for s in node_all_data["successors"])
 
-        doc = Document(graph, root_node['key'])
+        doc = Document(graph, graph.root_key)
 
         return doc
 
+    def label(self, key):
+        """
+        Returns the string key of a node, e.g. 'Chapter [1]', whether the graph has string or integer keys
+        With integer keys the label is made of the 'meta' of the node (the name of the document for the root)
+        """
+        if isinstance(key, str):
+            return key
+
+        base = self.graph.root if key == self.graph.root_key else self.graph[key]['meta']
+        return '{} [{}]'.format(base, key if isinstance(key, int) else '_'.join(str(i) for i in key))
+
+    def key(self, label):
+        """
+        Inverse of `label`: returns the key of the node with string key 'label' in this document
+        """
+        if not self.graph.integer_keys or not isinstance(label, str):
+            return label
+        return label_to_key(label)
+
     def set_depths(self):
         self.active_depth = self._active_depth()
         self.max_depth = self._max_depth()
 
     def node(self, key):
-        return self.graph.node[key]
+        return self._data(self.key(key))
+
+    def view(self, key):
+        """
+        Returns a `DocumentView` of the subtree of node 'key', sharing the graph of this document
+        """
+        return DocumentView(self, self.key(key))
 
     def nodes(self, depth, node_data=True):
-        for node, data in self.graph.nodes_iter(data=True):
-            if data['level'] == depth and not node_data:
-                yield node
-            elif data['level'] == depth and node_data:
-                yield (node, data)
+        """
+        returns a generator with the nodes of level 'depth', in insertion order
+        """
+        return self._lookup(self.index().levels.get(depth, ()), node_data)
+
+    def components(self, meta, data=True):
+        """
+        returns a generator with the nodes whose 'meta' is 'meta' (e.g. every 'Article'), in insertion order
+        """
+        return self._lookup(self.index().metas.get(meta, ()), data)
 
     def search(self, pattern):
         """search for nodes whose 'meta' match a given pattern"""
-        result = None
-        for node, data in self.traverse():
-            if pattern in data['meta']:
-                return node, data
-        return result
+        index = self.index()
+        # the first node of each matching component, the earliest of them being the first match
+        first = [keys[0] for meta, keys in index.metas.items() if pattern in meta]
+        if not first:
+            return None
+        node = min(first, key=index.positions.__getitem__)
+        return node, self.graph.node[node]
 
     def search_by_pattern(self, pattern, key=lambda data: data['meta']):
         """
@@ -123,31 +217,170 @@ class Document(object):
         lines = []
         for node, data in self.traverse():
             if just_text or data['has_text'] or data['pad']:
-                lines += data['text']
+                lines.append(data['text'])
             else:
-                lines += [data['meta']] + data['title'] + data['text']
+                lines.append([data['meta']] + data['title'] + data['text'])
         return flatten(lines)
 
     def traverse(self, data=True):
         """
         returns a generator with the nodes ordered by the time of insertion
         """
-        nodes = sorted(self.graph.nodes(), key=lambda x: key_to_numeric(x))
-        for node in nodes:
-            yield (node, self.graph.node[node]) if data else node
+        nodes = self.order()
+        if not data:
+            yield from nodes
+            return
+
+        node = self.graph.node
+        for key in nodes:
+            yield key, node[key]
+
+    def order(self):
+        """
+        Returns the node keys in insertion order
+        The list is cached until nodes are added to or removed from the graph (see `GraphBackboneAbstraction.version`)
+        and must not be modified by the caller
+        """
+        graph = self.graph
+        if self._order_graph is not graph or self._order_version != graph.version:
+            self.set_order(sorted(graph.nodes(), key=key_to_numeric))
+        return self._order
+
+    def set_order(self, order):
+        """
+        Caches 'order', the node keys in insertion order, as up to date with the current graph
+        """
+        self._order = order if isinstance(order, list) else list(order)
+        self._order_graph = self.graph
+        self._order_version = self.graph.version
+        self._index = self._paths = self._structure = None
+
+    def extend_order(self, nodes):
+        """
+        Appends 'nodes', inserted after all of the others since the order was last cached,
+        to the order and to the indexes (see `index`) if they are built
+        """
+        self._order.extend(nodes)
+        if self._index is not None:
+            self._index.extend(self.graph, nodes)
+        if self._paths is not None:
+            self._paths.extend(self.graph, nodes)
+        if self._structure is not None:
+            self._structure.extend(self.graph, nodes)
+        self._order_version = self.graph.version
+
+    def index(self):
+        """
+        Returns the `NodeIndex` of the document: its nodes by level, by meta and its leaves
+        Built on first use and kept up to date with the nodes added or removed, as is the order (see `order`)
+        Built again after the 'level', 'meta' or 'id' of a node of the graph is changed in place
+        (see `GraphBackboneAbstraction.writes`)
+        """
+        order = self.order()
+        writes = self.graph.writes
+        if self._index is None or self._index_writes != writes:
+            self._index_writes = writes
+            self._index = NodeIndex.build(self.graph, order)
+        return self._index
+
+    def paths(self):
+        """
+        Returns the `PathIndex` of the document, looking nodes up by id
+        Kept up to date the same way as `index`
+        """
+        order = self.order()
+        writes = self.graph.writes
+        if self._paths is None or self._paths_writes != writes:
+            self._paths_writes = writes
+            self._paths = PathIndex.build(self.graph, order)
+        return self._paths
+
+    def structure(self):
+        """
+        Returns the `StructuralIndex` of the document, answering ancestry, lowest common ancestor,
+        k-th ancestor, sibling position and subtree queries
+        Kept up to date with the nodes added or removed, as is the order (see `order`)
+        """
+        order = self.order()
+        if self._structure is None:
+            self._structure = StructuralIndex.build(self.graph, order, self.root)
+        return self._structure
+
+    def reindex(self):
+        """
+        Drops the indexes (see `index`, `paths` and `structure`), to be built again on next use
+        """
+        self._index = self._paths = self._structure = None
+
+    def share(self):
+        """
+        Turns the graph of the document into a `CopyOnWriteImplementation`, to be shared with other documents
+        without being copied first (see `derive`); the document then copies the data of a node before writing to it,
+        and its structure can no longer be changed until `unshare`
+        Returns the shared graph
+        """
+        if not isinstance(self.graph, CopyOnWriteImplementation):
+            self._replace_graph(CopyOnWriteImplementation(self.graph))
+        return self.graph
+
+    def derive(self):
+        """
+        Returns a new document sharing the nodes of this one, their data being copied on write
+        (see `CopyOnWriteImplementation`)
+
+        This document is left as it is: unless its graph is already shared (e.g. it was derived itself, see `share`)
+        the new one shares a copy of it (see `detach`), so that the changes made to this one do not reach it
+        """
+        graph = self.graph
+        if isinstance(graph, CopyOnWriteImplementation):
+            graph = graph.derive()
+        else:
+            graph = CopyOnWriteImplementation(detach(graph.copy()))
+        return Document(graph, self.root, list(self.order()), (self.active_depth, self.max_depth))
+
+    def unshare(self):
+        """
+        Gives the document a graph of its own again, if shared (see `share`), before changing its structure
+        """
+        if isinstance(self.graph, CopyOnWriteImplementation):
+            self._replace_graph(self.graph.materialize())
+
+    def _replace_graph(self, graph):
+        """
+        Swaps the graph for one holding the same nodes, keeping the order and the indexes
+        """
+        current = self._order_graph is self.graph and self._order_version == self.graph.version
+        writes = self.graph.writes
+        self.graph = graph
+        if current:
+            self._order_graph, self._order_version = graph, graph.version
+        # the count of writes starts over with the graph
+        if self._index_writes == writes:
+            self._index_writes = graph.writes
+        if self._paths_writes == writes:
+            self._paths_writes = graph.writes
+
+    def _data(self, key):
+        graph = self.graph
+        if isinstance(graph, CopyOnWriteImplementation):
+            # the dict of the node rather than a proxy (see `SharedData`), e.g. to be serialized, copied first
+            # along with its nested values, which the caller may change in place
+            return graph.owned(key)
+        return graph.node[key]
+
+    def _lookup(self, keys, data):
+        if not data:
+            return iter(keys)
+        node = self.graph.node
+        return ((key, node[key]) for key in keys)
 
     def leaf_nodes(self, data=True):
         """
         Return all leaf nodes of the graph
         Note that this does not necessarily mean that they will all be paragraphs
-        We're returning all the nodes that do not have predecessors in the direct graph
+        We're returning all the nodes that have a parent but no successors in the direct graph
         """
-        leaf_nodes = [
-            node for node in self.graph.nodes()
-            if self.graph.in_degree(node) != 0 and self.graph.out_degree(node) == 0
-        ]
-        for node in leaf_nodes:
-            yield (node, self.graph.node[node]) if data else node
+        return self._lookup(self.index().leaves, data)
 
     def paragraphs(self, data=True):
         """
@@ -158,8 +391,11 @@ class Document(object):
 
     @staticmethod
     def identifier(x):
-        reg = re.compile(r'\[(\d+\_?(\d+)?)[a-z]?\]')
-        return reg.search(x).groups(0)[0]
+        if isinstance(x, int):
+            return str(x)
+        elif isinstance(x, tuple):
+            return '_'.join(str(i) for i in x)
+        return _KEY_IDENTIFIER.search(x).group(1)
 
     def _max_depth(self):
         """
@@ -174,7 +410,7 @@ class Document(object):
         """
         get first level that is actual populated by content (i.e. is not a padding node)
         """
-        for n_left, n_right in self.graph.dfs():
+        for n_left, n_right in self.graph.dfs(self.root):
             if self.node(n_right)['pad'] == 0:
                 return self.node(n_right)['level']
         return 0
@@ -191,19 +427,21 @@ class Document(object):
         adds to 'ref' to the list of 'level' from node with 'node_key'.
         if level is None, 'ref' is added to 'unknown' field
         """
+        # the lists of references are changed in place: the node is copied first if shared (see `_data`)
+        data = self.node(node_key)
         if level:
             level_key = "level_{}".format(level)
-            self.node(node_key)[ref_key][level_key].append(ref)
+            data[ref_key][level_key].append(ref)
         else:
             # unknown level references
-            self.node(node_key)[ref_key]['unknown'].append(ref)
+            data[ref_key]['unknown'].append(ref)
         return self
 
     def successors(self, node):
-        return self.graph.successors(node)
+        return self.graph.successors(self.key(node))
 
     def predecessors(self, node):
-        return self.graph.predecessors(node)
+        return self.graph.predecessors(self.key(node))
 
     def flat_report(self, consider_leafs=False):
         """
@@ -227,10 +465,11 @@ class Document(object):
         return report
 
     def __getitem__(self, key):
-        return self.graph.node[key]
+        return self._data(self.key(key))
 
     def __setitem__(self, key, value):
-        self.graph.node[key] = value
+        self.graph[self.key(key)] = value
+        self.reindex()
 
     def __repr__(self):
         """Useful document representation"""
@@ -258,37 +497,102 @@ class Document(object):
         return not self.__eq__(other)
 
 
+class DocumentView(Document):
+    """
+    `Document` over the subtree of a node of another document, e.g. a single chapter
+    The graph and the data of the nodes are shared with the document, nothing is copied:
+    the view only holds the keys of its nodes (see `order`) and its own indexes, built on first use
+
+    The view follows the changes of the document, as long as its root is kept, and the other way around:
+    the data written through the view (e.g. `view[key] = data`) is that of the document
+    """
+
+    def __init__(self, document, root):
+        self.document = document
+        self.root = root
+        self._order = None
+        self._order_graph = None
+        self._order_version = None
+        self._index = None
+        self._paths = None
+        self._structure = None
+        self._index_writes = None
+        self._paths_writes = None
+        self.active_depth = None
+        self.max_depth = None
+        self.set_depths()
+
+    @property
+    def graph(self):
+        return self.document.graph
+
+    def order(self):
+        """
+        Returns the keys of the nodes of the subtree in insertion order, a slice of the order of the document
+        """
+        graph = self.graph
+        if self._order_graph is not graph or self._order_version != graph.version:
+            self.set_order(self.document.structure().subtree(self.root))
+        return self._order
+
+    def predecessors(self, node):
+        key = self.key(node)
+        return iter(()) if key == self.root else self.graph.predecessors(key)
+
+    def _active_depth(self):
+        """
+        unlike the root of a document, the root of a view is content itself (unless it is a padding node)
+        """
+        data = self.root_node()
+        return super()._active_depth() if data['pad'] else data['level']
+
+    def unshare(self):
+        self.document.unshare()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.document.reindex()
+
+
 def _merge_accumulator(acc, new_acc):
     """
     merge accumulators elements that are of the same type
     e.g.:
         [[A], [A], [B]] => [[A,A], [B]]
     """
-    if not acc:
-        return new_acc
-
-    if not new_acc:
-        new_acc.append(acc[0])
-        return _merge_accumulator(acc[1:], new_acc)
-
-    elif acc[0][0]['level'] == new_acc[-1][-1]['level']:
-        new_acc[-1] += acc[0]
-        return _merge_accumulator(acc[1:], new_acc)
-
-    else:
-        new_acc.append(acc[0])
-        return _merge_accumulator(acc[1:], new_acc)
+    for group in acc:
+        if new_acc and group[0]['level'] == new_acc[-1][-1]['level']:
+            new_acc[-1] += group
+        else:
+            new_acc.append(group)
+    return new_acc
 
 
 def key_to_numeric(x):
     """
     Represent a node identifier (key) by a numeric value to be used in the representation
     Useful to sorting operations
+
+    Keys spliced in between two existing ones carry a composite identifier, e.g. 'Article [5_1]' or 'Article [5_0_2]'
+    and are represented by a longer tuple, which sorts right after its prefix
+    Integer keys (see `GraphBackboneAbstraction.node_key`) are represented the same way, without any parsing
     """
-    reg = re.compile(r'\[(\d+\_?(\d+)?)[a-z]?\]')
-    inspect = reg.search(x).groups(0)[0]
-    if '_' in inspect:
-        left, right = inspect.split('_')
-        return int(left), int(right)
+    if isinstance(x, int):
+        return x, 0
+    elif isinstance(x, tuple):
+        return x
+
+    inspect = _KEY_IDENTIFIER.search(x).groups(0)[0]
+    parts = tuple(int(i) for i in inspect.split('_'))
+    if len(parts) > 1:
+        return parts
     else:
-        return int(inspect), 0
+        return parts[0], 0
+
+
+def label_to_key(label):
+    """
+    Integer key of a node given its string key, e.g. 'Chapter [1]' -> 1 and 'Article [5_1]' -> (5, 1)
+    """
+    numeric = key_to_numeric(label)
+    return numeric[0] if numeric[1:] == (0,) else numeric
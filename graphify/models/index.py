@@ -0,0 +1,322 @@
+from array import array
+
+
+class NodeIndex(object):
+    """
+    Secondary indexes over the nodes of a document, each holding node keys in insertion order:
+        - 'levels': level -> nodes of that level
+        - 'metas': meta (i.e. the component, e.g. 'Article') -> nodes of that component
+        - 'leaves': the nodes with a parent and no children (a dict used as an ordered set)
+        - 'positions': node -> position in insertion order
+
+    Built in a single pass over the nodes (see `build`) and patched as nodes are appended (see `extend`)
+    """
+
+    __slots__ = ('levels', 'metas', 'leaves', 'positions')
+
+    def __init__(self):
+        self.levels = {}
+        self.metas = {}
+        self.leaves = {}
+        self.positions = {}
+
+    @classmethod
+    def build(cls, graph, order):
+        """
+        Indexes the nodes of 'graph', given in insertion order by 'order' (e.g. only the nodes of a subtree)
+        """
+        index = cls()
+        index._add(graph, order)
+        index.leaves = dict.fromkeys(
+            key for key in order
+            if next(iter(graph.successors(key)), None) is None and next(iter(graph.parents(key)), None) is not None)
+        return index
+
+    def extend(self, graph, nodes):
+        """
+        Indexes 'nodes', just appended after all of the others, whose parents are no longer leaves
+        """
+        self._add(graph, nodes)
+        leaves = self.leaves
+        for key in nodes:
+            parents = list(graph.parents(key))
+            for parent in parents:
+                leaves.pop(parent, None)
+            if parents:
+                leaves[key] = None
+
+    def _add(self, graph, nodes):
+        levels, metas, positions = self.levels, self.metas, self.positions
+        for key in nodes:
+            data = graph[key]
+            positions[key] = len(positions)
+            levels.setdefault(data['level'], []).append(key)
+            metas.setdefault(data['meta'], []).append(key)
+
+
+class PathIndex(object):
+    """
+    Indexes the nodes of a document by their ids, filesystem like paths e.g. '/root/chapter-1/article-2'
+        - 'prefixes': a trie over the segments of the ids, to look up an id or every id under a prefix
+        - 'suffixes': last segment -> (key, id) of the nodes whose ids end with it, to look up the ids ending
+          with some segments, the other segments being compared on the few candidates only
+
+    The trie is made of nested dictionaries keyed by segment, the node keys being held under None
+    A lookup walks as many levels as there are segments in the query
+    """
+
+    __slots__ = ('prefixes', 'suffixes')
+
+    def __init__(self):
+        self.prefixes = {}
+        self.suffixes = {}
+
+    @classmethod
+    def build(cls, graph, order):
+        """
+        Indexes the ids of the nodes of 'graph', given in insertion order by 'order'
+        """
+        index = cls()
+        index.extend(graph, order)
+        return index
+
+    def extend(self, graph, nodes):
+        for key in nodes:
+            node_id = graph[key].get('id')
+            if node_id is not None:
+                segments = id_segments(node_id)
+                _insert(self.prefixes, segments, key)
+                if segments:
+                    self.suffixes.setdefault(segments[-1], []).append((key, node_id))
+
+    def exact(self, node_id):
+        """
+        Returns the keys of the nodes with id 'node_id'
+        """
+        trie = _walk(self.prefixes, id_segments(node_id))
+        return list(trie.get(None, ())) if trie else []
+
+    def under(self, prefix):
+        """
+        Returns the keys of the nodes whose ids start with the segments of 'prefix', i.e. the subtree it names
+        """
+        return _collect(_walk(self.prefixes, id_segments(prefix)))
+
+    def ending_with(self, suffix):
+        """
+        Returns the keys of the nodes whose ids end with the segments of 'suffix'
+        """
+        segments = id_segments(suffix)
+        if not segments:
+            return _collect(self.prefixes)
+        n = len(segments)
+        return [key for key, node_id in self.suffixes.get(segments[-1], ())
+                if n == 1 or id_segments(node_id)[-n:] == segments]
+
+
+def id_segments(node_id):
+    """
+    The segments of a node id, e.g. '/root/chapter-1' -> ['root', 'chapter-1']
+    """
+    return [segment for segment in node_id.split('/') if segment]
+
+
+def _insert(trie, segments, key):
+    for segment in segments:
+        child = trie.get(segment)
+        if child is None:
+            child = trie[segment] = {}
+        trie = child
+    keys = trie.get(None)
+    if keys is None:
+        trie[None] = [key]
+    else:
+        keys.append(key)
+
+
+def _walk(trie, segments):
+    for segment in segments:
+        trie = trie.get(segment)
+        if trie is None:
+            return None
+    return trie
+
+
+def _collect(trie):
+    keys = []
+    tries = [trie] if trie else []
+    while tries:
+        trie = tries.pop()
+        for segment, child in trie.items():
+            if segment is None:
+                keys.extend(child)
+            else:
+                tries.append(child)
+    return keys
+
+
+class StructuralIndex(object):
+    """
+    Interval labelling of the tree of a document, answering structural queries without walking the graph
+        - 'keys': the nodes in pre-order, i.e. document order, their position being their 'pre' number
+        - 'end': the pre number following the subtree of each node, so that the subtree of 'a' is
+          keys[pre(a):end[pre(a)]] and 'a' is an ancestor of 'b' iff pre(a) < pre(b) < end[pre(a)]
+        - 'depth', 'parent' and 'rank' (the position among the siblings) of each node
+        - 'children': the number of children of each node, the rank of the next one appended (see `extend`)
+        - 'up': jump tables, up[j][i] being the 2^j-th ancestor of i (-1 past the root)
+
+    Ancestry and sibling positions are answered in O(1), k-th ancestors and lowest common ancestors in O(log depth)
+    """
+
+    __slots__ = ('keys', 'pre', 'end', 'depth', 'parent', 'rank', 'children', 'up')
+
+    def __init__(self):
+        self.keys = []
+        self.pre = {}
+        self.end = array('i')
+        self.depth = array('i')
+        self.parent = array('i')
+        self.rank = array('i')
+        self.children = array('i')
+        self.up = []
+
+    @classmethod
+    def build(cls, graph, order, root):
+        """
+        Labels the tree of 'graph' hanging from 'root', the children being ordered as in 'order' (insertion order)
+        """
+        index = cls()
+        position = {key: i for i, key in enumerate(order)}
+        children = {}
+        for key in order:
+            for parent in graph.parents(key):
+                children.setdefault(parent, []).append(key)
+
+        keys, pre, end, depth, parent, rank = index.keys, index.pre, index.end, index.depth, index.parent, index.rank
+        count = index.children
+        # explicit stack of (node, parent pre number, depth, rank), children pushed in reverse to pop them in order
+        stack = [(root, -1, 0, 0)]
+        while stack:
+            key, p, d, r = stack.pop()
+            i = len(keys)
+            pre[key] = i
+            keys.append(key)
+            end.append(0)
+            depth.append(d)
+            parent.append(p)
+            rank.append(r)
+            below = children.get(key, ())
+            count.append(len(below))
+            if len(below) > 1 and any(position[a] > position[b] for a, b in zip(below, below[1:])):
+                below.sort(key=position.__getitem__)
+            stack.extend((child, i, d + 1, n) for n, child in reversed(list(enumerate(below))))
+
+        # a subtree ends where the next node not below it starts: the nodes are closed from the last one
+        size = [1] * len(keys)
+        for i in range(len(keys) - 1, 0, -1):
+            size[parent[i]] += size[i]
+        for i, s in enumerate(size):
+            end[i] = i + s
+
+        index._jump_tables()
+        return index
+
+    def _jump_tables(self):
+        up = [self.parent]
+        while any(a >= 0 for a in up[-1]):
+            previous = up[-1]
+            up.append(array('i', (previous[a] if a >= 0 else -1 for a in previous)))
+        self.up = up
+
+    def extend(self, graph, nodes):
+        """
+        Labels 'nodes', just appended after all of the others: they close the document order,
+        along with the subtrees of their ancestors
+        """
+        keys, pre, end, depth, parent, rank = self.keys, self.pre, self.end, self.depth, self.parent, self.rank
+        count = self.children
+        for key in nodes:
+            p = pre[next(iter(graph.parents(key)))]
+            i = len(keys)
+            # the siblings labelled so far all come before
+            r = count[p]
+            count[p] = r + 1
+            count.append(0)
+            pre[key] = i
+            keys.append(key)
+            end.append(i + 1)
+            depth.append(depth[p] + 1)
+            parent.append(p)
+            rank.append(r)
+
+            a = p
+            while a >= 0:
+                end[a] = i + 1
+                a = parent[a]
+
+            up = self.up
+            for j in range(1, len(up)):
+                a = up[j - 1][up[j - 1][i]] if up[j - 1][i] >= 0 else -1
+                up[j].append(a)
+            if up[-1][i] >= 0:
+                # deeper than the tables reach
+                self._jump_tables()
+
+    def is_ancestor(self, a, b):
+        """
+        Whether node 'a' is a (proper) ancestor of node 'b'
+        """
+        i, j = self.pre[a], self.pre[b]
+        return i < j < self.end[i]
+
+    def ancestor(self, key, k=1):
+        """
+        Returns the k-th ancestor of 'key' (its parent for k=1), None if it is not that deep
+        """
+        i = self.pre[key]
+        if k > self.depth[i]:
+            return None
+        j = 0
+        while k and i >= 0:
+            if k & 1:
+                i = self.up[j][i]
+            k >>= 1
+            j += 1
+        return self.keys[i]
+
+    def lowest_common_ancestor(self, a, b):
+        """
+        Returns the deepest node having both 'a' and 'b' below it (or being one of them)
+        """
+        i, j = self.pre[a], self.pre[b]
+        if i > j:
+            i, j = j, i
+        end = self.end
+        if j < end[i]:
+            return self.keys[i]
+        # climb from 'i' as long as the ancestor reached does not hold 'j'
+        for up in reversed(self.up):
+            a = up[i]
+            if a >= 0 and not a <= j < end[a]:
+                i = a
+        return self.keys[self.parent[i]]
+
+    def sibling_position(self, key):
+        """
+        Returns the position of 'key' among the children of its parent
+        """
+        return self.rank[self.pre[key]]
+
+    def subtree_range(self, key):
+        """
+        Returns the range (start, end) of the pre numbers of the subtree of 'key', the node itself included
+        """
+        i = self.pre[key]
+        return i, self.end[i]
+
+    def subtree(self, key):
+        """
+        Returns the keys of the subtree of 'key' in document order, the node itself included
+        """
+        start, end = self.subtree_range(key)
+        return self.keys[start:end]
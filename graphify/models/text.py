@@ -0,0 +1,137 @@
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+
+class TextBuffer(object):
+    """
+    The lines of text of a whole document, stored contiguously instead of one string object per line
+
+    Lines are appended in blocks of 'block' lines: a full block is sealed into a single string
+    along with an array of the offsets where each of its lines ends
+    Nodes keep a `TextSpan`, i.e. the range of their lines in the buffer, and lines are only sliced out when read
+    """
+
+    __slots__ = ('block', 'size', 'dead', '_blocks', '_ends', '_pending')
+
+    def __init__(self, lines=(), block=1024):
+        self.block = block
+        self.size = 0
+        # lines left behind by the spans that held them, e.g. moved to the end by `TextSpan.append`
+        # (an upper bound: the spans copied along with a graph may still hold them)
+        self.dead = 0
+        self._blocks = []
+        self._ends = []
+        self._pending = []
+        for line in lines:
+            self.append(line)
+
+    def append(self, line):
+        self.size += 1
+        pending = self._pending
+        pending.append(line)
+        if len(pending) == self.block:
+            self._blocks.append(''.join(pending))
+            self._ends.append(array('L', accumulate(map(len, pending))))
+            self._pending = []
+
+    def span(self):
+        """
+        Returns a new empty span at the end of the buffer, to be filled by `TextSpan.append`
+        """
+        return TextSpan(self, self.size, self.size)
+
+    def line(self, i):
+        b, j = divmod(i, self.block)
+        if b == len(self._blocks):
+            return self._pending[j]
+
+        ends = self._ends[b]
+        return self._blocks[b][ends[j - 1] if j else 0:ends[j]]
+
+    def lines(self, start, end):
+        """
+        Returns the lines in positions [start, end) as a list
+        """
+        return [self.line(i) for i in range(start, end)]
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        return self.block, self.size, self.dead, self._blocks, self._ends, self._pending
+
+    def __setstate__(self, state):
+        self.block, self.size, self.dead, self._blocks, self._ends, self._pending = state
+
+
+class TextSpan(Sequence):
+    """
+    The text of a node held by a `TextBuffer`: lines in positions [start, end) of 'buffer'
+    Behaves as the list of those lines, materialized on access
+
+    Only the span at the end of the buffer can grow in place: appending to any other one
+    first moves its lines to the end of the buffer, the lines left behind being counted in `TextBuffer.dead`
+    (see `compact_text_buffer` to reclaim them)
+    """
+
+    __slots__ = ('buffer', 'start', 'end')
+
+    def __init__(self, buffer, start, end):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def append(self, line):
+        buffer = self.buffer
+        if self.end != buffer.size:
+            lines = buffer.lines(self.start, self.end)
+            self.start = buffer.size
+            buffer.dead += len(lines)
+            for moved in lines:
+                buffer.append(moved)
+
+        buffer.append(line)
+        self.end = buffer.size
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.buffer.line(j) for j in range(self.start, self.end)[i]]
+
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("TextSpan index out of range")
+        return self.buffer.line(self.start + (i % n))
+
+    def __iter__(self):
+        line = self.buffer.line
+        for i in range(self.start, self.end):
+            yield line(i)
+
+    def __add__(self, other):
+        if isinstance(other, (list, TextSpan)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, TextSpan)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
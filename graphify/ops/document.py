@@ -1,6 +1,9 @@
+from graphify.backbone.data import INDEXED_FIELDS
 from graphify.models.document import Document
 from typing import Callable
 from typing import Dict
+from typing import Optional
+from typing import Sequence
 from operator import itemgetter
 
 
@@ -8,17 +11,29 @@ def copy(document: Document) -> Document:
     """
     Creates a deep copy of a given document
     """
-    new_document = Document(document.graph.copy(), document.root)
+    new_document = Document(document.graph.copy(), document.root, list(document.order()))
     return new_document
 
 
+def snapshot(document: Document) -> Document:
+    """
+    Returns a snapshot of 'document': a new document sharing its nodes, whose data is copied on write,
+    so that changes to either document do not reach the other (see `Document.derive`)
+    A snapshot of a regular document takes one copy of its graph, of a derived one (e.g. by `map_values`) none
+    """
+    return document.derive()
+
+
 def map_values(doc: Document, f: Callable[[Dict], Dict]) -> Document:
     """
     Map data receives a document and a function 'f' that operates on the data
     of each node, f :: {a, b} -> {c, d}
     Returns a new document object
+
+    The new document shares the nodes of 'doc' (see `snapshot`), which is left as it is:
+    only the data of the nodes 'f' writes to is copied, so that chaining `map_values` copies the graph once
     """
-    doc = copy(doc)
+    doc = snapshot(doc)
     it = map(itemgetter(0), doc.traverse())
 
     for node in it:
@@ -26,3 +41,58 @@ def map_values(doc: Document, f: Callable[[Dict], Dict]) -> Document:
 
     return doc
 
+
+def map_column(doc: Document, attribute: str, f: Callable[[Sequence], Sequence], level: Optional[int] = None,
+               target: Optional[str] = None, as_array: bool = False) -> Document:
+    """
+    Batched `map_values`: the values of 'attribute' of every node (of 'level' only, if given) are gathered
+    in insertion order into a column, f :: [a] -> [b] is called once on the whole column
+    and the values it returns are scattered back into 'target' ('attribute' by default)
+
+    The column is a list, or a numpy array with 'as_array' (numpy being optional, imported then only);
+    nested values, e.g. the lines of 'text', make an array of objects
+    Returns a new document object, as `map_values` does, indexed again if 'target' is a field the indexes
+    are built on (e.g. 'level')
+    """
+    doc = snapshot(doc)
+    keys = doc.order() if level is None else doc.index().levels.get(level, [])
+    graph = doc.graph
+
+    column = graph.column(keys, attribute)
+    if as_array:
+        column = _as_array(column)
+
+    values = f(column)
+    if not isinstance(values, list) and hasattr(values, 'tolist'):
+        # plain python values in the nodes rather than those of an array, e.g. to be serialized
+        values = values.tolist()
+    if len(values) != len(keys):
+        raise ValueError(f"'f' returned {len(values)} values for a column of {len(keys)}")
+
+    # the nodes left as they were are not copied (see `snapshot`)
+    target = target or attribute
+    graph.set_column(keys, target, values)
+    if target in INDEXED_FIELDS:
+        doc.reindex()
+    return doc
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _as_array(column):
+    numpy = _numpy()
+    if numpy is None:
+        raise ImportError("numpy is needed for columns as arrays ('as_array'), use lists otherwise")
+
+    if any(not numpy.isscalar(value) for value in column):
+        array = numpy.empty(len(column), dtype=object)
+        for i, value in enumerate(column):
+            array[i] = value
+        return array
+    return numpy.asarray(column)
@@ -1,3 +1,4 @@
+from collections import deque
 from itertools import chain
 
 
@@ -37,22 +38,19 @@ def filter_bfs(graph, predicate, source=None):
 
 def filter_bfs_ancestors(graph, source, predicate):
     """
-    Assumes a directed acyclic graph. Otherwise we cannot retrieve the 'parents' of a node and the recursive call would
-    cause an overflow.
+    Assumes a directed acyclic graph. Otherwise we cannot retrieve the 'parents' of a node and the search would
+    never end.
 
     Starting from 'source' go up in the hierarchy, using bfs and returns a generator of the nodes respecting 'predicated'
+    The search stops at the first node of level 0 (the root)
     """
-
-    def loop(tovist):
-
-        if not tovist or graph[tovist[0]].get('level', -1) == 0:
-            return None
-
-        elif predicate(graph[tovist[0]]):
-            yield tovist[0]
-            yield from loop(tovist[1:] + list(graph.parents(tovist[0])))
-
-        else:
-            yield from loop(tovist[1:] + list(graph.parents(tovist[0])))
-
-    return loop(list(graph.parents(source)))
+    tovisit = deque(graph.parents(source))
+    while tovisit:
+        node = tovisit.popleft()
+        data = graph[node]
+        if data.get('level', -1) == 0:
+            return
+
+        if predicate(data):
+            yield node
+        tovisit.extend(graph.parents(node))
@@ -1,14 +1,25 @@
+import json
 import logging
 
-from graphify.build.traverse import build
-from graphify.descriptor.utils import compile_patterns
-from graphify.descriptor.utils import extend_internal_patterns
-from graphify.descriptor.utils import extend_descriptor_with_data_capture_group
+from graphify.backbone.initialization import backbone_name
+from graphify.build.events import emit_events
+from graphify.build.events import ParseEventHandler
+from graphify.build.incremental import LineIndex
+from graphify.build.incremental import splice_edit
+from graphify.build.state import BuildState
+from graphify.build.traverse import build_stream
+from graphify.build.traverse import resume_build
+from graphify.descriptor.exclude import ExcludeCleaner
+from graphify.descriptor.plan import parse_plan
 from graphify.models.document import Document
+from graphify.utils.files import mmap_lines
 
-from functools import reduce
+from typing import Any
+from typing import Callable
 from typing import Iterable
 from typing import Dict
+from typing import List
+from typing import Optional
 
 from graphify.ops.document import map_values
 
@@ -19,49 +30,249 @@ class Parser(object):
     """
     Generic Document Parser
     Needs a 'descriptor' that characterizes the different sections of the document
+    The descriptor is compiled once into a `ParsePlan`, shared by every parse
+    Documents are built on the 'backbone' given (see `get_backbone`), the default one if None
     """
-    def __init__(self, descriptor):
-        self.descriptor = extend_internal_patterns(descriptor)
-        self.descriptor = compile_patterns(descriptor)
+    def __init__(self, descriptor, backbone=None):
+        self.descriptor = descriptor
+        self.plan = parse_plan(descriptor)
+        self.backbone = backbone
 
-    def parse(self, iterable) -> Document:
+    def parse(self, iterable, name='ROOT') -> Document:
         """
         Given an iterable structure, parse them into a graph and return a 'Document' object
         """
-        graph = build(iterable, self.descriptor)
-        return Document(graph, "ROOT [0]")
+        return parse_iterable(iterable, self.plan, name, self.backbone)
 
-    def parse_filepath(self, filepath) -> Document:
-        with open(filepath, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            return self.parse(lines)
+    def parse_filepath(self, filepath, mmap=False) -> Document:
+        with _open_lines(filepath, mmap) as f:
+            return self.parse(f)
 
 
-def parse_iterable(it: Iterable[str], descriptor: Dict, name: str = 'ROOT') -> Document:
+def parse_iterable(it: Iterable[str], descriptor: Dict, name: str = 'ROOT', backbone: Optional[str] = None) -> Document:
     """
     Given a descriptor that describes the hierarchical structure of an iterable
     parse it into a graph representation
 
     'name' is the document name without spaces
+    'descriptor' can also be a `ParsePlan`, sparing the compilation of the descriptor (see `parse_plan`)
+    'backbone' is the name of the graph backbone to build on (see `get_backbone`), the default one if None
+
+    The state of the build is kept in `document.build_state`, so that more lines can be fed later on
+    (see `append_lines`)
+    """
+    return _parse_with_state(it, BuildState(descriptor, name, backbone=backbone))
+
+
+def _parse_with_state(it: Iterable[str], state: BuildState) -> Document:
+    """
+    Parses 'it' from a fresh 'state', see `parse_iterable`
     """
-    descriptor = extend_internal_patterns(descriptor)
-    descriptor = extend_descriptor_with_data_capture_group(descriptor)
-    descriptor = compile_patterns(descriptor)
+    graph = resume_build(it, state)
+    return _as_document(graph, state)
 
-    graph = build(it, descriptor, name)
-    document = Document(graph, "{} [0]".format(name))
 
-    document = post_build_process(document, descriptor)
+def _as_document(graph, state: BuildState) -> Document:
+    """
+    Wraps up a graph built from 'state' into a `Document`
+    A fresh build inserts the nodes in key order, which spares sorting them
+    """
+    document = Document(graph, graph.root_key, graph.nodes())
+    document.build_state = state
     return document
 
 
-def parse_filepath(filepath: str, descriptor: Dict) -> Document:
+def parse_filepath(filepath: str, descriptor: Dict, mmap: bool = False, backbone: Optional[str] = None) -> Document:
     """
     Utility method to wrap `parse_iterable` with a file opening action
+    The file is consumed line by line, without materializing all of its lines upfront
+
+    With 'mmap' the file is read through a memory map instead (see `mmap_lines`)
+    """
+    with _open_lines(filepath, mmap) as f:
+        return parse_iterable(f, descriptor, backbone=backbone)
+
+
+def append_lines(document: Document, it: Iterable[str]) -> Document:
+    """
+    Feeds the lines of 'it' to a document built by `parse_iterable` (or restored by `resume`),
+    e.g. the amendments of a text delivered in chunks
+    The result is the same as parsing the whole source in one go; the document is updated in place
+    """
+    state = getattr(document, 'build_state', None)
+    if state is None:
+        raise ValueError("The document holds no build state: it was not built by `parse_iterable` nor `resume`")
+
+    document.unshare()
+    graph = document.graph
+    order = document.order()
+
+    created = []
+    resume_build(it, state, graph, on_insert=lambda _, node: created.append(node))
+
+    # the new nodes, padding ones included, are the last inserted and come after all of the existing ones
+    document.extend_order(graph.nodes()[len(order):])
+
+    if created:
+        nodes = [graph[node] for node in created]
+        document.max_depth = max([document.max_depth] + [data['level'] for data in nodes])
+        if not document.active_depth:
+            document.active_depth = next((data['level'] for data in nodes if not data['pad']), 0)
+
+    # the lines no longer map onto the nodes as indexed by `reparse`
+    document.line_index = None
+    return document
+
+
+def checkpoint(document: Document) -> Dict:
+    """
+    Serializable snapshot of a document along with its build state, to be restored by `resume`
+    e.g. to carry on a long running ingestion after a restart
+    """
+    state = getattr(document, 'build_state', None)
+    if state is None:
+        raise ValueError("The document holds no build state: it was not built by `parse_iterable` nor `resume`")
+
+    return {'document': document.to_dict(), 'state': state.capture(document.graph).to_dict()}
+
+
+def resume(snapshot: Dict) -> Document:
+    """
+    Restores a document from a `checkpoint`, ready to be fed more lines with `append_lines`
+    """
+    state = BuildState.from_dict(snapshot['state'])
+
+    document = Document.from_dict(snapshot['document'], state.backbone, state.compiled['integerKeys'])
+    document.build_state = state
+    state.restore(document.graph)
+    return document
+
+
+def parse_events(it: Iterable[str], descriptor: Dict, handler: ParseEventHandler, name: str = 'ROOT'):
+    """
+    Event driven parsing: no graph (nor `Document`) is built
+    The structure of the document is reported to 'handler' as enter node, text line and exit node events
+    (see `ParseEventHandler`), e.g. to feed a search index directly
+
+    Returns the handler
+    """
+    return emit_events(it, parse_plan(descriptor).descriptor(), handler, name)
+
+
+def parse_stream(it: Iterable[str], descriptor: Dict, sink: Any, name: str = 'ROOT',
+                 backbone: Optional[str] = None) -> Document:
+    """
+    Streaming parse mode: every top level section is handed to 'sink', as a standalone `Document`,
+    as soon as it is complete and dropped from memory right after
+
+    'sink' can be:
+        - a callable, called with each `Document`
+        - a queue like object (with a `put` method), fed with each `Document`
+        - a file like object (with a `write` method), written one json document (`to_dict`) per line
+
+    Returns a `Document` with whatever is left after streaming: the root node and the text preceding the first section
+    """
+    descriptor = parse_plan(descriptor).descriptor()
+    sink = _as_sink(sink)
+
+    def emit(section):
+        sink(Document(section, section.root_key, section.nodes()))
+
+    graph = build_stream(it, descriptor, emit, name, backbone)
+    return Document(graph, graph.root_key, graph.nodes())
+
+
+def parse_filepath_stream(filepath: str, descriptor: Dict, sink: Any, name: str = 'ROOT', mmap: bool = False,
+                          backbone: Optional[str] = None) -> Document:
+    """
+    Utility method to wrap `parse_stream` with a file opening action
+    """
+    with _open_lines(filepath, mmap) as f:
+        return parse_stream(f, descriptor, sink, name, backbone)
+
+
+def reparse(document: Document, source: List[str], start: int, end: int, lines: List[str], descriptor: Dict) -> Document:
+    """
+    Incremental parsing: applies to 'document' the edit replacing the lines source[start:end] by 'lines'
+    'source' is the list of lines 'document' was parsed from (with the same 'descriptor') and is edited in place
+
+    Only the smallest section enclosing the edit is parsed again and spliced into the graph;
+    every node outside of it keeps its key, id and data.
+    The new nodes get keys sorting in between their neighbours, e.g. 'Article [7_1]', so that the order is preserved
+    When the edit cannot be handled locally (e.g. it moves where the parsing starts or stops)
+    the whole document is parsed again
+
+    The mapping between lines and nodes is kept in `document.line_index` to be reused by the following edits
+    """
+    plan = parse_plan(descriptor)
+    fixed_start = bool(plan.source.get('startParsing'))
+    descriptor = plan.descriptor()
+
+    document.unshare()
+    index = getattr(document, 'line_index', None)
+    if index is None:
+        index = LineIndex.from_document(document, source, descriptor, fixed_start)
+
+    spliced = splice_edit(document.graph, index, source, start, end, lines, descriptor)
+    source[start:end] = lines
+
+    if spliced is None:
+        logger.info("The edit cannot be handled locally, parsing the whole document")
+        parsed = parse_iterable(source, plan, document.graph.root, backbone_name(document.graph))
+        document.graph = parsed.graph
+        document.build_state = parsed.build_state
+        document.set_order(parsed.order())
+        document.set_depths()
+        index = LineIndex.from_document(document, source, descriptor, fixed_start)
+
+    elif spliced[0] or spliced[1]:
+        removed, created = spliced
+        # the index holds the nodes in insertion order, which spares sorting the whole graph again
+        document.set_order(list(index.keys))
+        _splice_depths(document, index.keys, removed, created)
+
+    document.line_index = index
+    return document
+
+
+def _splice_depths(document: Document, keys: List, removed: Dict, created: List):
+    """
+    Updates the depths of 'document' after a splice, from the nodes removed (their levels by key) and created only
+    The nodes are only all looked at again when a removed node may have been the deepest one
+    """
+    levels = [document.node(key)['level'] for key in created]
+    deepest = max(levels, default=0)
+    if deepest >= document.max_depth or document.max_depth not in removed.values():
+        document.max_depth = max(document.max_depth, deepest)
+    else:
+        document.max_depth = max((document.node(key)['level'] for key in keys[1:]), default=0)
+
+    # only the leading padding nodes are walked through
+    nodes = (document.node(key) for key in keys[1:])
+    document.active_depth = next((data['level'] for data in nodes if not data['pad']), 0)
+
+
+def _open_lines(filepath: str, mmap: bool = False):
+    """
+    Opens 'filepath' as a context manager over its lines, through a memory map if 'mmap'
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        it = f.readlines()
-        return parse_iterable(it, descriptor)
+    return mmap_lines(filepath) if mmap else open(filepath, "r", encoding="utf-8")
+
+
+def _as_sink(sink: Any) -> Callable[[Document], None]:
+    """
+    Normalizes the different kinds of supported sinks into a callable receiving a `Document`
+    """
+    if hasattr(sink, 'put'):
+        return sink.put
+
+    elif hasattr(sink, 'write'):
+        return lambda document: sink.write(json.dumps(document.to_dict()) + '\n')
+
+    elif callable(sink):
+        return sink
+
+    raise ValueError(f"Invalid sink '{sink}': expected a callable, a queue or a file like object")
 
 
 def post_build_process(document: Document, descriptor: Dict) -> Document:
@@ -72,12 +283,13 @@ def post_build_process(document: Document, descriptor: Dict) -> Document:
     The following operations are in scope:
         - Remove any internal tags from the 'content' data field of each node
           e.g. parsing hints like '[[Component]]'
+
+    The parsing entry points no longer need it: the build process already strips the tags as it goes
     """
+    clean = ExcludeCleaner(descriptor['exclude'])
+
     def remove_occurrences(data):
-        data['text'] = [
-            reduce(lambda acc, x: x.sub('', acc), descriptor['exclude'], line)
-            for line in data['text']
-        ]
+        data['text'] = [clean(line) for line in data['text']]
         return data
 
     document = map_values(document, remove_occurrences)
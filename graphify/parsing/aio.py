@@ -0,0 +1,80 @@
+import asyncio
+
+from concurrent.futures import Executor
+from typing import AsyncIterable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from graphify.build.state import BuildState
+from graphify.build.traverse import resume_build
+from graphify.models.document import Document
+from graphify.parsing import _as_document
+
+
+async def parse_async(ait: AsyncIterable[str], descriptor: Dict, name: str = 'ROOT',
+                      executor: Optional[Executor] = None, chunk_lines: int = 1000,
+                      backbone: Optional[str] = None) -> Document:
+    """
+    Asynchronous counterpart of `parse_iterable`, consuming the async iterable 'ait' (e.g. a socket or an async file)
+
+    The lines are gathered in chunks of 'chunk_lines' and each chunk is built in 'executor' (the loop default if None)
+    while the next one is being read, so that the event loop is never blocked for longer than a chunk takes
+    The chunks of a document are built one after the other, resuming from where the previous one left (see `BuildState`)
+    With a process pool the graph goes to the worker and back with every chunk, which only pays off for large chunks
+    The document is built on 'backbone' (see `get_backbone`)
+    """
+    loop = asyncio.get_running_loop()
+    state = BuildState(descriptor, name, backbone=backbone)
+
+    graph, state = await loop.run_in_executor(executor, _resume_build, [], state)
+    pending = None
+
+    chunk = []
+    async for line in ait:
+        chunk.append(line)
+
+        if len(chunk) >= chunk_lines:
+            if pending is not None:
+                graph, state = await pending
+                pending = None
+
+            # nothing else would be parsed anyway
+            if state.stopped:
+                break
+
+            pending = loop.run_in_executor(executor, _resume_build, chunk, state, graph)
+            chunk = []
+
+    if pending is not None:
+        graph, state = await pending
+
+    graph, state = await loop.run_in_executor(executor, _resume_build, chunk, state, graph)
+
+    return await loop.run_in_executor(executor, _as_document, graph, state)
+
+
+def _resume_build(chunk, state, graph=None):
+    """
+    `resume_build` handing back the state along with the graph: with a process pool
+    the worker only ever changes copies of them
+    """
+    graph = resume_build(chunk, state, graph)
+    return graph, state
+
+
+async def parse_many_async(sources: Iterable[AsyncIterable[str]], descriptor: Dict, name: str = 'ROOT',
+                           executor: Optional[Executor] = None, chunk_lines: int = 1000,
+                           concurrency: int = 4, backbone: Optional[str] = None) -> List[Document]:
+    """
+    Parses every async iterable in 'sources' with `parse_async`, at most 'concurrency' of them at a time
+    Returns the documents in the order of 'sources'
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def parse(source):
+        async with semaphore:
+            return await parse_async(source, descriptor, name, executor, chunk_lines, backbone)
+
+    return list(await asyncio.gather(*[parse(source) for source in sources]))
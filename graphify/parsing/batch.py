@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import time
+
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from graphify.build.parallel import build_parallel
+from graphify.build.state import BuildState
+from graphify.descriptor.plan import parse_plan
+from graphify.models.document import Document
+from graphify.parsing import _open_lines
+from graphify.parsing import _parse_with_state
+
+logger = logging.getLogger(__name__)
+
+# plan and settings of each worker process, set once by `_initialize_worker`
+_worker = {}
+
+
+class BatchStats(object):
+    """
+    Throughput of a `parse_many` run, updated as the results arrive
+
+    'lines' and 'nodes' are the totals over the parsed files,
+    'busy' the time spent parsing by the workers (adding up all of them) and 'elapsed' the wall clock time
+    """
+
+    def __init__(self, processes=1):
+        self.processes = processes
+        self.files = 0
+        self.lines = 0
+        self.nodes = 0
+        self.busy = 0.0
+        self.elapsed = 0.0
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+
+    def add(self, lines, nodes, busy):
+        self.files += 1
+        self.lines += lines
+        self.nodes += nodes
+        self.busy += busy
+        self.elapsed = time.perf_counter() - self._start
+
+    def report(self):
+        """
+        Returns a summary of the run: totals, rates per second of wall clock time
+        and 'utilization', the fraction of the pool capacity spent parsing (what is left goes to IPC and idling)
+        """
+        elapsed = self.elapsed or float('inf')
+        return {
+            'files': self.files,
+            'lines': self.lines,
+            'nodes': self.nodes,
+            'elapsed': self.elapsed,
+            'files_per_second': self.files / elapsed,
+            'lines_per_second': self.lines / elapsed,
+            'utilization': self.busy / (elapsed * self.processes)
+        }
+
+
+def parse_many(filepaths: Iterable[str], descriptor: Dict, name: str = 'ROOT', processes: Optional[int] = None,
+               chunksize: int = 1, ordered: bool = False,
+               stats: Optional[BatchStats] = None, mmap: bool = False,
+               backbone: Optional[str] = None) -> Iterator[Tuple[str, Document]]:
+    """
+    Parses a corpus of files over a pool of 'processes' (all of the cores by default)
+    Every worker compiles the descriptor (or `ParsePlan`) once and parses the files sent its way as `parse_filepath` would
+
+    Yields the pairs (filepath, document) as soon as they are ready, or in the order of 'filepaths' if 'ordered'
+    The files are submitted 'chunksize' at a time: a larger one cuts down the communication overhead
+    when there are lots of small files
+
+    'descriptor' needs to be picklable (e.g. no lambdas as `startParsing` markers)
+    If given, 'stats' (see `BatchStats`) is kept up to date with the throughput of the run
+    With 'mmap' the files are read through memory maps (see `mmap_lines`)
+    and the documents are built on 'backbone' (see `get_backbone`)
+    """
+    processes = processes or multiprocessing.cpu_count()
+    stats = stats or BatchStats(processes)
+    stats.processes = processes
+
+    plan = parse_plan(descriptor)
+
+    with multiprocessing.Pool(processes, initializer=_initialize_worker, initargs=(plan, name, mmap, backbone)) as pool:
+        stats.start()
+
+        imap = pool.imap if ordered else pool.imap_unordered
+        for filepath, document, lines, busy in imap(_parse_file, filepaths, chunksize):
+            stats.add(lines, document.graph.number_of_nodes(), busy)
+            yield filepath, document
+
+    logger.info("Batch report: {0}".format(stats.report()))
+
+
+def parse_parallel(it: Iterable[str], descriptor: Dict, name: str = 'ROOT', processes: Optional[int] = None,
+                   chunk_lines: int = 10000, backbone: Optional[str] = None) -> Document:
+    """
+    Parses a single (large) document over a pool of 'processes'
+    The lines are split, at level 1 components, in chunks of about 'chunk_lines' lines parsed by the workers
+
+    The result is the same as `parse_iterable`, node keys and ids included
+    'descriptor' needs to be picklable (e.g. no lambdas as `startParsing` markers)
+    The document is built on 'backbone' (see `get_backbone`)
+    """
+    state = BuildState(descriptor, name, backbone=backbone)
+
+    graph = build_parallel(it, state, processes, chunk_lines)
+
+    # the internal tags were already stripped by the workers
+    document = Document(graph, graph.root_key, graph.nodes())
+    document.build_state = state
+    return document
+
+
+def _initialize_worker(plan, name, mmap, backbone):
+    _worker['plan'] = plan
+    _worker['name'] = name
+    _worker['mmap'] = mmap
+    _worker['backbone'] = backbone
+
+
+def _parse_file(filepath):
+    start = time.perf_counter()
+    lines = 0
+
+    def counted(f):
+        nonlocal lines
+        for lines, line in enumerate(f, 1):
+            yield line
+
+    state = BuildState(_worker['plan'], _worker['name'], backbone=_worker['backbone'])
+    with _open_lines(filepath, _worker['mmap']) as f:
+        document = _parse_with_state(counted(f), state)
+
+    return filepath, document, lines, time.perf_counter() - start
@@ -0,0 +1,51 @@
+import mmap
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def mmap_lines(filepath, encoding='utf-8'):
+    """
+    Context manager yielding the lines of a file read through a memory map, to be consumed lazily
+    Each line is decoded only when it is reached, and nothing is read past the point where the iteration stops
+    The mapped pages live in the OS page cache, shared by every process parsing the same file
+
+    Lines keep their ending, '\\n', '\\r\\n' and '\\r' being translated into '\\n' as the text mode of `open` does
+    """
+    with open(filepath, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            yield iter(())
+            return
+
+        with buffer:
+            yield _iter_lines(buffer, encoding)
+
+
+def _iter_lines(buffer, encoding):
+    start, size = 0, len(buffer)
+    # the next '\n' and '\r' after 'start' ('size' when there is none), searched again only once passed
+    lf = cr = -1
+    while start < size:
+        if lf < start:
+            lf = _find(buffer, b'\n', start, size)
+        if cr < start:
+            cr = _find(buffer, b'\r', start, size)
+
+        if lf < cr:
+            cut, end = lf, lf + 1
+        elif cr < size:
+            cut, end = cr, cr + 2 if lf == cr + 1 else cr + 1
+        else:
+            cut, end = size, size
+
+        line = buffer[start:cut].decode(encoding)
+        yield line + '\n' if cut < size else line
+        start = end
+
+
+def _find(buffer, char, start, size):
+    position = buffer.find(char, start)
+    return size if position == -1 else position
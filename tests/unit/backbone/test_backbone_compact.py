@@ -0,0 +1,110 @@
+from unittest import TestCase
+
+from graphify.backbone.compact import CompactImplementation
+from graphify.backbone.networkx import NetworkxImplementation
+from graphify.build.initialization import initialize_backbone
+from graphify.build.state import BuildState
+from graphify.build.traverse import resume_build
+from graphify.models.document import Document
+
+
+class TestBackboneCompact(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Section]] Section I",
+            "[[Article]]{'id': '/base/article/2', 'tags': ['x']} Article II",
+            "This is article II text",
+            "[[Article]] Article III",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Section', 'Article'],
+            'patterns': ['Chapter', 'Section', 'Article'],
+            'padding': True
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def build(self, backbone):
+        return resume_build(self.it, BuildState(self.descriptor), initialize_backbone(backbone()))
+
+    def test_same_graph(self):
+        """
+        A document built on the compact backbone has the same nodes, data and edges as on networkx,
+        and is traversed in the same order
+        """
+        expected, result = self.build(NetworkxImplementation), self.build(CompactImplementation)
+
+        self.assertListEqual([(k, dict(v)) for k, v in expected.nodes(data=True)],
+                             [(k, dict(v)) for k, v in result.nodes(data=True)])
+        self.assertListEqual(expected.edges(), result.edges())
+        self.assertListEqual(list(expected.dfs()), list(result.dfs()))
+        self.assertListEqual(list(expected.bfs()), list(result.bfs()))
+        self.assertListEqual(list(expected.dfs('Chapter [4]')), list(result.dfs('Chapter [4]')))
+
+        self.assertTrue(result.exists_path('ROOT [0]', 'Article [7]'))
+        self.assertFalse(result.exists_path('Chapter [1]', 'Article [7]'))
+        self.assertListEqual(['Section [5]'], list(result.parents('Article [7]')))
+
+        expected, result = Document(expected, 'ROOT [0]'), Document(result, 'ROOT [0]')
+        self.assertEqual(expected.to_dict(), result.to_dict())
+        self.assertEqual((expected.active_depth, expected.max_depth), (result.active_depth, result.max_depth))
+
+    def test_node_data(self):
+        """
+        Node data behaves as a dictionary, whatever the type of the values; fields can be added and removed
+        """
+        graph = initialize_backbone(CompactImplementation())
+        graph.add_node('A [1]', meta='A', level=1, pad=False, text=[], custom={'k': 1})
+        graph.add_edge('ROOT [0]', 'A [1]')
+
+        data = graph['A [1]']
+        self.assertEqual({'meta': 'A', 'level': 1, 'pad': False, 'text': [], 'custom': {'k': 1}}, data)
+
+        data['level'] = 'one'
+        data['pad'] = 0
+        data['id'] = '/root/a-1'
+        del data['custom']
+        self.assertEqual({'meta': 'A', 'level': 'one', 'pad': 0, 'text': [], 'id': '/root/a-1'}, dict(data))
+
+        data['level'] = 2
+        self.assertEqual(2, graph['A [1]']['level'])
+        self.assertNotIn('custom', data)
+
+        with self.assertRaises(KeyError):
+            graph['B [2]']
+
+        with self.assertRaises(ValueError):
+            graph.add_edge('A [1]', 'ROOT [0]')
+
+    def test_remove_nodes(self):
+        """
+        Removed nodes leave the structure; data views survive the compaction of the columns
+        """
+        graph = initialize_backbone(CompactImplementation())
+        for i in range(1, 3001):
+            graph.add_node(f'A [{i}]', level=1, text=[str(i)])
+            graph.add_edge('ROOT [0]', f'A [{i}]')
+
+        kept = graph['A [3000]']
+        graph.remove_nodes_from([f'A [{i}]' for i in range(1, 2999)])
+
+        self.assertEqual(3, graph.number_of_nodes())
+        self.assertListEqual(['A [2999]', 'A [3000]'], list(graph.successors('ROOT [0]')))
+        self.assertListEqual(['3000'], kept['text'])
+        self.assertEqual(3, len(graph._keys))
@@ -0,0 +1,93 @@
+import json
+import os
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from graphify.backbone.compact import CompactImplementation
+from graphify.backbone.initialization import BACKBONES, BACKBONE_ENV
+from graphify.backbone.initialization import get_backbone, initialize_graph, register_backbone
+from graphify.backbone.networkx import NetworkxImplementation
+from graphify.parsing import Parser, append_lines, checkpoint, parse_iterable, reparse, resume
+
+
+class TestBackboneInitialization(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Article]] Article II",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_selection(self):
+        """
+        A backbone is selected by name, by the environment variable otherwise and networkx by default
+        """
+        with patch.dict(os.environ, {BACKBONE_ENV: ''}):
+            self.assertIs(NetworkxImplementation, get_backbone())
+            self.assertIs(CompactImplementation, get_backbone('compact'))
+            self.assertIsInstance(initialize_graph('DOC', 'compact'), CompactImplementation)
+            self.assertEqual('DOC [0]', initialize_graph('DOC', 'compact').root_key)
+
+        with patch.dict(os.environ, {BACKBONE_ENV: 'compact'}):
+            self.assertIs(CompactImplementation, get_backbone())
+            self.assertIs(NetworkxImplementation, get_backbone('networkx'))
+
+        with self.assertRaises(ValueError):
+            get_backbone('unknown')
+
+    def test_register(self):
+        """
+        Any implementation of the backbone abstraction can be registered
+        """
+        class Custom(CompactImplementation):
+            pass
+
+        register_backbone('custom', Custom)
+        try:
+            self.assertIsInstance(parse_iterable(self.it, self.descriptor, backbone='custom').graph, Custom)
+        finally:
+            del BACKBONES['custom']
+
+        with self.assertRaises(ValueError):
+            register_backbone('dict', dict)
+
+    def test_parser_backbone(self):
+        """
+        A parser builds every document on its backbone, which is kept when resuming or parsing again
+        """
+        document = Parser(self.descriptor, backbone='compact').parse(self.it[:3])
+        self.assertIsInstance(document.graph, CompactImplementation)
+
+        document = resume(json.loads(json.dumps(checkpoint(document))))
+        self.assertIsInstance(document.graph, CompactImplementation)
+
+        document = append_lines(document, self.it[3:])
+        expected = parse_iterable(self.it, self.descriptor)
+        self.assertListEqual([(k, dict(v)) for k, v in expected.traverse()],
+                             [(k, dict(v)) for k, v in document.traverse()])
+
+        # an edit of an empty document cannot be handled locally: the whole document is parsed again
+        document = Parser(self.descriptor, backbone='compact').parse([])
+        document = reparse(document, [], 0, 0, self.it, self.descriptor)
+        self.assertIsInstance(document.graph, CompactImplementation)
+        self.assertEqual(expected.to_dict(), document.to_dict())
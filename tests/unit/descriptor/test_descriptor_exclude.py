@@ -0,0 +1,82 @@
+import re
+
+from functools import reduce
+from unittest import TestCase
+
+from graphify.descriptor.exclude import ExcludeCleaner
+from graphify.descriptor.utils import normalize_descriptor, prepare_descriptor
+
+
+class TestDescriptorExclude(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.descriptor = normalize_descriptor(prepare_descriptor({
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }))
+
+        cls.lines = [
+            "[[Chapter]] Chapter I",
+            "[[Article]]{'id': '/base/article/1'} Article I",
+            "Plain text, no tags at all",
+            "Some text [[Article]] and more [[Chapter]]",
+            "Unbalanced [[ brackets ]]",
+            ""
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_same_as_sequential(self):
+        """
+        Cleaning a line gives the same result as applying the 'exclude' patterns one after the other
+        """
+        exclude = self.descriptor['exclude']
+        clean = ExcludeCleaner(exclude)
+
+        for line in self.lines:
+            expected = reduce(lambda acc, x: x.sub('', acc), exclude, line)
+            self.assertEqual(expected, clean(line))
+
+    def test_gate(self):
+        """
+        Internal tags all start with '[[': lines without it are returned as they are
+        """
+        clean = self.descriptor['cleaner']
+        self.assertEqual(('[[',), clean.literals)
+        self.assertIsNotNone(clean.search)
+
+        line = "Plain text, no tags at all"
+        self.assertIs(line, clean(line))
+
+    def test_user_patterns(self):
+        """
+        Patterns without a leading literal disable the gate, those with groups are applied one by one
+        """
+        clean = ExcludeCleaner(self.descriptor['exclude'] + [r'\s+$'])
+        self.assertIsNone(clean.literals)
+        self.assertEqual("Chapter I", clean("[[Chapter]] Chapter I   "))
+
+        clean = ExcludeCleaner([re.compile(r'(#+)x\1'), 'TODO'])
+        self.assertIsNone(clean.search)
+        self.assertEqual(" text ", clean("##x## text TODO"))
+
+    def test_overlapping_patterns(self):
+        """
+        Patterns whose matches overlap, or appear once another one is removed, should be applied in order
+        """
+        exclude = [re.compile(r'\d+ of \d+'), re.compile(r'Page \d+')] + self.descriptor['exclude']
+        clean = ExcludeCleaner(exclude)
+
+        for line in self.lines + ["Page 1 of 2", "[[Article[[Chapter]] ]] x", "[[Chapter[[Article]] ]] x"]:
+            expected = reduce(lambda acc, x: x.sub('', acc), exclude, line)
+            self.assertEqual(expected, clean(line))
+
+        self.assertEqual("Page ", clean("Page 1 of 2"))
@@ -0,0 +1,96 @@
+import re
+
+from unittest import TestCase
+
+from graphify.descriptor.matcher import DescriptorMatcher
+from graphify.descriptor.utils import compile_patterns, normalize_descriptor
+from graphify.descriptor.utils import extend_internal_patterns, extend_descriptor_with_data_capture_group
+
+
+class TestDescriptorMatcher(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_priority_is_given_by_the_hierarchy(self):
+        """
+        The level closer to the root should win, even if a deeper level matches earlier in the line
+        """
+        descriptor = {
+            'components': ['A', 'B', 'C'],
+            'patterns': [r'A', [r'B', r'Z'], r'C']
+        }
+
+        descriptor = normalize_descriptor(compile_patterns(descriptor))
+        matcher = descriptor['matcher']
+
+        match, level = matcher.search('C then Z then A')
+        self.assertEqual((match.group(), level), ('A', 1))
+
+        match, level = matcher.search('C then Z')
+        self.assertEqual((match.group(), level), ('Z', 2))
+
+        self.assertEqual(matcher.search('nothing to see here'), (None, None))
+
+    def test_same_result_as_evaluating_every_pattern(self):
+        """
+        The matches returned should be the ones produced by the original patterns, named groups included
+        """
+        descriptor = {
+            'components': [['Chapter', 'Schedule'], 'Article'],
+            'patterns': [['Chapter', 'Schedule'], 'Article']
+        }
+
+        descriptor = extend_internal_patterns(descriptor)
+        descriptor = extend_descriptor_with_data_capture_group(descriptor)
+        descriptor = normalize_descriptor(compile_patterns(descriptor))
+
+        lines = [
+            "[[Article]]{'id': 1} Article I",
+            "[[Schedule]] Schedule I mentions an Article",
+            "Chapter",
+            "body text"
+        ]
+
+        def reference(line):
+            for i, patterns in enumerate(descriptor['patterns']):
+                for p in patterns:
+                    if p.search(line):
+                        return p.search(line), i + 1
+            return None, None
+
+        for line in lines:
+            match, level = descriptor['matcher'].search(line)
+            expected_match, expected_level = reference(line)
+
+            self.assertEqual(level, expected_level)
+            if expected_match:
+                self.assertEqual(match.groupdict(), expected_match.groupdict())
+                self.assertEqual(match.span(), expected_match.span())
+
+    def test_custom_matchers(self):
+        """
+        Any object exposing a `search` method can be used as a pattern
+        """
+        class Exact(object):
+            def __init__(self, token):
+                self.token = token
+
+            def search(self, line):
+                return re.match(re.escape(self.token), line) if line == self.token else None
+
+        matcher = DescriptorMatcher([[Exact('A')], [re.compile(r'B', re.IGNORECASE)]])
+
+        self.assertEqual(matcher.search('A')[1], 1)
+        self.assertEqual(matcher.search('b')[1], 2)
+        self.assertEqual(matcher.search('AA'), (None, None))
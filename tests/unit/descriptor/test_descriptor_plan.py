@@ -0,0 +1,86 @@
+import pickle
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from graphify.descriptor.plan import ParsePlan, parse_plan
+from graphify.parsing import Parser, parse_iterable
+
+
+class TestDescriptorPlan(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]]{'id': '/base/chapter/1'} Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_plan_cache(self):
+        """
+        Equal descriptors share the same plan, which is hashable and immutable
+        """
+        plan = parse_plan(self.descriptor)
+
+        self.assertIs(parse_plan(dict(self.descriptor)), plan)
+        self.assertIs(parse_plan(plan), plan)
+        self.assertEqual(plan, ParsePlan(self.descriptor))
+        self.assertEqual(hash(plan), hash(ParsePlan(self.descriptor)))
+        self.assertNotEqual(plan, parse_plan(dict(self.descriptor, padding=True)))
+
+        with self.assertRaises(AttributeError):
+            plan.source = {}
+
+        with self.assertRaises(TypeError):
+            plan.source['padding'] = True
+
+    def test_plan_unhashable_values(self):
+        """
+        Sets in a descriptor should not keep its plan from being hashed
+        """
+        descriptor = dict(self.descriptor, extra={'a', 'b'})
+        plan = parse_plan(descriptor)
+
+        self.assertEqual(hash(plan), hash(ParsePlan(dict(self.descriptor, extra={'b', 'a'}))))
+        self.assertIs(parse_plan(plan.source), plan)
+
+    def test_plan_pickle(self):
+        """
+        A plan is sent over as its source descriptor and compiled again
+        """
+        plan = parse_plan(self.descriptor)
+        self.assertEqual(pickle.loads(pickle.dumps(plan)), plan)
+
+    def test_plan_shared(self):
+        """
+        Every entry point gives the same result from a plan, including `Parser`, also when parsing concurrently
+        """
+        plan = parse_plan(self.descriptor)
+        expected = list(parse_iterable(self.it, self.descriptor).traverse())
+
+        self.assertListEqual(list(Parser(self.descriptor).parse(self.it).traverse()), expected)
+
+        with ThreadPoolExecutor(4) as executor:
+            documents = list(executor.map(lambda _: parse_iterable(self.it, plan), range(16)))
+
+        for document in documents:
+            self.assertListEqual(list(document.traverse()), expected)
+
+        self.assertEqual(expected[1][1]['text'], ['Chapter I', 'This is chapter I text'])
@@ -0,0 +1,123 @@
+import re
+
+from unittest import TestCase
+
+from graphify.descriptor.prefilter import Prefilter
+from graphify.parsing import parse_iterable
+from graphify.descriptor.utils import compile_patterns, normalize_descriptor
+from graphify.descriptor.utils import extend_internal_patterns, extend_descriptor_with_data_capture_group
+
+
+def prepare(descriptor):
+    descriptor = extend_internal_patterns(descriptor)
+    descriptor = extend_descriptor_with_data_capture_group(descriptor)
+    return normalize_descriptor(compile_patterns(descriptor))
+
+
+class TestDescriptorPrefilter(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pass
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_anchored_patterns(self):
+        """
+        Anchored patterns should be reduced to checks on the beginning of the line
+        """
+        descriptor = prepare({
+            'components': ['Schedule', 'Part', 'Section'],
+            'patterns': [r'^Schedule\s\d{1,2}', r'^PART\s\d{1,2}', r'^\d{1,2}\.\s']
+        })
+
+        prefilter = descriptor['prefilter']
+
+        self.assertTrue(prefilter.enabled)
+        self.assertEqual(prefilter.starts, ('PART', 'Schedule'))
+        self.assertTrue(prefilter.decimal)
+
+        self.assertTrue(prefilter('Schedule 1 - General'))
+        self.assertTrue(prefilter('PART 2'))
+        self.assertTrue(prefilter('1. General Restrictions'))
+        self.assertFalse(prefilter('The Manager must pay due regard to PART 1'))
+        self.assertFalse(prefilter(''))
+
+        self.assertEqual(prefilter.report(), {'passed': 3, 'skipped': 2, 'ratio': 0.4})
+
+    def test_internal_patterns(self):
+        """
+        Unanchored patterns should be reduced to the literals they require
+        """
+        descriptor = prepare({
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        })
+
+        prefilter = descriptor['prefilter']
+
+        self.assertEqual(prefilter.literals, ('Article', 'Chapter'))
+        self.assertTrue(prefilter("[[Chapter]]{'id': 1} Chapter I"))
+        self.assertFalse(prefilter('This is chapter I text'))
+
+    def test_never_rejects_a_match(self):
+        """
+        Every line matched by a pattern must go through the prefilter
+        """
+        descriptor = prepare({
+            'components': ['Section', 'Subsection', 'Annex'],
+            'patterns': [r'^\d{1,2}[A-Z]?\.?\s', r'^\d{1,2}[A-Z]?\.\d{1,2}\s', [r'ANNEX [IVX]+', r'^[a-c]\)']]
+        })
+
+        lines = [
+            '1. INTERPRETATION', '2A.1 The Manager', '٣. Arabic-Indic digit', 'See ANNEX IV', 'b) item',
+            'ANNEX', 'd) item', '', '[[Section]] 1 ', 'body text'
+        ]
+
+        for line in lines:
+            candidate = descriptor['prefilter'](line)
+            if descriptor['matcher'].search(line)[0]:
+                self.assertTrue(candidate, line)
+
+        self.assertEqual(descriptor['prefilter'].report()['skipped'], 4)
+
+    def test_patterns_that_cannot_be_characterized(self):
+        """
+        If nothing can be said about one of the patterns every line should be let through
+        """
+        patterns = [[re.compile(r'^A')], [re.compile(r'b', re.IGNORECASE)]]
+        prefilter = Prefilter(patterns)
+
+        self.assertFalse(prefilter.enabled)
+        self.assertTrue(prefilter('anything'))
+
+    def test_atomic_groups(self):
+        """
+        Atomic groups should be walked into like any other group
+        """
+        descriptor = prepare({
+            'components': ['Chapter', 'Article'],
+            'patterns': [r'^Chapter(?>\s)\d', r'(?>^Article)\s']
+        })
+
+        prefilter = descriptor['prefilter']
+
+        self.assertTrue(prefilter.enabled)
+        self.assertEqual(prefilter.starts, ('Article', 'Chapter'))
+        self.assertTrue(prefilter('Chapter 1'))
+        self.assertTrue(prefilter('Article 2'))
+        self.assertFalse(prefilter('text of Chapter 1'))
+
+        doc = parse_iterable(['Chapter 1', 'text', 'Article 1', 'text'], {
+            'components': ['Chapter', 'Article'],
+            'patterns': [r'^Chapter(?>\s)\d', r'(?>^Article)\s']
+        })
+        self.assertEqual(list(doc.nodes(1, False)), ['Chapter 1 [1]'])
+        self.assertEqual(list(doc.nodes(2, False)), ['Article [2]'])
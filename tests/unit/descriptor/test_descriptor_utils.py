@@ -5,6 +5,7 @@ from unittest import TestCase
 from graphify.descriptor.utils import compile_patterns
 from graphify.descriptor.utils import extend_internal_patterns
 from graphify.descriptor.utils import extend_descriptor_with_data_capture_group
+from graphify.descriptor.utils import parse_custom_data_object
 
 from graphify.descriptor.constants.patterns import DATA_NAMED_GROUP
 
@@ -135,3 +136,35 @@ class TestDescriptorUtils(TestCase):
 
 
 
+
+    def test_parse_custom_data_object(self):
+        """
+        Data objects are read as literals, python or json, and every call gets its own copy
+        """
+        pattern = re.compile(rf'(?P<component>\[\[A\]\]){DATA_NAMED_GROUP}')
+
+        match = pattern.search("[[A]]{'id': '/a/1', 'tags': ['x'], 'n': 1.5} A")
+        self.assertDictEqual(parse_custom_data_object(match), {'id': '/a/1', 'tags': ['x'], 'n': 1.5})
+
+        match = pattern.search('[[A]]{"id": "/a/1", "flag": true} A')
+        self.assertDictEqual(parse_custom_data_object(match), {'id': '/a/1', 'flag': True})
+
+        match = pattern.search("""[[A]]{'flag': True, 'quote': "it's", 'pair': (1, 2), 1: None} A""")
+        self.assertDictEqual(parse_custom_data_object(match), {'flag': True, 'quote': "it's", 'pair': (1, 2), 1: None})
+
+        self.assertDictEqual(parse_custom_data_object(pattern.search("[[A]] A")), {})
+
+        match = pattern.search("[[A]]{'tags': ['x']} A")
+        parse_custom_data_object(match)['tags'].append('y')
+        self.assertDictEqual(parse_custom_data_object(match), {'tags': ['x']})
+
+    def test_parse_custom_data_object_invalid(self):
+        """
+        Anything but a dictionary of literals is rejected, pointing to the offending line
+        """
+        pattern = re.compile(rf'(?P<component>\[\[A\]\]){DATA_NAMED_GROUP}')
+
+        for line in ["[[A]]{'id': __import__('os').getcwd()} A", "[[A]]{'id': } A", "[[A]]{1, 2} A"]:
+            with self.assertRaises(ValueError) as context:
+                parse_custom_data_object(pattern.search(line))
+            self.assertIn(f"column 5 of line '{line}'", str(context.exception))
@@ -0,0 +1,234 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from graphify.models.document import _merge_accumulator, key_to_numeric
+from graphify.ops.document import map_values
+from graphify.parsing import append_lines, parse_iterable, reparse
+
+
+class TestModelsDocument(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Article]] Article II",
+            "This is article II text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_order_cached(self):
+        """
+        A fresh build is traversed in insertion order without sorting its keys, the order being computed once
+        """
+        with patch('graphify.models.document.key_to_numeric', side_effect=key_to_numeric) as numeric:
+            document = parse_iterable(self.it, self.descriptor)
+            keys = [key for key, _ in document.traverse()]
+            self.assertEqual(0, numeric.call_count)
+
+        self.assertListEqual(['ROOT [0]', 'Chapter [1]', 'Article [2]', 'Chapter [3]', 'Article [4]'], keys)
+        self.assertIs(document.order(), document.order())
+        self.assertListEqual(keys, map_values(document, lambda data: data).order())
+
+    def test_order_mutations(self):
+        """
+        The order follows the nodes added by `append_lines` and `reparse`, and any direct change of the graph
+        """
+        source = list(self.it[:4])
+        document = parse_iterable(source, self.descriptor)
+        document = append_lines(document, self.it[4:])
+        source += self.it[4:]
+        self.assertListEqual(sorted(document.graph.nodes(), key=key_to_numeric), document.order())
+
+        document = reparse(document, source, 3, 3, ["[[Article]] Article I bis"], self.descriptor)
+        self.assertIn('Article [1_2]', document.order())
+        self.assertListEqual(sorted(document.graph.nodes(), key=key_to_numeric), document.order())
+
+        document.graph.add_node('Article [9]', meta='Article', level=2, pad=False, text=[], id='/root/article-9')
+        self.assertEqual('Article [9]', document.order()[-1])
+
+        document.graph.remove_nodes_from(['Article [9]'])
+        self.assertNotIn('Article [9]', document.order())
+
+    def test_indexes(self):
+        """
+        Nodes are looked up by level, by component and as leaves through the indexes of the document
+        """
+        document = parse_iterable(self.it, self.descriptor)
+
+        self.assertListEqual(['Chapter [1]', 'Chapter [3]'], list(document.nodes(1, False)))
+        self.assertListEqual(['Article [2]', 'Article [4]'], list(document.paragraphs(False)))
+        self.assertListEqual(['Article [2]', 'Article [4]'], list(document.components('Article', False)))
+        self.assertListEqual(['Article [2]', 'Article [4]'], list(document.leaf_nodes(False)))
+        self.assertEqual(('Chapter [1]', document['Chapter [1]']), document.search('Chap'))
+        self.assertIsNone(document.search('Section'))
+        self.assertListEqual([], list(document.nodes(5)))
+
+    def test_indexes_mutations(self):
+        """
+        The indexes follow the nodes appended, spliced and changed through the document
+        """
+        source = list(self.it[:5])
+        document = parse_iterable(source, self.descriptor)
+        self.assertListEqual(['Article [2]', 'Chapter [3]'], list(document.leaf_nodes(False)))
+
+        document = append_lines(document, self.it[5:])
+        source += self.it[5:]
+        self.assertListEqual(['Article [2]', 'Article [4]'], list(document.leaf_nodes(False)))
+        self.assertListEqual(['Article [2]', 'Article [4]'], list(document.components('Article', False)))
+
+        document = reparse(document, source, 3, 3, ["[[Article]] Article I bis"], self.descriptor)
+        self.assertListEqual(['Article [1_1]', 'Article [1_2]', 'Article [4]'],
+                             list(document.components('Article', False)))
+
+        document['Article [4]'] = dict(document['Article [4]'], meta='Annex')
+        self.assertListEqual(['Article [4]'], list(document.components('Annex', False)))
+
+    def test_indexes_in_place_edits(self):
+        """
+        The indexes follow the data changed in place, e.g. through `traverse`
+        """
+        document = parse_iterable(self.it, self.descriptor)
+        self.assertListEqual(['Chapter [1]', 'Chapter [3]'], list(document.nodes(1, False)))
+        self.assertEqual('Article [4]', document.node_by_id('/root/chapter-3/article-4')[0])
+
+        for key, data in document.traverse():
+            data['level'] = 0
+        self.assertListEqual([key for key, _ in document.traverse()], list(document.nodes(0, False)))
+        self.assertListEqual([], list(document.nodes(1, False)))
+
+        document['Article [4]']['id'] = '/root/annex-1'
+        self.assertEqual('Article [4]', document.node_by_id('/root/annex-1')[0])
+        self.assertIsNone(document.node_by_id('/root/chapter-3/article-4'))
+
+        document.node('Chapter [1]')['meta'] = 'Annex'
+        self.assertEqual('Chapter [1]', document.search('Ann')[0])
+
+        # the writes are counted per graph: those to another document leave the indexes of this one as they are
+        index = document.index()
+        other = parse_iterable(self.it, self.descriptor)
+        other['Chapter [1]']['meta'] = 'Annex'
+        self.assertIs(index, document.index())
+
+    def test_paths(self):
+        """
+        Nodes are looked up by id, by id prefix (whole segments) and by id suffix through the path index
+        """
+        document = parse_iterable(self.it, self.descriptor)
+
+        self.assertEqual('Article [4]', document.node_by_id('/root/chapter-3/article-4')[0])
+        self.assertIsNone(document.node_by_id('/root/chapter-3/article-5'))
+        self.assertListEqual(['Chapter [3]', 'Article [4]'], list(document.nodes_under('/root/chapter-3', False)))
+        self.assertListEqual([], list(document.nodes_under('/root/chapter', False)))
+        self.assertEqual('Article [2]', document.id_ending_with('chapter-1/article-2')[0])
+        self.assertEqual('Article [4]', document.id_ending_with('le-4')[0])
+
+        document = append_lines(document, ["[[Chapter]] Chapter III"])
+        self.assertEqual('Chapter [5]', document.id_ending_with('/chapter-5')[0])
+
+    def test_id_ending_with_first_match(self):
+        """
+        The first node whose id ends with the suffix is returned, whether the suffix is a whole segment of it or not
+        """
+        it = [
+            "[[Chapter]]{'id': '/root/chapter-xii'} Chapter XII",
+            "[[Chapter]]{'id': '/root/annex/xii'} Annex XII",
+        ]
+
+        document = parse_iterable(it, self.descriptor)
+        self.assertEqual('Chapter [1]', document.id_ending_with('xii')[0])
+        self.assertEqual('Chapter [2]', document.id_ending_with('/xii')[0])
+        self.assertEqual('Chapter [2]', document.id_ending_with('annex/xii')[0])
+
+    def test_structure(self):
+        """
+        Ancestry, lowest common ancestors, k-th ancestors, sibling positions and subtrees through the structural index
+        """
+        source = list(self.it)
+        document = parse_iterable(source, self.descriptor)
+        structure = document.structure()
+
+        self.assertTrue(structure.is_ancestor('ROOT [0]', 'Article [4]'))
+        self.assertFalse(structure.is_ancestor('Chapter [1]', 'Article [4]'))
+        self.assertFalse(structure.is_ancestor('Article [4]', 'Article [4]'))
+        self.assertEqual('ROOT [0]', structure.lowest_common_ancestor('Article [2]', 'Article [4]'))
+        self.assertEqual('Chapter [3]', structure.lowest_common_ancestor('Chapter [3]', 'Article [4]'))
+        self.assertEqual('ROOT [0]', structure.ancestor('Article [4]', 2))
+        self.assertIsNone(structure.ancestor('Article [4]', 3))
+        self.assertEqual(1, structure.sibling_position('Chapter [3]'))
+        self.assertListEqual(['Chapter [3]', 'Article [4]'], structure.subtree('Chapter [3]'))
+
+        document = append_lines(document, ["[[Article]] Article III"])
+        source.append("[[Article]] Article III")
+        self.assertIs(structure, document.structure())
+        self.assertEqual(1, structure.sibling_position('Article [5]'))
+        self.assertListEqual(['Chapter [3]', 'Article [4]', 'Article [5]'], structure.subtree('Chapter [3]'))
+
+        lines = ["[[Chapter]] Chapter III", "[[Article]] Article IV", "[[Chapter]] Chapter IV"]
+        document = append_lines(document, lines)
+        source.extend(lines)
+        self.assertIs(structure, document.structure())
+        self.assertEqual(2, structure.sibling_position('Chapter [6]'))
+        self.assertEqual(0, structure.sibling_position('Article [7]'))
+        self.assertEqual(3, structure.sibling_position('Chapter [8]'))
+
+        document = reparse(document, source, 3, 3, ["[[Article]] Article I bis"], self.descriptor)
+        self.assertEqual('Chapter [1]', document.structure().lowest_common_ancestor('Article [1_1]', 'Article [1_2]'))
+        self.assertEqual(1, document.structure().sibling_position('Article [1_2]'))
+
+    def test_view(self):
+        """
+        A view over a subtree shares the nodes of the document and serves the usual queries on the subtree only
+        """
+        document = parse_iterable(self.it, self.descriptor)
+        view = document.view('Chapter [3]')
+
+        self.assertListEqual(['Chapter [3]', 'Article [4]'], [key for key, _ in view.traverse()])
+        self.assertIs(document.graph, view.graph)
+        self.assertListEqual(['Chapter II', 'Article II', 'This is article II text'], list(view.text(just_text=True)))
+        self.assertEqual(('Article [4]', document['Article [4]']), view.search('Article'))
+        self.assertListEqual(['Article [4]'], list(view.leaf_nodes(False)))
+        self.assertEqual((2, 1), (view.max_depth, view.active_depth))
+        self.assertEqual('Article [4]', view.node_by_id('/root/chapter-3/article-4')[0])
+        self.assertIsNone(view.node_by_id('/root/chapter-1/article-2'))
+
+        serialized = view.to_dict()
+        self.assertEqual('Chapter', serialized['document_name'])
+        self.assertListEqual([], serialized['nodes'][0]['predecessors'])
+        self.assertListEqual(['Chapter [3]', 'Article [4]'], [node['key'] for node in serialized['nodes']])
+
+        document = append_lines(document, ["[[Article]] Article III"])
+        self.assertListEqual(['Chapter [3]', 'Article [4]', 'Article [5]'], view.order())
+        self.assertListEqual(['Article [4]', 'Article [5]'], list(view.components('Article', False)))
+
+        view['Article [4]'] = dict(view['Article [4]'], meta='Annex')
+        self.assertEqual('Annex', document['Article [4]']['meta'])
+        self.assertListEqual(['Article [4]'], list(document.components('Annex', False)))
+        self.assertListEqual(['Article [4]'], list(view.components('Annex', False)))
+
+    def test_merge_accumulator(self):
+        """
+        Consecutive groups of the same level are merged, however many there are
+        """
+        a, b = {'level': 1}, {'level': 2}
+        self.assertListEqual([[a, a], [b]], _merge_accumulator([[a], [a], [b]], []))
+
+        merged = _merge_accumulator([[a] if i < 3000 else [b] for i in range(6000)], [])
+        self.assertListEqual([3000, 3000], [len(group) for group in merged])
@@ -1,14 +1,21 @@
+import json
 import re
 
-from unittest import TestCase
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
 from functools import reduce
 
 from graphify.backbone.networkx import NetworkxImplementation
 from graphify.build.graph import _add_node
 from graphify.build.initialization import initialize_backbone
-from graphify.ops.document import copy, map_values
-from graphify.parsing import parse_iterable
+from graphify.ops.document import copy, map_column, map_values, snapshot
+from graphify.parsing import append_lines, parse_iterable
+
+try:
+    import numpy
+except ImportError:  # optional, see `map_column`
+    numpy = None
 
 # During the parsing process some information is added to the document representation to
 # allow to parsing to proceed
@@ -166,3 +173,228 @@ class TestOpsDocument(TestCase):
 
         self.assertListEqual(result, expected)
 
+    def test_map_data_copy_on_write(self):
+        """
+        Documents derived by `map_values` share the nodes 'f' does not write to, with their source and each other
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "[[Article]] Article II",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+
+        def f(data):
+            if data['meta'] == 'Article':
+                data['numbered'] = True
+
+        def g(data):
+            if data['meta'] == 'Chapter':
+                data['meta'] = 'Part'
+
+        first = map_values(doc, f)
+        self.assertListEqual(['Article [2]', 'Article [3]'], sorted(first.graph.own))
+
+        second = map_values(first, g)
+        self.assertListEqual(['Chapter [1]'], list(second.graph.own))
+        self.assertTrue(second['Article [2]']['numbered'])
+        self.assertEqual('Part', second['Chapter [1]']['meta'])
+
+        self.assertEqual('Chapter', first['Chapter [1]']['meta'])
+        self.assertNotIn('numbered', doc['Article [2]'])
+
+    def test_map_data_source(self):
+        """
+        `map_values` leaves its source as it was: of the same kind, writable and serializable
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor, backbone='networkx')
+        backbone = type(doc.graph)
+
+        def f(data):
+            data['meta'] = data['meta'].upper()
+
+        result = map_values(doc, f)
+
+        self.assertIs(backbone, type(doc.graph))
+        self.assertEqual('Article', json.loads(json.dumps(doc['Article [2]']))['meta'])
+        self.assertEqual('ARTICLE', json.loads(json.dumps(result['Article [2]']))['meta'])
+
+        doc['Chapter [1]']['meta'] = 'Part'
+        doc.graph.add_node('Article [3]', meta='Article', level=2, pad=False, text=[])
+        doc.graph.add_edge('Chapter [1]', 'Article [3]')
+
+        self.assertEqual('CHAPTER', result['Chapter [1]']['meta'])
+        self.assertEqual(3, result.graph.number_of_nodes())
+        self.assertListEqual(['Article [2]', 'Article [3]'], list(doc.components('Article', False)))
+        self.assertListEqual(['Article [2]'], list(result.components('ARTICLE', False)))
+
+    def test_snapshot(self):
+        """
+        A snapshot keeps the state of the document, whatever is done to the document afterwards, and the other way round
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+        # the content of the nodes is not copied by `to_dict`
+        expected = json.loads(json.dumps(doc.to_dict()))
+        snap = snapshot(doc)
+
+        doc['Chapter [1]']['meta'] = 'Part'
+        doc = append_lines(doc, ["This is article I text", "[[Article]] Article II"])
+        self.assertEqual(expected, snap.to_dict())
+        self.assertEqual(4, doc.graph.number_of_nodes())
+
+        snap['Article [2]']['text'] = ['Changed']
+        self.assertListEqual(['Article I', 'This is article I text'], doc['Article [2]']['text'])
+
+        with self.assertRaises(TypeError):
+            snap.graph.add_node('Article [9]')
+
+    def test_snapshot_nested(self):
+        """
+        Values changed in place, e.g. lines appended to 'text', do not reach the documents sharing the node
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+        first = map_values(doc, lambda data: data)
+        snap = snapshot(first)
+
+        first['Chapter [1]']['text'].append('x')
+        self.assertListEqual(['Chapter I', 'This is chapter I text'], snap['Chapter [1]']['text'])
+        self.assertListEqual(['Chapter I', 'This is chapter I text', 'x'], first['Chapter [1]']['text'])
+
+        second = map_values(first, lambda data: data['text'].append('y'))
+        self.assertListEqual(['Chapter I', 'This is chapter I text', 'x'], first['Chapter [1]']['text'])
+        self.assertListEqual(['Article I', 'y'], second['Article [2]']['text'])
+        self.assertListEqual(['Article I'], snap['Article [2]']['text'])
+        self.assertListEqual(['Article I'], doc['Article [2]']['text'])
+
+    def test_map_column(self):
+        """
+        `map_column` calls 'f' once with the values of an attribute of every node (or of a level) and stores its results
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "[[Article]] Article II",
+            "This is article II text",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+        calls = []
+
+        def count(column):
+            calls.append(column)
+            return [len(lines) for lines in column]
+
+        new_doc = map_column(doc, 'text', count, level=2, target='lines')
+        self.assertEqual(1, len(calls))
+        self.assertListEqual([1, 2], [data['lines'] for _, data in new_doc.nodes(2)])
+        self.assertNotIn('lines', new_doc['Chapter [1]'])
+        self.assertNotIn('lines', doc['Article [2]'])
+
+        new_doc = map_column(doc, 'meta', lambda column: [meta.lower() for meta in column])
+        self.assertListEqual(['root', 'chapter', 'article', 'article'], [data['meta'] for _, data in new_doc.traverse()])
+        self.assertEqual('Chapter', doc['Chapter [1]']['meta'])
+
+        with self.assertRaises(ValueError):
+            map_column(doc, 'meta', lambda column: column[1:])
+
+        with patch('graphify.ops.document._numpy', return_value=None):
+            with self.assertRaises(ImportError):
+                map_column(doc, 'level', lambda column: column, as_array=True)
+
+    def test_map_column_indexes(self):
+        """
+        The document returned is indexed on the values written by `map_column`
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "[[Article]] Article I",
+            "[[Article]] Article II",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+
+        new_doc = map_column(doc, 'meta', lambda column: [meta.upper() for meta in column], level=2)
+        self.assertListEqual(['Article [2]', 'Article [3]'], list(new_doc.components('ARTICLE', False)))
+        self.assertEqual('Article [2]', new_doc.search('ARTI')[0])
+
+        new_doc = map_column(doc, 'level', lambda column: [level + 1 for level in column], level=2)
+        self.assertListEqual(['Article [2]', 'Article [3]'], list(new_doc.nodes(3, False)))
+        self.assertListEqual([], list(new_doc.nodes(2, False)))
+        self.assertListEqual(['Article [2]', 'Article [3]'], list(doc.nodes(2, False)))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_map_column_array(self):
+        """
+        With 'as_array' the column is a numpy array and the results are stored as plain python values
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        doc = parse_iterable(it, descriptor)
+
+        new_doc = map_column(doc, 'level', lambda column: column * 10, as_array=True)
+        self.assertListEqual([0, 10, 20], [data['level'] for _, data in new_doc.traverse()])
+        self.assertIs(int, type(new_doc['Article [2]']['level']))
+
+        new_doc = map_column(doc, 'text', lambda column: numpy.array([len(lines) for lines in column]),
+                             target='lines', as_array=True)
+        self.assertListEqual([0, 1, 2], [data['lines'] for _, data in new_doc.traverse()])
@@ -111,3 +111,20 @@ class TestOpsSearch(TestCase):
 
 
     #
+
+    def test_search_deep_ancestors(self):
+        """
+        Searching the ancestors of a deeply nested node and checking paths do not recurse
+        """
+        graph = initialize_backbone(NetworkxImplementation())
+
+        node = "ROOT [0]"
+        for i in range(5000):
+            node = _add_node(graph, "NODE", node, tag=i % 1000, level=i + 1)
+
+        result = list(filter_bfs_ancestors(graph, source=node, predicate=lambda x: x['tag'] == 0))
+        self.assertListEqual(["NODE [4001]", "NODE [3001]", "NODE [2001]", "NODE [1001]", "NODE [1]"], result)
+
+        self.assertTrue(graph.exists_path("ROOT [0]", node))
+        self.assertTrue(graph.exists_path(node, node))
+        self.assertFalse(graph.exists_path(node, "NODE [1]"))
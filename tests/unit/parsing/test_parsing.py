@@ -1,9 +1,11 @@
+import os
 import re
+import tempfile
 
 from unittest import TestCase
 
 from graphify.descriptor.utils import extend_internal_patterns, compile_patterns
-from graphify.parsing import parse_iterable, post_build_process
+from graphify.parsing import parse_iterable, parse_filepath, post_build_process
 
 
 class TestBuildGraph(TestCase):
@@ -328,3 +330,67 @@ class TestBuildGraph(TestCase):
 
 
 
+    def test_climbing_the_hierarchy(self):
+        """
+        Nodes climbing back up the hierarchy should be attached to the closest open ancestor with a lower level,
+        including when padding nodes were introduced along the way
+        """
+        it = [
+            "[[Part]] Part I",
+            "[[Article]] Article 1",
+            "[[Chapter]] Chapter I",
+            "[[Paragraph]] Paragraph 1",
+            "[[Article]] Article 2",
+            "[[Part]] Part II",
+            "[[Paragraph]] Paragraph 2",
+        ]
+
+        descriptor = {
+            'components': ['Part', 'Chapter', 'Article', 'Paragraph'],
+            'patterns': ['Part', 'Chapter', 'Article', 'Paragraph'],
+            'padding': True
+        }
+
+        doc = parse_iterable(it, descriptor)
+
+        result = sorted(doc.graph.edges())
+        expected = sorted([
+            ('ROOT [0]', 'Part [1]'),
+            ('Part [1]', 'Chapter [2]'),
+            ('Chapter [2]', 'Article [3]'),
+            ('Part [1]', 'Chapter [4]'),
+            ('Chapter [4]', 'Article [5]'),
+            ('Article [5]', 'Paragraph [6]'),
+            ('Chapter [4]', 'Article [7]'),
+            ('ROOT [0]', 'Part [8]'),
+            ('Part [8]', 'Chapter [9]'),
+            ('Chapter [9]', 'Article [10]'),
+            ('Article [10]', 'Paragraph [11]'),
+        ])
+
+        self.assertListEqual(result, expected)
+
+    def test_parse_filepath_mmap(self):
+        """
+        Reading the file through a memory map should not change the result
+        """
+        it = [
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'document.txt')
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write('\r\n'.join(it))
+
+            doc = parse_filepath(filepath, descriptor, mmap=True)
+            self.assertListEqual(list(doc.traverse()), list(parse_filepath(filepath, descriptor).traverse()))
+            self.assertEqual(doc.node('Chapter [1]')['text'], ['Chapter I\n', 'This is chapter I text\n'])
@@ -0,0 +1,81 @@
+import asyncio
+
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from graphify.parsing import parse_iterable
+from graphify.parsing.aio import parse_async, parse_many_async
+
+
+async def aiter_lines(lines):
+    for line in lines:
+        await asyncio.sleep(0)
+        yield line
+
+
+class TestParsingAsync(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Article]] Article II",
+            "This is article II text",
+            "[[Chapter]] Chapter II",
+            "This is chapter II text",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article'],
+            'stopParsing': 'Chapter II'
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_parse_async(self):
+        """
+        Consuming an async iterable in chunks should yield the same document as `parse_iterable`
+        """
+        expected = list(parse_iterable(self.it, self.descriptor).traverse())
+
+        for chunk_lines in (1, 3, 100):
+            doc = asyncio.run(parse_async(aiter_lines(self.it), self.descriptor, chunk_lines=chunk_lines))
+            self.assertListEqual(list(doc.traverse()), expected)
+
+    def test_parse_async_process_pool(self):
+        """
+        The chunks built in other processes should all make it into the document
+        """
+        expected = list(parse_iterable(self.it, self.descriptor).traverse())
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            doc = asyncio.run(parse_async(aiter_lines(self.it), self.descriptor, executor=executor, chunk_lines=2))
+
+        self.assertListEqual(list(doc.traverse()), expected)
+
+    def test_parse_many_async(self):
+        """
+        The documents should come back in the order of the sources
+        """
+        sources = [self.it, self.it[:5], self.it[:1]]
+
+        docs = asyncio.run(parse_many_async([aiter_lines(s) for s in sources], self.descriptor, chunk_lines=2, concurrency=2))
+
+        self.assertListEqual(
+            [list(doc.traverse()) for doc in docs],
+            [list(parse_iterable(s, self.descriptor).traverse()) for s in sources]
+        )
@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from graphify.parsing import parse_filepath, parse_iterable
+from graphify.parsing.batch import parse_many, parse_parallel, BatchStats
+
+
+class TestParsingBatch(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filepaths = []
+
+        for i in range(6):
+            filepath = os.path.join(cls.directory.name, f"document-{i}.txt")
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(f"Preamble of document {i}\n")
+                for j in range(i + 1):
+                    f.write(f"[[Chapter]] Chapter {j}\nThis is chapter {j} text\n")
+                    f.write(f"[[Article]] Article {j}\nThis is article {j} text\n")
+            cls.filepaths.append(filepath)
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_parse_many(self):
+        """
+        Every file should be parsed just like `parse_filepath` does
+        """
+        results = dict(parse_many(self.filepaths, self.descriptor, processes=2, chunksize=2))
+
+        self.assertSetEqual(set(results), set(self.filepaths))
+        for filepath, document in results.items():
+            self.assertListEqual(
+                list(document.traverse()),
+                list(parse_filepath(filepath, self.descriptor).traverse())
+            )
+
+    def test_parse_many_ordered(self):
+        """
+        With 'ordered' the results should come in the order of the input, along with the throughput stats
+        """
+        stats = BatchStats()
+        filepaths = [filepath for filepath, _ in parse_many(self.filepaths, self.descriptor, processes=2,
+                                                            ordered=True, stats=stats)]
+
+        self.assertListEqual(filepaths, self.filepaths)
+
+        report = stats.report()
+        self.assertEqual(report['files'], 6)
+        self.assertEqual(report['lines'], sum(1 + 4 * (i + 1) for i in range(6)))
+        self.assertEqual(report['nodes'], sum(1 + 2 * (i + 1) for i in range(6)))
+        self.assertGreater(report['files_per_second'], 0)
+
+    def test_parse_parallel(self):
+        """
+        Splitting a document at its chapters should yield the same nodes, keys and ids as a sequential parse
+        """
+        it = ["Preamble text", "[[Article]] Article 0", "Article 0 text"]
+        for i in range(1, 8):
+            it += [f"[[Chapter]] Chapter {i}", f"Chapter {i} text", f"[[Article]] Article {i}", f"Article {i} text"]
+        it += ["STOP", "[[Chapter]] Chapter 8"]
+
+        descriptor = dict(self.descriptor, padding=True, stopParsing='STOP')
+
+        full = parse_iterable(it, descriptor)
+        document = parse_parallel(it, descriptor, processes=2, chunk_lines=5)
+
+        self.assertListEqual(list(document.traverse()), list(full.traverse()))
+        self.assertListEqual(list(document.graph.edges()), list(full.graph.edges()))
+        self.assertListEqual(document.graph.open_ancestors, full.graph.open_ancestors)
+        self.assertTrue(document.build_state.stopped)
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+from graphify.parsing import parse_iterable, parse_events, ParseEventHandler
+
+
+class Recorder(ParseEventHandler):
+    """
+    Rebuilds the (key, parent, text) structure of a document out of the events
+    """
+    def __init__(self):
+        self.events = []
+        self.stack = []
+        self.nodes = {}
+
+    def start_document(self, key, data):
+        self.events.append(('start', key))
+        self.nodes[key] = (None, data['text'])
+        self.stack.append(key)
+
+    def enter_node(self, key, data):
+        self.events.append(('enter', key))
+        self.nodes[key] = (self.stack[-1], data['text'])
+        self.stack.append(key)
+
+    def text(self, key, line):
+        self.nodes[key][1].append(line)
+
+    def exit_node(self, key, data):
+        self.events.append(('exit', key))
+        self.assertEqual(self.stack.pop(), key)
+
+    def end_document(self, key, data):
+        self.events.append(('end', key))
+
+    @staticmethod
+    def assertEqual(a, b):
+        assert a == b, (a, b)
+
+
+class TestParsingEvents(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Section]] Section I",
+            "[[Article]]{'id': '/base/article/1'} Article I",
+            "This is article I text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Section', 'Article'],
+            'patterns': ['Chapter', 'Section', 'Article'],
+            'padding': True
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_events_are_nested(self):
+        """
+        Events should be emitted in reading order, with every node exited after its descendants
+        """
+        recorder = parse_events(self.it, self.descriptor, Recorder())
+
+        self.assertListEqual(recorder.events, [
+            ('start', 'ROOT [0]'),
+            ('enter', 'Chapter [1]'),
+            ('enter', 'Section [2]'),
+            ('enter', 'Article [3]'),
+            ('exit', 'Article [3]'),
+            ('exit', 'Section [2]'),
+            ('exit', 'Chapter [1]'),
+            ('enter', 'Chapter [4]'),
+            ('enter', 'Section [5]'),
+            ('enter', 'Article [6]'),
+            ('exit', 'Article [6]'),
+            ('exit', 'Section [5]'),
+            ('exit', 'Chapter [4]'),
+            ('end', 'ROOT [0]'),
+        ])
+
+    def test_same_structure_as_the_graph(self):
+        """
+        The structure reported through events should be the one of the document graph
+        """
+        recorder = parse_events(self.it, self.descriptor, Recorder())
+        document = parse_iterable(self.it, self.descriptor)
+
+        expected = {
+            key: (next(iter(document.predecessors(key)), None), data['text'])
+            for key, data in document.traverse()
+        }
+
+        self.assertDictEqual(recorder.nodes, expected)
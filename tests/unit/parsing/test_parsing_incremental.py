@@ -0,0 +1,146 @@
+from unittest import TestCase
+
+from graphify.parsing import parse_iterable, reparse
+
+
+def structure(document):
+    """
+    (meta, level, text, parent meta) of every node, in insertion order
+    """
+    result = []
+    for key, data in document.traverse():
+        parents = list(document.graph.parents(key))
+        parent = document.node(parents[0])['meta'] if parents else None
+        result.append((data['meta'], data['level'], data['text'], parent))
+    return result
+
+
+class TestParsingIncremental(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Article]] Article II",
+            "This is article II text",
+            "[[Chapter]] Chapter II",
+            "This is chapter II text",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_reparse_local_edit(self):
+        """
+        Editing the text of an article should only replace that article
+        every other node keeps its key and the result is the same as a full parse
+        """
+        source = list(self.it)
+        doc = parse_iterable(source, self.descriptor)
+
+        doc = reparse(doc, source, 6, 7, ["New article II text", "[[Article]] Article III", "Text of the third one"], self.descriptor)
+
+        self.assertListEqual(structure(doc), structure(parse_iterable(source, self.descriptor)))
+
+        keys = [key for key, _ in doc.traverse()]
+        self.assertListEqual(keys[:3], ['ROOT [0]', 'Chapter [1]', 'Article [2]'])
+        self.assertListEqual(keys[-2:], ['Chapter [4]', 'Article [5]'])
+        self.assertEqual(len(keys), 7)
+        self.assertNotIn('Article [3]', keys)
+
+        self.assertListEqual(doc.node(keys[3])['text'], ['Article II', 'New article II text'])
+        self.assertListEqual(doc.node(keys[4])['text'], ['Article III', 'Text of the third one'])
+
+    def test_reparse_successive_edits(self):
+        """
+        The line index kept on the document should stay valid across edits
+        """
+        source = list(self.it)
+        doc = parse_iterable(source, self.descriptor)
+
+        doc = reparse(doc, source, 4, 4, ["[[Article]] Article I bis"], self.descriptor)
+        doc = reparse(doc, source, 10, 10, ["More chapter II text"], self.descriptor)
+        doc = reparse(doc, source, 12, 13, [], self.descriptor)
+
+        self.assertListEqual(structure(doc), structure(parse_iterable(source, self.descriptor)))
+        self.assertEqual(doc.node('Chapter [1]')['id'], '/root/chapter-1')
+
+    def test_reparse_nested_keys(self):
+        """
+        An edit landing before a key created by an earlier one creates keys with three parts, e.g. 'Article [2_1_1]',
+        which are identified as the others
+        """
+        source = list(self.it)
+        doc = parse_iterable(source, self.descriptor)
+
+        doc = reparse(doc, source, 6, 7, ["New article II text", "[[Article]] Article III", "Text"], self.descriptor)
+        doc = reparse(doc, source, 6, 6, ["[[Article]] Article II bis"], self.descriptor)
+
+        self.assertListEqual(structure(doc), structure(parse_iterable(source, self.descriptor)))
+        self.assertIn('Article [2_1_1]', doc.order())
+        self.assertEqual('2_1_1', doc.identifier('Article [2_1_1]'))
+        self.assertEqual(doc.identifier((2, 1, 1)), doc.identifier('Article [2_1_1]'))
+
+    def test_reparse_structural_edit(self):
+        """
+        Edits changing the structure around them, e.g. removing a chapter heading,
+        should still yield the same document as a full parse
+        """
+        source = list(self.it)
+        doc = parse_iterable(source, self.descriptor)
+
+        doc = reparse(doc, source, 7, 8, ["Chapter II is gone"], self.descriptor)
+
+        self.assertListEqual(structure(doc), structure(parse_iterable(source, self.descriptor)))
+        self.assertEqual(doc.max_depth, 2)
+
+    def test_reparse_full_fallback(self):
+        """
+        An edit before the first section cannot be handled locally and the whole document is parsed again
+        """
+        source = list(self.it)
+        doc = parse_iterable(source, self.descriptor)
+
+        doc = reparse(doc, source, 0, 1, ["[[Chapter]] Chapter 0"], self.descriptor)
+
+        full = parse_iterable(source, self.descriptor)
+        self.assertListEqual(list(doc.traverse()), list(full.traverse()))
+
+    def test_reparse_depths(self):
+        """
+        The depths of the document should follow the nodes spliced in and out
+        """
+        descriptor = {
+            'components': ['Chapter', 'Article', 'Point'],
+            'patterns': ['Chapter', 'Article', 'Point']
+        }
+        source = list(self.it)
+        doc = parse_iterable(source, descriptor)
+        self.assertEqual((doc.active_depth, doc.max_depth), (1, 2))
+
+        doc = reparse(doc, source, 5, 5, ["[[Point]] Point 1"], descriptor)
+        full = parse_iterable(source, descriptor)
+        self.assertEqual((doc.active_depth, doc.max_depth), (full.active_depth, full.max_depth))
+        self.assertEqual(doc.max_depth, 3)
+
+        doc = reparse(doc, source, 5, 6, [], descriptor)
+        full = parse_iterable(source, descriptor)
+        self.assertEqual((doc.active_depth, doc.max_depth), (full.active_depth, full.max_depth))
+        self.assertEqual(doc.max_depth, 2)
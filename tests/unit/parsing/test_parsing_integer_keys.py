@@ -0,0 +1,87 @@
+import json
+
+from unittest import TestCase
+
+from graphify.models.document import Document
+from graphify.parsing import append_lines, checkpoint, parse_iterable, reparse, resume
+
+
+class TestParsingIntegerKeys(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Article]]{'id': '/base/article/3'} Article II",
+            "This is article II text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Section', 'Article'],
+            'patterns': ['Chapter', 'Section', 'Article'],
+            'padding': True
+        }
+        cls.integer = dict(cls.descriptor, integerKeys=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_integer_keys(self):
+        """
+        Nodes are keyed by their identifiers, the string keys being still available through `label` and `key`
+        """
+        expected = parse_iterable(self.it, self.descriptor)
+        document = parse_iterable(self.it, self.integer, name='DOC')
+
+        self.assertListEqual(list(range(7)), [key for key, _ in document.traverse()])
+        self.assertEqual(0, document.root)
+        self.assertListEqual(['DOC [0]', 'Chapter [1]', 'Section [2]', 'Article [3]'],
+                             [document.label(key) for key in range(4)])
+
+        self.assertEqual(3, document.key('Article [3]'))
+        self.assertEqual((7, 1), document.key('Article [7_1]'))
+        self.assertEqual(expected['Article [6]'], document['Article [6]'])
+        self.assertListEqual(['Section [5]'], [document.label(p) for p in document.predecessors('Article [6]')])
+
+    def test_serialization(self):
+        """
+        Documents are serialized with string keys, whatever their keys; a checkpoint resumes with integer keys
+        """
+        expected = parse_iterable(self.it, self.descriptor)
+        document = parse_iterable(self.it[:4], self.integer)
+
+        snapshot = json.loads(json.dumps(checkpoint(document)))
+        self.assertEqual('Article [3]', snapshot['document']['nodes'][-1]['key'])
+
+        document = append_lines(resume(snapshot), self.it[4:])
+        self.assertEqual(expected.to_dict(), document.to_dict())
+        self.assertTrue(all(isinstance(key, int) for key in document.graph.nodes()))
+
+        restored = Document.from_dict(expected.to_dict(), integer_keys=True)
+        self.assertListEqual(list(range(7)), list(restored.graph.nodes()))
+        self.assertEqual(expected.to_dict(), restored.to_dict())
+
+    def test_reparse(self):
+        """
+        Spliced nodes get composite keys as tuples, sorting in between their neighbours
+        """
+        expected = parse_iterable(self.it[:5] + ["[[Article]] Article I bis"] + self.it[5:], self.descriptor)
+
+        source = list(self.it)
+        document = parse_iterable(source, self.integer)
+        document = reparse(document, source, 5, 5, ["[[Article]] Article I bis"], self.integer)
+
+        self.assertIn((3, 1), document.graph.nodes())
+        self.assertListEqual([data['text'] for _, data in expected.traverse()],
+                             [data['text'] for _, data in document.traverse()])
@@ -0,0 +1,101 @@
+import json
+
+from unittest import TestCase
+
+from graphify.parsing import parse_iterable, append_lines, checkpoint, resume
+
+
+class TestParsingResume(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Article]] Article II",
+            "This is article II text",
+            "[[Chapter]] Chapter II",
+            "This is chapter II text",
+            "[[Article]] Article I",
+            "This is article I text",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Article'],
+            'patterns': ['Chapter', 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_append_lines(self):
+        """
+        Feeding the lines in chunks should result in the same document as a single parse
+        """
+        full = parse_iterable(self.it, self.descriptor)
+
+        for cut in range(len(self.it) + 1):
+            doc = parse_iterable(self.it[:cut], self.descriptor)
+            doc = append_lines(doc, self.it[cut:])
+
+            self.assertListEqual(list(doc.traverse()), list(full.traverse()))
+            self.assertListEqual(sorted(doc.graph.edges()), sorted(full.graph.edges()))
+            self.assertEqual(doc.max_depth, full.max_depth)
+
+    def test_append_lines_start_stop(self):
+        """
+        The start and stop markers hold across chunks: nothing is parsed after the stop marker
+        """
+        descriptor = dict(self.descriptor, startParsing='Chapter I$', stopParsing='Chapter II')
+
+        doc = parse_iterable(self.it[:1], descriptor)
+        self.assertFalse(doc.build_state.started)
+
+        doc = append_lines(doc, self.it[1:8])
+        self.assertTrue(doc.build_state.stopped)
+
+        doc = append_lines(doc, self.it[8:])
+        self.assertListEqual(list(doc.traverse()), list(parse_iterable(self.it, descriptor).traverse()))
+
+    def test_checkpoint_resume(self):
+        """
+        A checkpoint should survive a json round trip and carry on as if nothing happened
+        """
+        doc = parse_iterable(self.it[:6], self.descriptor)
+
+        snapshot = json.loads(json.dumps(checkpoint(doc)))
+        self.assertDictEqual(snapshot['state'], {
+            'descriptor': self.descriptor,
+            'name': 'ROOT',
+            'cursor': 'Article [3]',
+            'open_ancestors': ['ROOT [0]', 'Chapter [1]', 'Article [3]'],
+            'last_id': 3,
+            'started': True,
+            'stopped': False,
+            'backbone': None
+        })
+
+        doc = append_lines(resume(snapshot), self.it[6:])
+
+        full = parse_iterable(self.it, self.descriptor)
+        self.assertListEqual(list(doc.traverse()), list(full.traverse()))
+        self.assertListEqual(sorted(doc.graph.edges()), sorted(full.graph.edges()))
+
+    def test_append_lines_without_state(self):
+        """
+        Only documents carrying their build state can be resumed
+        """
+        doc = parse_iterable(self.it, self.descriptor)
+        del doc.build_state
+
+        with self.assertRaises(ValueError):
+            append_lines(doc, self.it)
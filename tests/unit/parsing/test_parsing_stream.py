@@ -0,0 +1,91 @@
+import io
+import json
+import queue
+
+from unittest import TestCase
+
+from graphify.parsing import parse_iterable, parse_stream
+
+
+class TestParsingStream(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Article]] Article II",
+            "This is article II text",
+            "[[Chapter]] Chapter II",
+            "This is chapter II text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Schedule]] Schedule I",
+            "This is schedule I text",
+        ]
+
+        cls.descriptor = {
+            'components': [['Chapter', 'Schedule'], 'Article'],
+            'patterns': [['Chapter', 'Schedule'], 'Article']
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_stream_top_level_sections(self):
+        """
+        Every top level section should be handed to the sink as soon as it is closed
+        and the sections together should hold the same nodes as a full parse
+        """
+        documents = []
+        residual = parse_stream(self.it, self.descriptor, documents.append)
+
+        self.assertEqual(len(documents), 3)
+
+        self.assertListEqual(
+            [[key for key, _ in d.traverse()] for d in documents],
+            [
+                ['ROOT [0]', 'Chapter [1]', 'Article [2]', 'Article [3]'],
+                ['ROOT [0]', 'Chapter [4]', 'Article [5]'],
+                ['ROOT [0]', 'Schedule [6]'],
+            ]
+        )
+
+        self.assertListEqual(list(residual.traverse()), [
+            ('ROOT [0]', {'meta': 'root', 'level': 0, 'text': ['Preamble text'], 'pad': False, 'id': '/root'})
+        ])
+
+        full = parse_iterable(self.it, self.descriptor)
+        streamed = dict(node for d in documents for node in d.traverse() if node[0] != 'ROOT [0]')
+
+        self.assertDictEqual(streamed, {key: data for key, data in full.traverse() if key != 'ROOT [0]'})
+
+    def test_stream_sink_types(self):
+        """
+        Queues and file like objects should be accepted as sinks
+        """
+        q = queue.Queue()
+        parse_stream(self.it, self.descriptor, q)
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(q.get().root_node()['meta'], 'root')
+
+        f = io.StringIO()
+        parse_stream(self.it, self.descriptor, f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertListEqual(
+            [n['key'] for n in json.loads(lines[-1])['nodes']],
+            ['ROOT [0]', 'Schedule [6]']
+        )
+
+        with self.assertRaises(ValueError):
+            parse_stream(self.it, self.descriptor, 'not a sink')
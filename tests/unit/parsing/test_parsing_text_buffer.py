@@ -0,0 +1,157 @@
+import pickle
+
+from unittest import TestCase
+
+from graphify.build.graph import compact_text_buffer
+from graphify.models.text import TextBuffer, TextSpan
+from graphify.ops.document import map_values
+from graphify.parsing import append_lines, parse_iterable, reparse
+
+
+class TestParsingTextBuffer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.it = [
+            "Preamble text",
+            "[[Chapter]] Chapter I",
+            "This is chapter I text",
+            "[[Article]] Article I",
+            "This is article I text",
+            "[[Chapter]] Chapter II",
+            "[[Article]] Article II",
+            "This is article II text",
+            "[[Article]]{'id': '/base/article/3'} Article III",
+        ]
+
+        cls.descriptor = {
+            'components': ['Chapter', 'Section', 'Article'],
+            'patterns': ['Chapter', 'Section', 'Article'],
+            'padding': True
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_same_document(self):
+        """
+        With a text buffer the document is the same, node text included, but every node holds a span of the buffer
+        """
+        expected = parse_iterable(self.it, self.descriptor)
+        result = parse_iterable(self.it, dict(self.descriptor, textBuffer=True))
+
+        self.assertListEqual(list(expected.traverse()), list(result.traverse()))
+        self.assertEqual(expected.to_dict(), result.to_dict())
+        self.assertListEqual(list(expected.text(just_text=True)), list(result.text(just_text=True)))
+
+        buffer = result.graph.text_buffer
+        self.assertEqual(len(self.it), len(buffer))
+        for _, data in result.traverse():
+            self.assertIsInstance(data['text'], TextSpan)
+            self.assertIs(buffer, data['text'].buffer)
+
+        self.assertIsInstance(result.to_dict()['nodes'][1]['content']['text'], list)
+
+    def test_append_and_pickle(self):
+        """
+        Lines appended later on go to the same buffer, and the document survives pickling
+        """
+        descriptor = dict(self.descriptor, textBuffer=True)
+
+        expected = parse_iterable(self.it + self.it, self.descriptor)
+
+        document = parse_iterable(self.it, descriptor)
+        document = append_lines(document, self.it)
+        self.assertListEqual(list(expected.traverse()), list(document.traverse()))
+
+        document = pickle.loads(pickle.dumps(document))
+        self.assertListEqual(list(expected.traverse()), list(document.traverse()))
+
+    def test_span(self):
+        """
+        A span behaves as the list of its lines, and moves to the end of the buffer when it grows elsewhere
+        """
+        buffer = TextBuffer(block=4)
+
+        a, b = buffer.span(), buffer.span()
+        a.extend(['a1', 'a2', 'a3'])
+        b.extend(['b1', 'b2'])
+        a.append('a4')
+
+        self.assertEqual(['a1', 'a2', 'a3', 'a4'], a)
+        self.assertEqual(['b1', 'b2'], b)
+        self.assertEqual(('b2', 'a4', ['a2', 'a3']), (b[-1], a[3], a[1:3]))
+        self.assertEqual(9, len(buffer))
+        self.assertEqual((5, 9), (a.start, a.end))
+
+        with self.assertRaises(IndexError):
+            b[2]
+
+    def test_concatenation(self):
+        """
+        A span concatenates with lists, and with other spans, into a list
+        """
+        buffer = TextBuffer(['a', 'b', 'c'])
+        a, b = TextSpan(buffer, 0, 2), TextSpan(buffer, 2, 3)
+
+        self.assertEqual(['x', 'a', 'b'], ['x'] + a)
+        self.assertEqual(['a', 'b', 'x'], a + ['x'])
+        self.assertEqual(['a', 'b', 'c'], a + b)
+
+        def with_titles(data):
+            data['has_text'] = False
+            data['title'] = []
+            return data
+
+        expected = map_values(parse_iterable(self.it, self.descriptor), with_titles)
+        result = map_values(parse_iterable(self.it, dict(self.descriptor, textBuffer=True)), with_titles)
+        self.assertListEqual(list(expected.text()), list(result.text()))
+
+    def test_reparse(self):
+        """
+        The nodes spliced in by `reparse` hold spans of the buffer too, the lines they replace being counted as dead
+        """
+        edit = 4, 5, ["New article I text", "[[Article]] Article I bis", "Text of the new one"]
+
+        source = list(self.it)
+        expected = reparse(parse_iterable(source, self.descriptor), source, *edit, self.descriptor)
+
+        descriptor = dict(self.descriptor, textBuffer=True)
+        source = list(self.it)
+        result = reparse(parse_iterable(source, descriptor), source, *edit, descriptor)
+
+        self.assertListEqual(list(expected.traverse()), list(result.traverse()))
+        for _, data in result.traverse():
+            self.assertIsInstance(data['text'], TextSpan)
+
+        buffer = result.graph.text_buffer
+        self.assertEqual(len(buffer) - len(source), buffer.dead)
+        self.assertGreater(buffer.dead, 0)
+
+        compact_text_buffer(result.graph)
+        self.assertIsNot(buffer, result.graph.text_buffer)
+        self.assertEqual(len(source), len(result.graph.text_buffer))
+        self.assertListEqual(list(expected.traverse()), list(result.traverse()))
+
+    def test_map_values(self):
+        """
+        Text changed by `map_values` moves to the end of the buffer, the source document keeping its own
+        """
+        def append_line(data):
+            data['text'].append('More text')
+            return data
+
+        document = parse_iterable(self.it, dict(self.descriptor, textBuffer=True))
+        before = list(document.traverse())
+
+        expected = map_values(parse_iterable(self.it, self.descriptor), append_line)
+        result = map_values(document, append_line)
+
+        self.assertListEqual(list(expected.traverse()), list(result.traverse()))
+        self.assertListEqual(before, list(document.traverse()))
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from graphify.utils.files import mmap_lines
+from hypothesis import given
+from hypothesis import strategies as st
+
+
+class TestFiles(unittest.TestCase):
+
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    @given(st.lists(st.tuples(st.text(alphabet=st.characters(blacklist_categories=('Cs',), blacklist_characters='\n')), st.sampled_from(['\n', '\r\n', '\r', '']))))
+    def test_mmap_lines(self, x):
+        """
+        The lines read through a memory map should be the same as the ones of a file opened in text mode
+        """
+        content = ''.join(line + ending for line, ending in x)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'file.txt')
+            with open(filepath, 'wb') as f:
+                f.write(content.encode('utf-8'))
+
+            with open(filepath, 'r', encoding='utf-8') as f:
+                expected = list(f)
+
+            with mmap_lines(filepath) as lines:
+                self.assertListEqual(list(lines), expected)
+
+    def test_mmap_lines_endings(self):
+        """
+        Bare '\\r' should end a line as in text mode, other line breaks (e.g. U+0085) should not
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'file.txt')
+            with open(filepath, 'wb') as f:
+                f.write(b'a\rb\r\nc\xc2\x85d\n\r')
+
+            with mmap_lines(filepath) as lines:
+                self.assertListEqual(list(lines), ['a\n', 'b\n', 'c\x85d\n', '\n'])